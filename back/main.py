@@ -1,15 +1,28 @@
-from fastapi import FastAPI, Request, BackgroundTasks, HTTPException
-from packages.routers.crawler import scrape_instagram_comments, scrape_youtube_comments
-from fastapi.responses import FileResponse, JSONResponse
+from fastapi import FastAPI, Request, HTTPException
+from packages.routers.crawler import scrape_instagram_comments, scrape_youtube_comments, webdriver_pool
+from fastapi.responses import FileResponse, JSONResponse, StreamingResponse, Response
 from starlette.middleware.cors import CORSMiddleware
-from models.predict import analyze_comments
-from models.retrain import retrain_kobert_model
+from starlette.middleware.gzip import GZipMiddleware
+from models.predict import analyze_comments, load_model, warm_up, model_status, model_registry, swap_model
+from packages.jobs import JobManager, SUCCEEDED, FAILED
+from packages.pipeline import StreamingAnalysis, queued_pages
+from packages import metrics
+from packages.metrics import STAGE_SECONDS, COMMENTS_PROCESSED, QUEUE_DEPTH, JOBS_IN_FLIGHT
+from packages.retrainer import Retrainer
+from packages.feedback_log import FeedbackLog
+from models.micro_batch import MicroBatcher
+from packages.routers import kobert_router, results_router, crawler
+from packages.routers.results_router import result_store
+from packages.config import CRAWL_WORKERS, INFER_WORKERS, MAX_JOBS, WARMUP_ON_STARTUP, STREAMING_PIPELINE
+from packages.config import RESULT_FORMAT, RESULT_CLEANUP_INTERVAL, MODEL_REGISTRY_DIR, RETRAIN_AUTO_ACTIVATE
+from packages.config import FEEDBACK_LOG_PATH, FEEDBACK_BATCH_SIZE, FEEDBACK_MAX_WAIT_MS
 from pydantic import BaseModel
 import asyncio
+import json
 import os
 import pandas as pd
+import time
 from logging_config import setup_logger
-from threading import Lock
 
 # 로그 설정
 logger = setup_logger(__name__)
@@ -26,10 +39,19 @@ app.add_middleware(
     allow_headers=["*"],
 )
 
-# 글로벌 변수 락 설정
-feedback_data = []
-feedback_lock = Lock()
+# JSON/CSV 응답 압축
+app.add_middleware(GZipMiddleware, minimum_size=1024)
+
+# 피드백 저장소 (프로세스 간 공유, 재시작 후에도 유지)
+feedback_log = FeedbackLog(FEEDBACK_LOG_PATH)
 FEEDBACK_THRESHOLD = 50  # 학습 트리거를 위한 최소 데이터 수
+RETRAIN_CONSUMER = "retrain"  # 재학습 트리거가 읽은 위치(offset)를 기록하는 이름
+
+# 동시에 들어온 피드백을 한 번의 트랜잭션(fsync)으로 묶어 저장
+feedback_batcher = MicroBatcher(feedback_log.append_many, max_batch_size=FEEDBACK_BATCH_SIZE, max_wait_ms=FEEDBACK_MAX_WAIT_MS)
+
+# 재학습은 별도 프로세스에서 실행하고 완료되면 서빙 모델을 교체
+retrainer = Retrainer(auto_activate=RETRAIN_AUTO_ACTIVATE)
 
 # 요청 데이터 모델 정의
 class CrawlAnalyzeRequest(BaseModel):
@@ -39,111 +61,336 @@ class CrawlAnalyzeRequest(BaseModel):
     platform: str
 
 
-@app.post("/crawl-and-analyze")
-async def crawl_and_analyze(
-    request: CrawlAnalyzeRequest,
-    background_tasks: BackgroundTasks,
-):
+# 작업 이벤트 스트림(SSE) 설정
+EVENT_POLL_INTERVAL = 0.25  # 새 이벤트 확인 주기 (초)
+EVENT_KEEPALIVE_SECONDS = 15  # 프록시 연결 유지를 위한 주석 전송 주기 (초)
+
+# 크롤링/분석 작업 관리자
+job_manager = JobManager(crawl_workers=CRAWL_WORKERS, infer_workers=INFER_WORKERS, max_jobs=MAX_JOBS)
+
+
+def crawl_comments(job, on_page=None):
+    request = CrawlAnalyzeRequest(**job.params)
+    crawl_dir = result_store.crawl_dir(job.id)
+
+    # 페이지(비디오/게시물)가 처리될 때마다 진행 상황 기록
+    progress = {"pages_fetched": 0, "crawled_comments": 0}
+
+    def report_page(page):
+        progress["pages_fetched"] += 1
+        progress["crawled_comments"] += len(page)
+        job_manager.update(job, counts=progress)
+        if on_page is not None:
+            on_page(page)
+
+    # 플랫폼에 따라 크롤링 함수 호출
+    if request.platform.lower() == "instagram":
+        logger.info(f"Scraping Instagram comments for {request.account} from {request.start_date} to {request.end_date}")
+        crawled = scrape_instagram_comments(
+            account=request.account,
+            start_date=request.start_date,
+            end_date=request.end_date,
+            on_page=report_page,
+            save_dir=crawl_dir
+        )
+    else:
+        logger.info(f"Scraping YouTube comments for {request.account} from {request.start_date} to {request.end_date}")
+        crawled = scrape_youtube_comments(
+            account=request.account,
+            start_date=request.start_date,
+            end_date=request.end_date,
+            on_page=report_page,
+            save_dir=crawl_dir,
+            on_progress=lambda counts: job_manager.update(job, counts=counts)
+        )
+
+    if crawled is None:
+        raise RuntimeError("Crawling failed. Check the crawler logs for details.")
+    comments, elapsed_time = crawled
+
+    # 크롤링된 댓글 수 계산
+    logger.info("Total comments count: %d", len(comments))
+    STAGE_SECONDS.observe(elapsed_time, stage="crawl")
+    COMMENTS_PROCESSED.inc(len(comments), stage="crawled")
+    job_manager.update(job, counts={
+        "crawled_comments": len(comments),
+        "crawl_seconds": round(elapsed_time, 2),
+    })
+    return comments
+
+
+def finish_analysis(job, analysis_result):
+    if analysis_result.get("error"):
+        raise RuntimeError(analysis_result["error"])
+
+    job_manager.update(job, counts={"analyzed_comments": len(analysis_result["results"])})
+
+    # 작업별 결과 파일 URL 반환 (CSV 내보내기를 끄면 Parquet/Arrow 파일, CSV는 <이름>.csv 요청 시 생성)
+    files = {
+        name: f"/jobs/{job.id}/results/{os.path.basename(paths.get('csv') or paths.get(RESULT_FORMAT) or paths['json'])}"
+        for name, paths in analysis_result["files"].items()
+    }
+    # 대시보드용 집계/댓글 페이지 API
+    files["summary"] = f"/jobs/{job.id}/summary"
+    files["comments_page"] = f"/jobs/{job.id}/comments"
+    return files
+
+
+def run_crawl(job):
+    comments = crawl_comments(job)
+
+    # comments가 list인지 확인하고 DataFrame으로 변환
+    if isinstance(comments, list):
+        logger.info("Converting comments from list to DataFrame")
+        comments = pd.DataFrame(comments, columns=["date", "comment", "link"])
+
+    # comments가 DataFrame인지 확인
+    if not isinstance(comments, pd.DataFrame):
+        logger.error("Expected comments to be a pandas DataFrame, got %s", type(comments))
+        raise ValueError("Expected comments to be a pandas DataFrame.")
+
+    # 디스크를 거치지 않고 DataFrame을 분석 단계로 그대로 전달
+    return comments
+
+
+def run_analyze(job, comments):
+    # 모델 분석 수행 및 결과 저장
+    logger.info("Starting analyze_comments function")
+    return finish_analysis(job, analyze_comments(comments, save_dir=result_store.job_dir(job.id)))
+
+
+def run_streaming_crawl(job):
+    # 크롤링된 페이지를 바로 전처리/추론 단계로 넘겨 두 단계를 겹쳐 실행
+    pipeline = StreamingAnalysis(
+        on_progress=lambda counts: job_manager.update(job, counts=counts),
+        on_partial=lambda partial: job_manager.publish(job, "partial", partial),
+        save_dir=result_store.job_dir(job.id),
+    )
+    # 작업마다 전용 소비 스레드 사용 (모델 추론만 프로세스 전체에서 순차 실행)
+    analysis = job_manager.start_consumer(job, pipeline.consume)
+    job_manager.update(job, stage="crawling_and_analyzing")
     try:
-        logger.info("Received request: %s", request)
-
-        # 플랫폼에 따라 크롤링 함수 호출
-        if request.platform.lower() == "instagram":
-            logger.info(f"Scraping Instagram comments for {request.account} from {request.start_date} to {request.end_date}")
-            comments, _ = scrape_instagram_comments(
-                account=request.account, 
-                start_date=request.start_date, 
-                end_date=request.end_date
-            )
-        elif request.platform.lower() == "youtube":
-            logger.info(f"Scraping YouTube comments for {request.account} from {request.start_date} to {request.end_date}")
-            comments, _ = scrape_youtube_comments(
-                account=request.account, 
-                start_date=request.start_date, 
-                end_date=request.end_date
-            )
+        crawl_comments(job, on_page=pipeline.put_page)
+    except Exception:
+        pipeline.abort()
+        raise
+    pipeline.close()
+    return analysis
+
+
+def run_streaming_analyze(job, analysis):
+    logger.info("Waiting for streaming analysis to finish")
+    return finish_analysis(job, analysis.result())
+
+
+@app.post("/crawl-and-analyze", status_code=202)
+async def crawl_and_analyze(request: CrawlAnalyzeRequest):
+    logger.info("Received request: %s", request)
+
+    if request.platform.lower() not in ("instagram", "youtube"):
+        logger.error("Invalid platform: %s", request.platform)
+        raise HTTPException(status_code=400, detail="Invalid platform. Choose either 'instagram' or 'youtube'.")
+
+    # 작업 등록 후 즉시 반환 (크롤링 및 분석은 실행기에서 진행)
+    if STREAMING_PIPELINE:
+        job = job_manager.submit(request.model_dump(), run_streaming_crawl, run_streaming_analyze)
+    else:
+        job = job_manager.submit(request.model_dump(), run_crawl, run_analyze)
+    return {
+        "message": "Crawling and analysis started successfully.",
+        "job_id": job.id,
+        "status_url": f"/jobs/{job.id}",
+    }
+
+
+@app.get("/jobs/{job_id}")
+async def get_job(job_id: str):
+    job = job_manager.get(job_id)
+    if job is None:
+        raise HTTPException(status_code=404, detail=f"Job not found: {job_id}")
+    state, _ = job_manager.snapshot(job)
+    return state
+
+
+def format_event(seq, event, data):
+    return f"id: {seq}\nevent: {event}\ndata: {json.dumps(data, ensure_ascii=False)}\n\n"
+
+
+async def job_event_stream(job, last_seq):
+    if last_seq < 0:
+        # 처음 연결하면 현재 상태를 먼저 보내고 이후 이벤트만 순서대로 전송
+        state, last_seq = job_manager.snapshot(job)
+        yield format_event(last_seq, "snapshot", state)
+    idle = 0.0
+    while True:
+        events = job_manager.events_since(job, last_seq)
+        for seq, event, data in events:
+            last_seq = seq
+            yield format_event(seq, event, data)
+            if event in ("done", "failed"):
+                return
+        if not events:
+            if job.state in (SUCCEEDED, FAILED):
+                return
+            if idle >= EVENT_KEEPALIVE_SECONDS:
+                idle = 0.0
+                yield ": keep-alive\n\n"
+            await asyncio.sleep(EVENT_POLL_INTERVAL)
+            idle += EVENT_POLL_INTERVAL
         else:
-            logger.error("Invalid platform: %s", request.platform)
-            raise HTTPException(status_code=400, detail="Invalid platform. Choose either 'instagram' or 'youtube'.")
+            idle = 0.0
 
-        # comments가 list인지 확인하고 DataFrame으로 변환
-        if isinstance(comments, list):
-            logger.info("Converting comments from list to DataFrame")
-            comments = pd.DataFrame(comments, columns=["date", "comment", "link"])
 
-        # comments가 DataFrame인지 확인
-        if not isinstance(comments, pd.DataFrame):
-            logger.error("Expected comments to be a pandas DataFrame, got %s", type(comments))
-            raise ValueError("Expected comments to be a pandas DataFrame.")
+@app.get("/jobs/{job_id}/events")
+async def get_job_events(job_id: str, request: Request):
+    job = job_manager.get(job_id)
+    if job is None:
+        raise HTTPException(status_code=404, detail=f"Job not found: {job_id}")
 
-        # 기존 크롤링 데이터 파일 경로
-        dataset_path = "./dataset/comments.csv"
+    # 재연결 시 Last-Event-ID 이후 이벤트부터 전송
+    last_event_id = request.headers.get("last-event-id", "")
+    last_seq = int(last_event_id) if last_event_id.isdigit() else -1
+    return StreamingResponse(
+        job_event_stream(job, last_seq),
+        media_type="text/event-stream",
+        # Content-Encoding을 지정해 GZip 미들웨어가 이벤트를 버퍼링하지 않도록 함
+        headers={"Cache-Control": "no-cache", "X-Accel-Buffering": "no", "Content-Encoding": "identity"},
+    )
 
-        # 파일 존재 여부 확인
-        if not os.path.exists(dataset_path):
-            logger.error(f"Dataset file does not exist: {dataset_path}")
-            raise FileNotFoundError(f"Dataset file not found at: {dataset_path}")
 
-        # 기존 저장된 CSV 파일 로드
-        logger.info(f"Loading dataset from: {dataset_path}")
-        comments = pd.read_csv(dataset_path, encoding='utf-8-sig')
+@app.on_event("startup")
+def start_model_loading():
+    result_store.cleanup()
+    # 모델 로딩 및 워밍업은 추론 실행기에서 진행하여 서버는 즉시 요청을 받음
+    job_manager.infer_executor.submit(warm_up if WARMUP_ON_STARTUP else load_model)
 
 
-        # 모델 분석 수행 및 결과 저장
-        logger.info("Starting analyze_comments function")
+async def cleanup_results_periodically():
+    # 보관 기간이 지난 작업 결과 정리 (디렉토리 삭제는 이벤트 루프 밖에서 실행)
+    while True:
+        await asyncio.sleep(RESULT_CLEANUP_INTERVAL)
         try:
-            analysis_result = analyze_comments(dataset_path)
-        except Exception as e:
-            logger.error(f"Error in analyze_comments: {e}")
-            raise
-
-
-        # 크롤링된 댓글 수 계산
-        total_comments_count = len(comments)
-        logger.info("Total comments count: %d", total_comments_count)
-
-        # 파일 경로 반환
-        return {
-            "message": "Crawling and analysis started successfully.",
-            "total_comments_count": total_comments_count,
-            "files": {
-                "comments": "./front/public/data/comments.csv",
-                "ratio": "./front/public/data/ratio.csv",
-                "count": "./front/public/data/count.csv",
-            },
-        }
+            await asyncio.to_thread(result_store.cleanup, job_manager.active_ids())
+        except Exception:
+            logger.exception("Result cleanup failed.")
+
+
+@app.on_event("startup")
+async def start_result_cleanup():
+    app.state.cleanup_task = asyncio.create_task(cleanup_results_periodically())
+
+
+@app.on_event("shutdown")
+async def shutdown_jobs():
+    app.state.cleanup_task.cancel()
+    job_manager.shutdown()
+    retrainer.shutdown()
+    webdriver_pool.shutdown()
+    await kobert_router.batcher.stop()
+    await feedback_batcher.stop()
+
+
+# /metrics 조회 시점에 읽는 값 (프로세스별 값이므로 워커가 여러 개면 워커마다 수집)
+JOBS_IN_FLIGHT.set_function(job_manager.in_flight)
+QUEUE_DEPTH.set_function(queued_pages, queue="pipeline")
+QUEUE_DEPTH.set_function(kobert_router.batcher.queue_depth, queue="predict")
+QUEUE_DEPTH.set_function(feedback_batcher.queue_depth, queue="feedback")
+
+
+@app.get("/metrics")
+async def get_metrics():
+    return Response(content=metrics.render(), media_type=metrics.CONTENT_TYPE)
 
-    except Exception as e:
-        logger.exception("Error during crawl and analyze process")
-        raise HTTPException(status_code=500, detail=f"Error during processing: {str(e)}")
+
+@app.get("/healthz")
+async def healthz():
+    return {"status": "ok"}
+
+
+@app.get("/ready")
+async def ready():
+    # 모델 로딩(워밍업 사용 시 워밍업까지)이 끝나야 준비 완료
+    ready_state = "ready" if WARMUP_ON_STARTUP else "loaded"
+    if model_status["state"] not in (ready_state, "ready"):
+        return JSONResponse(status_code=503, content={"ready": False, "model": model_status})
+    return {"ready": True, "model": model_status}
+
+
+def start_retraining(records):
+    # 재학습 프로세스에 넘길 피드백 묶음 파일 (묶음마다 별도 파일)
+    feedback_dir = os.path.join(MODEL_REGISTRY_DIR, "feedback")
+    os.makedirs(feedback_dir, exist_ok=True)
+    feedback_file = os.path.join(feedback_dir, f"feedback_{time.strftime('%Y%m%d_%H%M%S')}_{len(records)}.csv")
+    pd.DataFrame(records).to_csv(feedback_file, index=False, encoding="utf-8-sig")
+    logger.info("Feedback data saved to: %s", feedback_file)
+    retrainer.submit(feedback_file)
+
+
+def check_retrain_trigger():
+    """
+    Hand the feedback received since the last retraining to the retrainer
+    once FEEDBACK_THRESHOLD records have accumulated. Returns the number of
+    records handed over and the number still pending.
+    """
+    pending = feedback_log.pending(RETRAIN_CONSUMER)
+    if pending < FEEDBACK_THRESHOLD:
+        return 0, pending
+    consumed = feedback_log.consume(RETRAIN_CONSUMER, FEEDBACK_THRESHOLD, start_retraining)
+    return consumed, feedback_log.pending(RETRAIN_CONSUMER)
 
 
 @app.post("/retrain")
 async def receive_feedback(request: Request):
-    global feedback_data
     try:
         new_data = await request.json()
         logger.info("Received feedback: %s", new_data)
-        with feedback_lock:
-            feedback_data.append(new_data)
-
-            if len(feedback_data) >= FEEDBACK_THRESHOLD:
-                feedback_file = "feedback_data.csv"
-                pd.DataFrame(feedback_data).to_csv(feedback_file, index=False, encoding="utf-8-sig")
-                logger.info("Feedback data saved to: %s", feedback_file)
-                feedback_data = []  # 임시 데이터 초기화
+        records = new_data if isinstance(new_data, list) else [new_data]
+        if not records or not all(isinstance(record, dict) for record in records):
+            raise HTTPException(status_code=400, detail="Feedback must be a JSON object or a list of objects.")
 
-                retrain_kobert_model(feedback_file)
-                logger.info("Retraining initiated")
-                return {"status": "Retraining initiated"}
-            else:
-                return {"status": "Data stored", "current_size": len(feedback_data)}
+        inserted = await feedback_batcher.submit(records)
+        consumed, pending = await asyncio.to_thread(check_retrain_trigger)
+        if consumed:
+            logger.info("Retraining initiated")
+            return {"status": "Retraining initiated", "stored": sum(inserted), "retraining": retrainer.status}
+        return {"status": "Data stored", "stored": sum(inserted), "current_size": pending}
 
+    except HTTPException:
+        raise
     except Exception as e:
         logger.exception("Error during feedback processing")
         raise HTTPException(status_code=500, detail=f"Error during feedback processing: {str(e)}")
 
 
+@app.get("/models")
+async def list_models():
+    return {
+        "active": model_registry.active(),
+        "serving": model_status.get("model_version"),
+        "versions": model_registry.list(),
+        "retraining": retrainer.status,
+    }
+
+
+@app.post("/models/{version}/activate")
+async def activate_model(version: str):
+    # 롤백 포함: "base"는 기본 체크포인트(MODEL_PATH)
+    registry_version = None if version == "base" else version
+    if registry_version is not None and not model_registry.exists(registry_version):
+        raise HTTPException(status_code=404, detail=f"Unknown model version: {version}")
+    try:
+        # 메모리에 없는 버전은 가중치 로딩이 필요하므로 이벤트 루프 밖에서 실행
+        serving = await asyncio.to_thread(swap_model, registry_version)
+    except RuntimeError as e:
+        raise HTTPException(status_code=409, detail=str(e))
+    return {"active": registry_version, "serving": serving}
+
+
+app.include_router(kobert_router.router)
+app.include_router(results_router.router)
+app.include_router(crawler.router)
+
+
 if __name__ == "__main__":
     import uvicorn
     logger.info("Starting FastAPI server")
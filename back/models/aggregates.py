@@ -0,0 +1,67 @@
+import numpy as np
+import pandas as pd
+
+# 감정 라벨 (0: 긍정, 1: 중립, 2: 부정)
+SENTIMENTS = ["긍정", "중립", "부정"]
+
+# 요약에 포함할 감정별 상위 단어 수
+TOP_WORDS = 200
+
+
+def build_summary(comments_df, ratio_df, period_counts, word_frequencies):
+    """
+    Dashboard aggregates computed once at analysis time: sentiment ratios,
+    per-period counts and top words per sentiment.
+    """
+    # 해당 기간에 없는 감정 라벨은 0으로 채움
+    counts = [
+        {"period": str(row['Period']), **{
+            sentiment: int(row.get(str(label), 0)) for label, sentiment in enumerate(SENTIMENTS)
+        }}
+        for row in period_counts.to_dict(orient="records")
+    ]
+    return {
+        "total_comments": len(comments_df),
+        "ratio": dict(zip(SENTIMENTS, (float(value) for value in ratio_df['Ratio']))),
+        "counts": counts,
+        "words": {
+            sentiment: [{"word": word, "count": count} for word, count in word_frequencies.top(label, TOP_WORDS)]
+            for label, sentiment in enumerate(SENTIMENTS)
+        },
+    }
+
+
+def _json_value(value):
+    # NaN은 JSON으로 직렬화할 수 없으므로 None으로 변환
+    return None if pd.isna(value) else str(value)
+
+
+def comments_page(comments_df, page=1, page_size=20, sentiments=None):
+    """
+    One page of analyzed comments, optionally restricted to the given
+    sentiment labels.
+    """
+    labels = comments_df['Feelings'].to_numpy()
+    if sentiments is not None:
+        rows = np.flatnonzero(np.isin(labels, list(sentiments)))
+    else:
+        rows = np.arange(len(comments_df))
+
+    start = (page - 1) * page_size
+    selected = comments_df.iloc[rows[start:start + page_size]]
+    return {
+        "total": int(len(rows)),
+        "page": page,
+        "page_size": page_size,
+        "comments": [
+            {
+                "date": _json_value(date),
+                "content": _json_value(comment),
+                "link": _json_value(link),
+                "sentiment": SENTIMENTS[int(label)],
+            }
+            for date, comment, link, label in zip(
+                selected['date'], selected['comment'], selected['link'], selected['Feelings']
+            )
+        ],
+    }
@@ -0,0 +1,37 @@
+import numpy as np
+import torch
+
+
+def length_sorted_batches(lengths, batch_size):
+    """
+    Split row indices into batches of similar token length.
+    Indices are sorted by length (stable, so ties keep their original order)
+    and cut into consecutive chunks of `batch_size`.
+    """
+    order = np.argsort(np.asarray(lengths), kind="stable")
+    return [order[i:i + batch_size] for i in range(0, len(order), batch_size)]
+
+
+def pad_batch(sequences, pad_id):
+    """
+    Pad a list of token ID sequences to the longest one in the batch.
+    Returns (input_ids, attention_mask) as LongTensors.
+    """
+    width = max(len(seq) for seq in sequences)
+    input_ids = torch.full((len(sequences), width), pad_id, dtype=torch.long)
+    attention_mask = torch.zeros((len(sequences), width), dtype=torch.long)
+    for row, seq in enumerate(sequences):
+        input_ids[row, :len(seq)] = torch.as_tensor(np.asarray(seq, dtype=np.int64))
+        attention_mask[row, :len(seq)] = 1
+    return input_ids, attention_mask
+
+
+def iter_dynamic_batches(sequences, batch_size, pad_id):
+    """
+    Yield (indices, input_ids, attention_mask) for length-bucketed batches,
+    where `indices` are the original positions of the rows in the batch.
+    """
+    lengths = [len(seq) for seq in sequences]
+    for indices in length_sorted_batches(lengths, batch_size):
+        input_ids, attention_mask = pad_batch([sequences[i] for i in indices], pad_id)
+        yield indices, input_ids, attention_mask
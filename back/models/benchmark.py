@@ -0,0 +1,331 @@
+import argparse
+import json
+import logging
+import os
+import platform
+import random
+import statistics
+import subprocess
+import tempfile
+import time
+import numpy as np
+import pandas as pd
+import torch
+from transformers import BertConfig, BertModel, BertTokenizer
+from packages.dedup import NearDuplicateIndex
+from packages.config import DEDUP_THRESHOLD, DEDUP_LSH_THRESHOLD
+from .batching import iter_dynamic_batches
+from .check import EMOTICON_MAP, replace_emoticons, clean_text, preprocess_dataframe
+from .engine import TorchEngine
+from .predict import BERTClassifier, BERTDataset, prepare_comments, save_analysis_results
+from .token_cache import BatchTokenizer, TokenCache
+from .word_freq import WordFrequencies, WordCountStore
+
+# 합성 댓글 구성 요소 (실제 댓글처럼 감정 표현, 이모지, 반복 문자, 영어, 줄바꿈을 섞음)
+SUBJECTS = [
+    "이번 영상", "오늘 방송", "신제품", "이 노래", "배우님", "선수들", "편집", "디자인", "가격",
+    "서비스", "배송", "음질", "화질", "콘셉트", "무대", "이벤트", "매장 직원분", "새 앨범",
+]
+POSITIVE = ["정말 좋아요", "최고입니다", "감동받았어요", "너무 예뻐요", "완전 기대돼요", "또 보고 싶어요", "응원합니다"]
+NEUTRAL = ["그냥 그래요", "잘 모르겠어요", "언제 나와요", "몇 시에 해요", "다음 편은 언제인가요", "보통이네요"]
+NEGATIVE = ["별로예요", "실망했어요", "너무 비싸요", "다시는 안 사요", "최악이네요", "화가 나요"]
+FILLERS = ["ㅋㅋㅋㅋ", "ㅎㅎㅎ", "ㅠㅠㅠㅠ", "와아아아", "!!!!", "??", "...", "진짜", "근데", "대박", "헐", "good", "lol", "wow"]
+EMOJI = list(EMOTICON_MAP) + ["🔥", "✨", "🎉", "😂", "🙏"]
+REPEATS = ["ㅋ", "ㅎ", "ㅠ", "!", "♥", "아"]
+# 임의 단어 (고유명사/신조어처럼 긴 꼬리 분포를 만들기 위함)
+SYLLABLES = "가나다라마바사아자차카타파하고노도로모보소오조초코토포호구누두루무부수우주기니디리미비시이지치키"
+
+# 난수로 초기화한 작은 BERT (가중치 다운로드 없이 실행, 실제 KoBERT는 hidden 768 / 12 layers)
+TINY_BERT = dict(hidden_size=64, num_hidden_layers=2, num_attention_heads=2, intermediate_size=128, max_position_embeddings=512)
+
+DEFAULT_SIZES = "1000,10000,100000,1000000"
+# --quick: 1M 행을 건너뛰는 빠른 실행 (dedup 증가 추세를 보기 위해 100k까지는 항상 측정)
+QUICK_SIZES = "1000,10000,100000"
+# 이 행 수 이상에서는 한 번씩만 측정 (dedup 등 초 단위 이상 걸리는 단계)
+SINGLE_RUN_ROWS = 100000
+DEFAULT_BATCH_SIZES = "1,8,32,64"
+DEFAULT_LENGTHS = "16,64,128"
+BENCHMARKS = ("emoticons", "clean_text", "preprocess", "dedup", "word_freq", "aggregate",
+              "dataset", "batch_tokenizer", "forward", "predict")
+
+
+def synthetic_comment(rng):
+    parts = [rng.choice(SUBJECTS), rng.choice(rng.choice((POSITIVE, NEUTRAL, NEGATIVE)))]
+    for _ in range(rng.randint(1, 3)):
+        parts.insert(rng.randint(0, len(parts)), "".join(rng.choice(SYLLABLES) for _ in range(rng.randint(2, 3))))
+    for _ in range(rng.randint(0, 3)):
+        parts.insert(rng.randint(0, len(parts)), rng.choice(FILLERS))
+    text = " ".join(parts)
+    if rng.random() < 0.5:
+        text += rng.choice(EMOJI) * rng.randint(1, 3)
+    if rng.random() < 0.2:
+        text += rng.choice(REPEATS) * rng.randint(3, 10)
+    if rng.random() < 0.05:
+        text += "\n" + rng.choice(POSITIVE + NEUTRAL + NEGATIVE)
+    if rng.random() < 0.1:
+        text = " ".join([text] * rng.randint(2, 6))
+    return text
+
+
+def synthetic_comments(n, seed=0, duplicate_rate=0.1):
+    """
+    Seeded DataFrame of `n` crawled-looking comments (date, comment, link)
+    with exact and near duplicates mixed in.
+    """
+    rng = random.Random(seed)
+    comments = []
+    for _ in range(n):
+        if comments and rng.random() < duplicate_rate:
+            original = rng.choice(comments)
+            comments.append(original if rng.random() < 0.5 else original + " " + rng.choice(FILLERS))
+        else:
+            comments.append(synthetic_comment(rng))
+    days = np.random.default_rng(seed).integers(0, 365, n)
+    return pd.DataFrame({
+        "date": (pd.Timestamp("2024-01-01") + pd.to_timedelta(days, unit="D")).strftime("%Y-%m-%d"),
+        "comment": comments,
+        "link": [f"https://www.youtube.com/watch?v=video{i % 50}" for i in range(n)],
+    })
+
+
+def tiny_tokenizer(texts, directory):
+    # 말뭉치에 나온 글자 단위 WordPiece 어휘 (이모지 등은 [UNK])
+    chars = sorted({char for text in texts for char in text if not char.isspace()})
+    vocab = ["[PAD]", "[UNK]", "[CLS]", "[SEP]", "[MASK]"] + chars + ["##" + char for char in chars]
+    vocab_file = os.path.join(directory, "vocab.txt")
+    with open(vocab_file, "w", encoding="utf-8") as f:
+        f.write("\n".join(vocab))
+    return BertTokenizer(vocab_file, do_lower_case=False, tokenize_chinese_chars=False)
+
+
+def tiny_classifier(vocab_size, seed=0):
+    torch.manual_seed(seed)
+    config = BertConfig(vocab_size=vocab_size, **TINY_BERT)
+    return BERTClassifier(BertModel(config)).eval()
+
+
+def measure(fn, setup=None, repeat=3, warmup=1):
+    """
+    Run `fn(setup())` warmup + repeat times; only the calls are timed.
+    """
+    times = []
+    for i in range(warmup + repeat):
+        arg = setup() if setup is not None else None
+        start = time.perf_counter()
+        fn(arg)
+        elapsed = time.perf_counter() - start
+        if i >= warmup:
+            times.append(elapsed)
+    return {"min_s": round(min(times), 6), "median_s": round(statistics.median(times), 6), "repeat": repeat}
+
+
+def record(results, name, rows, timing, **params):
+    entry = {"name": name, "rows": rows, "params": params, **timing,
+             "rows_per_s": round(rows / timing["median_s"], 1) if timing["median_s"] else None}
+    results.append(entry)
+    print(f"{name:<16} rows={rows:<8} {json.dumps(params, ensure_ascii=False):<36} "
+          f"median={timing['median_s'] * 1000:.2f}ms rows/s={entry['rows_per_s']}")
+
+
+def run_text_benchmarks(results, df, selected, repeat, seed):
+    n = len(df)
+    comments = df["comment"].tolist()
+    if "emoticons" in selected:
+        record(results, "emoticons", n, measure(lambda _: [replace_emoticons(text) for text in comments], repeat=repeat))
+    if "clean_text" in selected:
+        record(results, "clean_text", n, measure(lambda _: [clean_text(text) for text in comments], repeat=repeat))
+    if "preprocess" in selected:
+        record(results, "preprocess", n, measure(preprocess_dataframe, setup=df.copy, repeat=repeat))
+
+    cleaned = [clean_text(text) for text in comments]
+    if "dedup" in selected:
+        def dedup(_):
+            index = NearDuplicateIndex(threshold=DEDUP_THRESHOLD, lsh_threshold=DEDUP_LSH_THRESHOLD)
+            for text in cleaned:
+                index.check_and_add(text)
+        timing = measure(dedup, repeat=repeat) if n < SINGLE_RUN_ROWS else measure(dedup, repeat=1, warmup=0)
+        record(results, "dedup", n, timing, threshold=DEDUP_THRESHOLD)
+
+    labels = np.random.default_rng(seed).integers(0, 3, n)
+    if "word_freq" in selected:
+        record(results, "word_freq", n, measure(lambda _: WordFrequencies().add(cleaned, labels), repeat=repeat))
+        with tempfile.TemporaryDirectory() as directory:
+            # 출처별 저장소: 처음 세는 경우(cold)와 이미 센 댓글을 다시 크롤링한 경우(warm)
+            store = WordCountStore(os.path.join(directory, "words.sqlite"))
+            versions = iter(range(1 << 30))
+            record(results, "word_store", n, measure(
+                lambda _: store.add(f"cold-{next(versions)}", "source", cleaned, labels), repeat=repeat), cache="cold")
+            record(results, "word_store", n, measure(
+                lambda _: store.add("warm", "source", cleaned, labels), repeat=repeat), cache="warm")
+            store.close()
+    if "aggregate" in selected:
+        # analyze_comments 마지막 단계 (감정 비율/기간별 집계/결과 파일 저장, 단어 빈도는 word_freq에서 측정)
+        processed = prepare_comments(df)
+        predictions = labels[:len(processed)].tolist()
+        word_frequencies = WordFrequencies().add(processed["comment"], predictions)
+        with tempfile.TemporaryDirectory() as save_dir:
+            record(results, "aggregate", len(processed), measure(
+                lambda frames: save_analysis_results(frames[0], frames[1], predictions, save_dir, word_frequencies),
+                setup=lambda: (df.copy(), processed.copy()), repeat=repeat,
+            ))
+
+
+def run_model_benchmarks(results, df, selected, repeat, seed, batch_sizes, lengths, max_len=128):
+    n = len(df)
+    texts = [clean_text(text) for text in df["comment"]]
+    with tempfile.TemporaryDirectory() as directory:
+        tokenizer = tiny_tokenizer(texts, directory)
+        model = tiny_classifier(len(tokenizer), seed)
+        engine = TorchEngine(model, torch.device("cpu"))
+
+        if "dataset" in selected:
+            # 고정 길이 패딩 (BERTDataset.__getitem__ 단위 토큰화)
+            dataset = BERTDataset(pd.DataFrame({"comment": texts}), tokenizer, max_len)
+            record(results, "dataset", n, measure(lambda _: [dataset[i] for i in range(len(dataset))], repeat=repeat),
+                   max_len=max_len)
+
+        if "batch_tokenizer" in selected:
+            record(results, "batch_tokenizer", n, measure(
+                lambda _: BatchTokenizer(tokenizer).encode(texts, max_len), repeat=repeat), cache="none")
+            cache = TokenCache(os.path.join(directory, "tokens.sqlite"))
+            cached_tokenizer = BatchTokenizer(tokenizer, cache)
+            cached_tokenizer.encode(texts, max_len)
+            record(results, "batch_tokenizer", n, measure(
+                lambda _: cached_tokenizer.encode(texts, max_len), repeat=repeat), cache="warm")
+            cache.close()
+
+        if "forward" in selected:
+            generator = torch.Generator().manual_seed(seed)
+            for batch_size in batch_sizes:
+                for length in lengths:
+                    input_ids = torch.randint(5, len(tokenizer), (batch_size, length), generator=generator)
+                    attention_mask = torch.ones_like(input_ids)
+                    record(results, "forward", batch_size, measure(
+                        lambda _: engine.predict_proba(input_ids, attention_mask), repeat=repeat),
+                        batch_size=batch_size, length=length)
+
+        if "predict" in selected:
+            # 전체 댓글 추론: 길이별 배치 + 동적 패딩과 고정 길이 패딩 비교
+            sequences = BatchTokenizer(tokenizer).encode(texts, max_len)
+            batch_size = max(batch_sizes)
+
+            def dynamic(_):
+                for _, input_ids, attention_mask in iter_dynamic_batches(sequences, batch_size, tokenizer.pad_token_id):
+                    engine.predict_proba(input_ids, attention_mask)
+
+            def fixed(_):
+                for start in range(0, n, batch_size):
+                    batch = tokenizer(texts[start:start + batch_size], padding="max_length", truncation=True,
+                                      max_length=max_len, return_tensors="pt")
+                    engine.predict_proba(batch["input_ids"], batch["attention_mask"])
+
+            record(results, "predict", n, measure(dynamic, repeat=repeat), padding="dynamic", batch_size=batch_size)
+            record(results, "predict", n, measure(fixed, repeat=repeat), padding="fixed", batch_size=batch_size)
+
+
+def environment(args):
+    try:
+        commit = subprocess.run(["git", "rev-parse", "--short", "HEAD"], capture_output=True, text=True).stdout.strip()
+    except OSError:
+        commit = None
+    return {
+        "created_at": time.strftime("%Y-%m-%dT%H:%M:%S"),
+        "git_commit": commit or None,
+        "python": platform.python_version(),
+        "torch": torch.__version__,
+        "platform": platform.platform(),
+        "cpu_count": os.cpu_count(),
+        "torch_threads": torch.get_num_threads(),
+        "seed": args.seed,
+        "tiny_bert": TINY_BERT,
+    }
+
+
+def compare(results, baseline_path):
+    # 같은 벤치마크(이름/행 수/파라미터)의 중앙값을 이전 결과와 비교
+    with open(baseline_path, encoding="utf-8") as f:
+        baseline = {
+            (entry["name"], entry["rows"], json.dumps(entry["params"], sort_keys=True)): entry
+            for entry in json.load(f)["results"]
+        }
+    print(f"\nCompared with {baseline_path} (ratio < 1 is faster):")
+    for entry in results:
+        previous = baseline.get((entry["name"], entry["rows"], json.dumps(entry["params"], sort_keys=True)))
+        if previous is not None and previous["median_s"]:
+            ratio = entry["median_s"] / previous["median_s"]
+            print(f"{entry['name']:<16} rows={entry['rows']:<8} {json.dumps(entry['params'], ensure_ascii=False):<36} x{ratio:.2f}")
+
+
+def report_scaling(results):
+    # 같은 벤치마크의 크기별 중앙값과 행 수 증가 대비 시간 증가 배율 (1에 가까울수록 선형)
+    series = {}
+    for entry in results:
+        key = (entry["name"], json.dumps(entry["params"], ensure_ascii=False))
+        series.setdefault(key, []).append((entry["rows"], entry["median_s"]))
+    print("\nScaling (median per size; growth = time ratio / row ratio, 1.0 is linear):")
+    for (name, params), points in series.items():
+        points = sorted(set(points))
+        if len(points) < 2:
+            continue
+        cells = [f"{rows}: {seconds * 1000:.1f}ms" for rows, seconds in points]
+        growth = [
+            f"{(seconds / previous_seconds) / (rows / previous_rows):.2f}"
+            for (previous_rows, previous_seconds), (rows, seconds) in zip(points, points[1:])
+            if previous_seconds and rows != previous_rows
+        ]
+        print(f"{name:<16} {params:<36} {' | '.join(cells)}  growth={','.join(growth)}")
+
+
+def parse_ints(value):
+    return [int(part) for part in value.split(",") if part]
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Offline micro-benchmarks for the preprocessing, dedup, inference and aggregation hot paths.")
+    parser.add_argument("--sizes", default=None, help=f"corpus sizes (comma separated, default: {DEFAULT_SIZES})")
+    parser.add_argument("--quick", action="store_true", help=f"use sizes {QUICK_SIZES} (skips 1M rows)")
+    parser.add_argument("--model-rows", type=int, default=2000, help="max rows for tokenizer/model benchmarks")
+    parser.add_argument("--batch-sizes", default=DEFAULT_BATCH_SIZES)
+    parser.add_argument("--lengths", default=DEFAULT_LENGTHS)
+    parser.add_argument("--only", default=",".join(BENCHMARKS), help=f"subset of {','.join(BENCHMARKS)}")
+    parser.add_argument("--repeat", type=int, default=3)
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument("--threads", type=int, default=0, help="torch threads (0: library default)")
+    parser.add_argument("--output", default=None, help="result JSON path (default: benchmarks/<timestamp>.json)")
+    parser.add_argument("--compare", default=None, help="previous result JSON to compare against")
+    args = parser.parse_args()
+
+    sizes = args.sizes or (QUICK_SIZES if args.quick else DEFAULT_SIZES)
+    if args.threads:
+        torch.set_num_threads(args.threads)
+    selected = set(args.only.split(","))
+    unknown = selected - set(BENCHMARKS)
+    if unknown:
+        parser.error(f"Unknown benchmarks: {', '.join(sorted(unknown))}")
+
+    # 집계 단계의 단계별 로그가 측정에 섞이지 않도록 함
+    logging.getLogger("models.predict").setLevel(logging.ERROR)
+
+    results = []
+    model_benchmarks_done = set()
+    for size in parse_ints(sizes):
+        df = synthetic_comments(size, seed=args.seed)
+        run_text_benchmarks(results, df, selected, args.repeat, args.seed)
+
+        # 모델 벤치마크는 --model-rows 이하로 제한 (forward는 입력 크기와 무관하므로 한 번만)
+        model_rows = min(size, args.model_rows)
+        if model_rows not in model_benchmarks_done:
+            model_selected = selected - ({"forward"} if model_benchmarks_done else set())
+            run_model_benchmarks(results, df.head(model_rows), model_selected, args.repeat, args.seed,
+                                 parse_ints(args.batch_sizes), parse_ints(args.lengths))
+            model_benchmarks_done.add(model_rows)
+
+    output = args.output or os.path.join("benchmarks", time.strftime("%Y%m%d_%H%M%S") + ".json")
+    os.makedirs(os.path.dirname(os.path.abspath(output)), exist_ok=True)
+    with open(output, "w", encoding="utf-8") as f:
+        json.dump({"environment": environment(args), "results": results}, f, ensure_ascii=False, indent=2)
+    report_scaling(results)
+    print(f"\nResults saved to {output}")
+
+    if args.compare:
+        compare(results, args.compare)
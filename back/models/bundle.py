@@ -0,0 +1,91 @@
+import argparse
+import json
+import os
+from kobert_tokenizer import KoBERTTokenizer
+from transformers import BertConfig
+from .prediction_cache import file_digest
+from logging_config import setup_logger
+
+# 로그 설정
+logger = setup_logger(__name__)
+
+MANIFEST_FILE = "manifest.json"
+
+
+def verify_bundle(bundle_dir):
+    """
+    Check every file listed in the bundle manifest against its recorded
+    digest. Raises FileNotFoundError or ValueError describing the problem.
+    """
+    manifest_path = os.path.join(bundle_dir, MANIFEST_FILE)
+    if not os.path.exists(manifest_path):
+        raise FileNotFoundError(f"No model bundle at {bundle_dir} (create it with `python -m models.bundle`).")
+    with open(manifest_path, encoding="utf-8") as f:
+        manifest = json.load(f)
+    for name, digest in manifest["files"].items():
+        path = os.path.join(bundle_dir, name)
+        if not os.path.exists(path):
+            raise FileNotFoundError(f"Model bundle file missing: {path}")
+        if file_digest(path) != digest:
+            raise ValueError(f"Model bundle file does not match its manifest digest: {path}")
+    return manifest
+
+
+def load_tokenizer_and_config(bundle_dir, pretrained_name, allow_hub=False):
+    """
+    Load the tokenizer and BERT config from the local bundle without touching
+    the hub, after verifying the bundle against its manifest. A missing or
+    corrupt bundle raises, unless `allow_hub` is set, in which case it is
+    logged and `pretrained_name` is loaded from the hub instead.
+    The BERT weights themselves always come from the fine-tuned checkpoint,
+    so the pretrained weights are never downloaded.
+    """
+    try:
+        verify_bundle(bundle_dir)
+        source, local_only = bundle_dir, True
+    except (OSError, ValueError, KeyError) as e:
+        if not allow_hub:
+            raise
+        logger.warning(f"Model bundle unusable ({e}); loading {pretrained_name} from the hub.")
+        source, local_only = pretrained_name, False
+    tokenizer = KoBERTTokenizer.from_pretrained(source, local_files_only=local_only)
+    config = BertConfig.from_pretrained(source, local_files_only=local_only)
+    return tokenizer, config, source
+
+
+def create_bundle(bundle_dir, pretrained_name, model_path):
+    """
+    Download the tokenizer and config once and pin them, together with the
+    checkpoint hash, in `bundle_dir`.
+    """
+    os.makedirs(bundle_dir, exist_ok=True)
+    tokenizer = KoBERTTokenizer.from_pretrained(pretrained_name)
+    config = BertConfig.from_pretrained(pretrained_name)
+    tokenizer.save_pretrained(bundle_dir)
+    config.save_pretrained(bundle_dir)
+
+    files = {
+        name: file_digest(os.path.join(bundle_dir, name))
+        for name in sorted(os.listdir(bundle_dir))
+        if name != MANIFEST_FILE
+    }
+    manifest = {
+        "pretrained_name": pretrained_name,
+        "model_path": model_path,
+        "model_version": file_digest(model_path),
+        "files": files,
+    }
+    with open(os.path.join(bundle_dir, MANIFEST_FILE), "w", encoding="utf-8") as f:
+        json.dump(manifest, f, indent=2)
+    return manifest
+
+
+if __name__ == "__main__":
+    from packages.config import MODEL_BUNDLE_DIR, MODEL_PATH, PRETRAINED_MODEL_NAME
+
+    parser = argparse.ArgumentParser(description="Create an offline tokenizer/config bundle.")
+    parser.add_argument("--output", default=MODEL_BUNDLE_DIR)
+    parser.add_argument("--pretrained", default=PRETRAINED_MODEL_NAME)
+    parser.add_argument("--model-path", default=MODEL_PATH)
+    args = parser.parse_args()
+    print(json.dumps(create_bundle(args.output, args.pretrained, args.model_path), indent=2))
@@ -2,6 +2,7 @@ import pandas as pd
 import re
 import unicodedata
 import logging
+from concurrent.futures import ProcessPoolExecutor
 
 logging.basicConfig(level=logging.INFO)
 
@@ -25,6 +26,18 @@ EMOTICON_MAP = {
     "🤔": "고민해 볼게요", "^^": "좋아요", "♡": "사랑해요", "♥": "사랑해요"
 }
 
+# 전처리 정규식 (모듈 로드 시 한 번만 컴파일)
+EMOTICON_PATTERN = re.compile("|".join(re.escape(k) for k in EMOTICON_MAP.keys()))
+SPECIAL_CHARACTER_PATTERN = re.compile(r'[^!?.,\w\s]')
+REPEAT_PATTERN = re.compile(r"(.)\1{2,}")
+
+# 대용량 데이터프레임 병렬 전처리 설정
+PARALLEL_MIN_ROWS = 200000  # 이 행 수 이상일 때만 프로세스 풀 사용
+PARALLEL_CHUNK_ROWS = 20000  # 프로세스 하나에 넘기는 행 수
+
+def _emoticon_repl(match):
+    return EMOTICON_MAP[match.group(0)]
+
 # 이모티콘 처리 함수
 def replace_emoticons(text):
     """
@@ -33,17 +46,15 @@ def replace_emoticons(text):
     """
     if not isinstance(text, str):  # 문자열이 아닌 경우 처리
         return str(text)  # 문자열로 변환
-    
-    # 정규식 패턴 생성
-    pattern = re.compile("|".join(re.escape(k) for k in EMOTICON_MAP.keys()))
-    return pattern.sub(lambda m: EMOTICON_MAP[m.group(0)], text)
+
+    return EMOTICON_PATTERN.sub(_emoticon_repl, text)
 
 def remove_special_characters(text):
     """
     Remove special characters except !, ?, ., ,. Also removes newlines (\n).
     """
     # \n 포함하여 제거
-    return re.sub(r'[^!?.,\w\s]', '', text).replace('\n', '')
+    return SPECIAL_CHARACTER_PATTERN.sub('', text).replace('\n', '')
 
 
 
@@ -55,33 +66,62 @@ def preprocess_text(text):
     # 자모 분리 해결
     text = unicodedata.normalize('NFC', text)
     # 중복 문자 정리 (3회 이상 반복되는 문자 2회로 축소)
-    text = re.sub(r"(.)\1{2,}", r"\1\1", text)
-    return text
+    return REPEAT_PATTERN.sub(r"\1\1", text)
+
+# 단일 댓글 전처리 함수 (길이 필터 없음)
+def clean_text(text):
+    """
+    Apply the same cleaning steps as preprocess_dataframe to a single comment,
+    without the length filter.
+    """
+    text = '' if text is None else str(text).strip()
+    return preprocess_text(remove_special_characters(replace_emoticons(text)))
+
+def _clean_stripped(values):
+    """
+    Emoticon, special-character and Jamo/repeat steps fused into one pass over
+    already stripped values (non-strings become str(value), as in replace_emoticons).
+    """
+    emoticon_sub = EMOTICON_PATTERN.sub
+    special_sub = SPECIAL_CHARACTER_PATTERN.sub
+    repeat_sub = REPEAT_PATTERN.sub
+    normalize = unicodedata.normalize
+    cleaned = []
+    for text in values:
+        if isinstance(text, str):
+            text = emoticon_sub(_emoticon_repl, text)
+        else:
+            text = str(text)
+        text = special_sub('', text).replace('\n', '')
+        cleaned.append(repeat_sub(r"\1\1", normalize('NFC', text)))
+    return cleaned
+
+def _clean_column(values, workers=None):
+    if not workers or workers <= 1 or len(values) < PARALLEL_MIN_ROWS:
+        return _clean_stripped(values)
+    chunks = [values[i:i + PARALLEL_CHUNK_ROWS] for i in range(0, len(values), PARALLEL_CHUNK_ROWS)]
+    with ProcessPoolExecutor(max_workers=workers) as executor:
+        return [text for chunk in executor.map(_clean_stripped, chunks) for text in chunk]
 
 # 데이터프레임 전처리 함수
-def preprocess_dataframe(df, text_column='comment'):
+def preprocess_dataframe(df, text_column='comment', workers=None):
     """
     Preprocess a DataFrame by handling NaN, stripping whitespace, replacing emoticons,
     removing special characters, and normalizing text.
     Filters rows based on text length (5 to 300 characters).
+    With `workers` > 1, frames of PARALLEL_MIN_ROWS rows or more are split across a process pool.
     """
     if text_column not in df.columns:
         raise ValueError(f"Column '{text_column}' not found in DataFrame.")
 
     # 1. 공백 및 NaN 값 처리
-    df[text_column] = df[text_column].fillna('').str.strip()
-
-    # 2. 이모티콘 처리
-    df[text_column] = df[text_column].apply(replace_emoticons)
-
-    # 3. 특수문자 제거
-    df[text_column] = df[text_column].apply(remove_special_characters)
+    stripped = df[text_column].fillna('').str.strip()
 
-    # 4. 자모 분리 해결 및 중복 문자 정리
-    df[text_column] = df[text_column].apply(preprocess_text)
+    # 2~4. 이모티콘 처리, 특수문자 제거, 자모 분리 해결 및 중복 문자 정리 (한 번의 순회로 처리)
+    df[text_column] = pd.Series(_clean_column(stripped.tolist(), workers), index=df.index, dtype=object)
 
     # 5. 텍스트 길이에 따라 필터링 (5 ~ 300자 사이)
-    return df[df[text_column].apply(len).between(5, 300)]
+    return df[df[text_column].str.len().between(5, 300)]
 
 # CSV 파일에서 줄바꿈이 포함된 댓글 처리
 def preprocess_multiline_csv(file_path, output_path=None):
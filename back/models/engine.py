@@ -0,0 +1,151 @@
+import argparse
+import copy
+import json
+import numpy as np
+import torch
+import torch.nn as nn
+from .batching import iter_dynamic_batches
+
+BACKENDS = ("torch", "torch_int8", "onnx")
+
+
+def _softmax(logits):
+    exp = np.exp(logits - logits.max(axis=1, keepdims=True))
+    return exp / exp.sum(axis=1, keepdims=True)
+
+
+class TorchEngine:
+    """
+    Eager FP32 PyTorch inference.
+    """
+
+    name = "torch"
+
+    def __init__(self, model, device):
+        self.model = model
+        self.device = device
+
+    def predict_proba(self, input_ids, attention_mask):
+        with torch.no_grad():
+            outputs = self.model(input_ids=input_ids.to(self.device), attention_mask=attention_mask.to(self.device))
+            return torch.softmax(outputs, dim=1).cpu().numpy()
+
+
+class QuantizedTorchEngine(TorchEngine):
+    """
+    Dynamically quantized INT8 Linear layers (CPU only).
+    """
+
+    name = "torch_int8"
+
+    def __init__(self, model, device):
+        quantized = torch.ao.quantization.quantize_dynamic(copy.deepcopy(model).to("cpu"), {nn.Linear}, dtype=torch.qint8)
+        super().__init__(quantized.eval(), torch.device("cpu"))
+
+
+class OnnxEngine:
+    """
+    Exported ONNX graph run through ONNX Runtime on CPU.
+    """
+
+    name = "onnx"
+
+    def __init__(self, onnx_path, intra_op_threads=0):
+        import onnxruntime as ort
+
+        options = ort.SessionOptions()
+        options.graph_optimization_level = ort.GraphOptimizationLevel.ORT_ENABLE_ALL
+        options.intra_op_num_threads = intra_op_threads
+        self.session = ort.InferenceSession(onnx_path, options, providers=["CPUExecutionProvider"])
+
+    def predict_proba(self, input_ids, attention_mask):
+        logits = self.session.run(["logits"], {
+            "input_ids": input_ids.cpu().numpy().astype(np.int64),
+            "attention_mask": attention_mask.cpu().numpy().astype(np.int64),
+        })[0]
+        return _softmax(logits)
+
+
+def create_engine(backend, model, device, onnx_path=None, threads=0):
+    if backend == "torch":
+        return TorchEngine(model, device)
+    if backend == "torch_int8":
+        return QuantizedTorchEngine(model, device)
+    if backend == "onnx":
+        return OnnxEngine(onnx_path, threads)
+    raise ValueError(f"Unknown inference backend: {backend}. Choose one of {BACKENDS}.")
+
+
+def export_onnx(model, onnx_path, opset_version=14):
+    """
+    Export the classifier with dynamic batch and sequence axes.
+    """
+    model = copy.deepcopy(model).to("cpu").eval()
+    input_ids = torch.ones((2, 16), dtype=torch.long)
+    attention_mask = torch.ones((2, 16), dtype=torch.long)
+    torch.onnx.export(
+        model,
+        (input_ids, attention_mask),
+        onnx_path,
+        input_names=["input_ids", "attention_mask"],
+        output_names=["logits"],
+        dynamic_axes={
+            "input_ids": {0: "batch", 1: "sequence"},
+            "attention_mask": {0: "batch", 1: "sequence"},
+            "logits": {0: "batch"},
+        },
+        opset_version=opset_version,
+    )
+    return onnx_path
+
+
+def parity_check(reference, candidate, sequences, pad_id, batch_size=64):
+    """
+    Compare a candidate engine with the FP32 reference on the same batches.
+    Reports label agreement and the largest probability difference.
+    """
+    agree = 0
+    max_diff = 0.0
+    for _, input_ids, attention_mask in iter_dynamic_batches(sequences, batch_size, pad_id):
+        expected = reference.predict_proba(input_ids, attention_mask)
+        actual = candidate.predict_proba(input_ids, attention_mask)
+        agree += int((expected.argmax(axis=1) == actual.argmax(axis=1)).sum())
+        max_diff = max(max_diff, float(np.abs(expected - actual).max()))
+    total = len(sequences)
+    return {
+        "backend": candidate.name,
+        "rows": total,
+        "label_agreement": agree / total if total else 1.0,
+        "max_prob_diff": max_diff,
+    }
+
+
+if __name__ == "__main__":
+    import pandas as pd
+    from . import predict
+    from .check import preprocess_dataframe
+    from .token_cache import BatchTokenizer
+    from packages.config import ONNX_MODEL_PATH
+
+    parser = argparse.ArgumentParser(description="Export the classifier to ONNX or check backend parity.")
+    subparsers = parser.add_subparsers(dest="command", required=True)
+    export_parser = subparsers.add_parser("export", help="Export the classifier to ONNX.")
+    export_parser.add_argument("--output", default=ONNX_MODEL_PATH)
+    parity_parser = subparsers.add_parser("parity", help="Compare a backend against eager FP32 torch.")
+    parity_parser.add_argument("--backend", choices=BACKENDS[1:], default="onnx")
+    parity_parser.add_argument("--input", default="dataset/comments.csv")
+    parity_parser.add_argument("--onnx-path", default=ONNX_MODEL_PATH)
+    parity_parser.add_argument("--batch-size", type=int, default=64)
+    parity_parser.add_argument("--max-len", type=int, default=128)
+    args = parser.parse_args()
+
+    tokenizer, model, _ = predict.build_classifier()
+    if args.command == "export":
+        print(f"Exported ONNX model to {export_onnx(model, args.output)}")
+    else:
+        df = preprocess_dataframe(pd.read_csv(args.input, encoding="utf-8-sig"), text_column='comment')
+        sequences = BatchTokenizer(tokenizer).encode(df['comment'].tolist(), args.max_len)
+        reference = TorchEngine(model, predict.device)
+        candidate = create_engine(args.backend, model, predict.device, args.onnx_path)
+        report = parity_check(reference, candidate, sequences, tokenizer.pad_token_id, args.batch_size)
+        print(json.dumps(report, indent=2))
@@ -0,0 +1,104 @@
+import asyncio
+from concurrent.futures import ThreadPoolExecutor
+import numpy as np
+
+
+class _Request:
+    def __init__(self, texts, future):
+        self.texts = texts
+        self.future = future
+
+
+def _cancel(requests):
+    for request in requests:
+        if not request.future.done():
+            request.future.cancel()
+
+
+class MicroBatcher:
+    """
+    Combine concurrent scoring requests into one model batch.
+
+    Requests wait in an asyncio queue; a single consumer takes the first one
+    and keeps collecting until `max_batch_size` texts are gathered or
+    `max_wait_ms` has passed, then runs `predict_fn(texts)` on a dedicated
+    thread and hands each caller its slice of the result.
+    """
+
+    def __init__(self, predict_fn, max_batch_size=64, max_wait_ms=10):
+        self.predict_fn = predict_fn
+        self.max_batch_size = max_batch_size
+        self.max_wait = max_wait_ms / 1000
+        self._executor = ThreadPoolExecutor(max_workers=1, thread_name_prefix="micro-batch")
+        self._queue = None
+        self._task = None
+
+    def _ensure_started(self):
+        # 큐는 한 번만 생성 (소비 작업이 재시작되어도 대기 중인 요청 유지)
+        if self._queue is None:
+            self._queue = asyncio.Queue()
+        if self._task is None or self._task.done():
+            self._task = asyncio.get_running_loop().create_task(self._run())
+
+    async def submit(self, texts):
+        """
+        Score `texts` and return their class probabilities in order.
+        """
+        self._ensure_started()
+        future = asyncio.get_running_loop().create_future()
+        await self._queue.put(_Request(list(texts), future))
+        return await future
+
+    def queue_depth(self):
+        return self._queue.qsize() if self._queue is not None else 0
+
+    async def stop(self):
+        if self._task is not None:
+            self._task.cancel()
+            self._task = None
+        # 처리되지 않은 요청은 호출자가 무한히 기다리지 않도록 취소
+        while self._queue is not None and not self._queue.empty():
+            _cancel([self._queue.get_nowait()])
+        self._executor.shutdown(wait=False)
+
+    async def _collect(self):
+        loop = asyncio.get_running_loop()
+        batch = [await self._queue.get()]
+        size = len(batch[0].texts)
+        deadline = loop.time() + self.max_wait
+        try:
+            while size < self.max_batch_size:
+                timeout = deadline - loop.time()
+                if timeout <= 0:
+                    break
+                try:
+                    request = await asyncio.wait_for(self._queue.get(), timeout)
+                except asyncio.TimeoutError:
+                    break
+                batch.append(request)
+                size += len(request.texts)
+        except asyncio.CancelledError:
+            _cancel(batch)
+            raise
+        return batch
+
+    async def _run(self):
+        loop = asyncio.get_running_loop()
+        while True:
+            batch = await self._collect()
+            texts = [text for request in batch for text in request.texts]
+            try:
+                probs = await loop.run_in_executor(self._executor, self.predict_fn, texts)
+            except asyncio.CancelledError:
+                _cancel(batch)
+                raise
+            except Exception as e:
+                for request in batch:
+                    if not request.future.done():
+                        request.future.set_exception(e)
+                continue
+
+            offsets = np.cumsum([0] + [len(request.texts) for request in batch])
+            for request, start, end in zip(batch, offsets[:-1], offsets[1:]):
+                if not request.future.done():
+                    request.future.set_result(probs[start:end])
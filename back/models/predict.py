@@ -1,14 +1,32 @@
 import logging
 import os
+import threading
+import time
+from collections import OrderedDict
+from typing import Optional
+import numpy as np
 import pandas as pd
 import torch
 import torch.nn as nn
 from transformers import AdamW
-from kobert_tokenizer import KoBERTTokenizer
 from transformers import BertModel
 from fastapi import FastAPI
 from .check import preprocess_dataframe, preprocess_multiline_csv
+from .batching import iter_dynamic_batches
+from .token_cache import BatchTokenizer, TokenCache
+from .prediction_cache import PredictionCache, file_digest
+from .bundle import load_tokenizer_and_config
+from .engine import create_engine
+from .result_io import write_result, write_json
+from .aggregates import build_summary
+from .word_freq import WordFrequencies, WordCountStore
+from .registry import ModelRegistry
 from logging_config import setup_logger
+from packages.metrics import STAGE_SECONDS, COMMENTS_PROCESSED, CACHE_REQUESTS
+from packages.config import TOKEN_CACHE_PATH, TOKEN_CACHE_MAX_ENTRIES, PREDICTION_CACHE_PATH, PREDICTION_CACHE_MAX_ENTRIES
+from packages.config import MODEL_PATH, MODEL_BUNDLE_DIR, MODEL_HUB_FALLBACK, PRETRAINED_MODEL_NAME, INFERENCE_BACKEND, ONNX_MODEL_PATH
+from packages.config import INFERENCE_THREADS, PREPROCESS_WORKERS, RESULT_FORMAT, RESULT_CSV_EXPORT
+from packages.config import MODEL_REGISTRY_DIR, MODEL_KEEP_LOADED, WORD_COUNT_PATH, WORD_COUNT_KEEP_VERSIONS
 
 # 로그 설정
 logger = setup_logger(__name__)
@@ -38,16 +56,159 @@ class BERTClassifier(nn.Module):
 # GPU 설정
 device = torch.device("cuda" if torch.cuda.is_available() else "cpu")
 
-# KoBERT 모델 및 토크나이저 로드
-tokenizer = KoBERTTokenizer.from_pretrained("skt/kobert-base-v1")
-
-bert_model = BertModel.from_pretrained("skt/kobert-base-v1")
-
-# 사전 학습된 모델 불러오기
-MODEL_PATH = "models/best_kobert_model.pt"
-model = BERTClassifier(bert_model).to(device)
-model.load_state_dict(torch.load(MODEL_PATH, map_location=device))
-model.eval()
+# 모델 관련 객체 (load_model()에서 지연 로딩)
+tokenizer = None
+model = None
+engine = None
+batch_tokenizer = None
+model_version = None
+prediction_cache = None
+word_count_store = None
+model_status = {"state": "not_loaded", "source": None, "backend": None, "load_seconds": None, "warmup_seconds": None,
+                "error": None, "registry_version": None, "model_version": None}
+_model_lock = threading.Lock()
+
+# 모델 forward 실행은 작업/요청과 관계없이 한 번에 하나씩 (배치 단위로 번갈아 실행)
+_inference_lock = threading.Lock()
+
+# 재학습된 모델 버전 저장소 (ACTIVE 버전이 없으면 MODEL_PATH 사용)
+model_registry = ModelRegistry(MODEL_REGISTRY_DIR)
+
+# 즉시 롤백을 위해 최근 사용한 버전의 모델/엔진을 메모리에 유지 (registry 버전 -> (model, engine, model_version))
+_loaded_models = OrderedDict()
+_swap_lock = threading.Lock()
+
+
+def build_classifier(model_path=MODEL_PATH):
+    """
+    Build the FP32 classifier from the tokenizer bundle and a checkpoint.
+    Returns (tokenizer, model, source).
+    """
+    # KoBERT 토크나이저 및 설정 로드 (검증된 로컬 번들만 사용, MODEL_HUB_FALLBACK이면 허브 허용)
+    loaded_tokenizer, config, source = load_tokenizer_and_config(
+        MODEL_BUNDLE_DIR, PRETRAINED_MODEL_NAME, allow_hub=MODEL_HUB_FALLBACK
+    )
+
+    # 사전 학습된 모델 불러오기 (BERT 가중치도 체크포인트에 포함되어 있음)
+    loaded_model = BERTClassifier(BertModel(config)).to(device)
+    loaded_model.load_state_dict(torch.load(model_path, map_location=device))
+    loaded_model.eval()
+    return loaded_tokenizer, loaded_model, source
+
+
+def load_model():
+    """
+    Load the tokenizer, classifier and caches once. Safe to call from several
+    threads; later calls return immediately.
+    """
+    global tokenizer, model, engine, batch_tokenizer, model_version, prediction_cache, word_count_store
+    with _model_lock:
+        if model is not None:
+            return
+        model_status.update(state="loading", error=None)
+        start_time = time.time()
+        try:
+            # 재학습 후 적용된 버전이 있으면 해당 체크포인트로 시작
+            registry_version = model_registry.active() if INFERENCE_BACKEND != "onnx" else None
+            if INFERENCE_THREADS:
+                torch.set_num_threads(INFERENCE_THREADS)
+            loaded_tokenizer, loaded_model, loaded_engine, loaded_version, source = _build_version(registry_version)
+            _remember(registry_version, (loaded_model, loaded_engine, loaded_version))
+            model_version = loaded_version
+            model_status.update(registry_version=registry_version, model_version=model_version)
+
+            prediction_cache = PredictionCache(PREDICTION_CACHE_PATH, max_entries=PREDICTION_CACHE_MAX_ENTRIES)
+
+            # 출처(비디오/게시물)별 단어 빈도 누적 저장소 (모델 버전별로 분리)
+            word_count_store = WordCountStore(WORD_COUNT_PATH, keep_versions=WORD_COUNT_KEEP_VERSIONS)
+
+            # 토큰 ID 캐시 (이전 크롤링/재학습에서 토큰화한 댓글 재사용)
+            token_cache = TokenCache(TOKEN_CACHE_PATH, max_entries=TOKEN_CACHE_MAX_ENTRIES)
+            batch_tokenizer = BatchTokenizer(loaded_tokenizer, token_cache, namespace=PRETRAINED_MODEL_NAME)
+            tokenizer = loaded_tokenizer
+            model = loaded_model
+            engine = loaded_engine
+        except Exception as e:
+            logger.exception("Failed to load model.")
+            model_status.update(state="failed", error=str(e))
+            raise
+        model_status.update(state="loaded", source=source, backend=INFERENCE_BACKEND, load_seconds=round(time.time() - start_time, 2))
+        logger.info(f"Model loaded from {source} in {model_status['load_seconds']}s (version {model_version}).")
+
+
+def _build_version(registry_version):
+    path = MODEL_PATH if registry_version is None else model_registry.checkpoint_path(registry_version)
+    loaded_tokenizer, loaded_model, source = build_classifier(path)
+
+    # 추론 엔진 선택 (torch / torch_int8 / onnx)
+    loaded_engine = create_engine(INFERENCE_BACKEND, loaded_model, device, ONNX_MODEL_PATH, INFERENCE_THREADS)
+
+    # 감정 예측 캐시 키 (가중치 파일 해시와 추론 엔진을 모델 버전으로 사용하여 변경 시 자동 무효화)
+    loaded_version = f"{file_digest(path)}-{INFERENCE_BACKEND}"
+    if INFERENCE_BACKEND == "onnx":
+        # ONNX 엔진은 별도 파일로 추론하므로 그 파일의 해시도 포함
+        loaded_version += f"-{file_digest(ONNX_MODEL_PATH)}"
+    return loaded_tokenizer, loaded_model, loaded_engine, loaded_version, source
+
+
+def _remember(registry_version, loaded):
+    _loaded_models[registry_version] = loaded
+    _loaded_models.move_to_end(registry_version)
+    while len(_loaded_models) > max(1, MODEL_KEEP_LOADED):
+        _loaded_models.popitem(last=False)
+
+
+def active_engine():
+    """
+    (engine, model_version) of the serving model, read together so a
+    request never mixes one version's outputs with another's cache key.
+    """
+    load_model()
+    with _model_lock:
+        return engine, model_version
+
+
+def swap_model(registry_version):
+    """
+    Serve registry version `registry_version` (None: the base checkpoint)
+    without a restart. Weights are loaded before the switch, so requests in
+    flight finish on the model they started with; recently served versions
+    are kept in memory, which makes rolling back to them immediate.
+    """
+    global model, engine, model_version
+    load_model()
+    if INFERENCE_BACKEND == "onnx":
+        raise RuntimeError("Hot-swapping needs the torch or torch_int8 backend (the ONNX graph is exported from MODEL_PATH).")
+
+    with _swap_lock:
+        loaded = _loaded_models.get(registry_version)
+        if loaded is None:
+            start_time = time.time()
+            _, loaded_model, loaded_engine, loaded_version, _ = _build_version(registry_version)
+            loaded = (loaded_model, loaded_engine, loaded_version)
+            logger.info(f"Loaded model {registry_version or 'base'} in {time.time() - start_time:.2f}s.")
+        with _model_lock:
+            model, engine, model_version = loaded
+            _remember(registry_version, loaded)
+        model_registry.activate(registry_version)
+        model_status.update(registry_version=registry_version, model_version=model_version)
+    logger.info(f"Serving model {registry_version or 'base'} (version {model_version}).")
+    return model_version
+
+
+def warm_up(batch_size=8, max_len=128):
+    """
+    Run one throw-away batch so the first real request does not pay for
+    lazy allocations and kernel selection.
+    """
+    current_engine, _ = active_engine()
+    start_time = time.time()
+    for length in (16, max_len):
+        input_ids = torch.full((batch_size, length), tokenizer.pad_token_id, dtype=torch.long)
+        attention_mask = torch.ones_like(input_ids)
+        current_engine.predict_proba(input_ids, attention_mask)
+    model_status.update(state="ready", warmup_seconds=round(time.time() - start_time, 2))
+    logger.info(f"Model warm-up finished in {model_status['warmup_seconds']}s.")
 
 # 데이터셋 클래스 정의
 class BERTDataset(torch.utils.data.Dataset):
@@ -73,148 +234,276 @@ class BERTDataset(torch.utils.data.Dataset):
             "attention_mask": inputs["attention_mask"].squeeze(0),
         }
 
-@app.post("/analyze-comments/")
-def analyze_comments(input_path: str, batch_size: int = 64, max_len: int = 128):
-    try:
-        # 1. 원본 데이터 로드
-        original_df = pd.read_csv(
-            input_path,
-            quotechar='"',
-            escapechar="\\",
-            encoding="utf-8"
-        )
-        logger.info(f"Original DataFrame loaded with {len(original_df)} rows.")
-
-        # 2. 댓글 전처리
-        processed_df = preprocess_dataframe(original_df.copy(), text_column='comment')
-
-        if processed_df.empty:
-            raise ValueError("Processed DataFrame is empty after preprocessing.")
-
-        # 3. NaN 값 제거 (전처리 단계에서 모든 NaN 삭제)
-        processed_df.dropna(inplace=True)
-        logger.info(f"DataFrame after NaN removal: {len(processed_df)} rows remaining.")
-
-        if processed_df.empty:
-            raise ValueError("Processed DataFrame is empty after removing NaN values.")
-
-        # 3. 날짜 변환 및 비정상 값 제거
-        processed_df['Date'] = pd.to_datetime(processed_df['date'], errors='coerce')
-        processed_df = processed_df.dropna(subset=['Date'])
-        logger.info(f"DataFrame after date processing: {len(processed_df)} rows remaining.")
-
-        # 4. BERT 데이터셋 생성 및 감정 분석
-        dataset = BERTDataset(processed_df, tokenizer, max_len)
-        dataloader = torch.utils.data.DataLoader(dataset, batch_size=batch_size, shuffle=False)
-
-        predictions = []
-        with torch.no_grad():
-            for batch_idx, batch in enumerate(dataloader):
-                input_ids = batch['input_ids'].to(device)
-                attention_mask = batch['attention_mask'].to(device)
-
-                # 모델 출력
-                outputs = model(input_ids=input_ids, attention_mask=attention_mask)
-                batch_predictions = torch.argmax(outputs, dim=1).cpu().numpy()
+def predict_fixed_padding(df, batch_size=64, max_len=128):
+    """
+    Predict labels with every comment padded to `max_len` (original behaviour).
+    """
+    current_engine, _ = active_engine()
+    dataset = BERTDataset(df, tokenizer, max_len)
+    dataloader = torch.utils.data.DataLoader(dataset, batch_size=batch_size, shuffle=False)
+
+    predictions = []
+    for batch in dataloader:
+        # 모델 출력
+        with _inference_lock, STAGE_SECONDS.time(stage="inference_batch"):
+            outputs = current_engine.predict_proba(batch['input_ids'], batch['attention_mask'])
+        predictions.extend([int(pred) for pred in outputs.argmax(axis=1)])
+    return predictions
+
+
+def predict_probabilities(texts, batch_size=64, max_len=128, current_engine=None):
+    """
+    Class probabilities for `texts` using length-bucketed batches padded only
+    to each batch's longest comment. Rows are returned in the input order.
+    """
+    if current_engine is None:
+        current_engine, _ = active_engine()
+    with STAGE_SECONDS.time(stage="tokenize"):
+        sequences = batch_tokenizer.encode(texts, max_len)
+
+    probs = np.zeros((len(sequences), 3), dtype=np.float32)
+    for indices, input_ids, attention_mask in iter_dynamic_batches(sequences, batch_size, tokenizer.pad_token_id):
+        with _inference_lock, STAGE_SECONDS.time(stage="inference_batch"):
+            probs[indices] = current_engine.predict_proba(input_ids, attention_mask)
+    return probs
+
+
+def cached_probabilities(texts, batch_size=64, max_len=128):
+    """
+    Class probabilities for `texts`. Comments already scored by the same model
+    version are served from the prediction cache; only misses are run.
+    """
+    current_engine, current_version = active_engine()
+    keys, probs, missing = prediction_cache.lookup(texts, current_version, max_len)
+    logger.info(f"Prediction cache: {len(texts) - len(missing)} hits, {len(missing)} misses.")
+    CACHE_REQUESTS.inc(len(texts) - len(missing), cache="prediction", result="hit")
+    CACHE_REQUESTS.inc(len(missing), cache="prediction", result="miss")
+    if missing:
+        missing_probs = predict_probabilities([texts[i] for i in missing], batch_size, max_len, current_engine)
+        probs[missing] = missing_probs
+        prediction_cache.put_many([keys[i] for i in missing], missing_probs)
+    return probs
+
+
+def predict_dynamic_padding(df, batch_size=64, max_len=128, use_cache=True):
+    """
+    Predict labels with dynamic padding, optionally through the prediction cache.
+    """
+    texts = df['comment'].tolist()
+    if not use_cache:
+        return predict_probabilities(texts, batch_size, max_len).argmax(axis=1).tolist()
+    return cached_probabilities(texts, batch_size, max_len).argmax(axis=1).tolist()
+
+
+def prepare_comments(original_df, require_rows=True):
+    """
+    Preprocess crawled comments and parse their dates (analysis steps 2-3).
+    """
+    # 2. 댓글 전처리
+    with STAGE_SECONDS.time(stage="preprocess"):
+        processed_df = preprocess_dataframe(original_df.copy(), text_column='comment', workers=PREPROCESS_WORKERS)
+
+    if require_rows and processed_df.empty:
+        raise ValueError("Processed DataFrame is empty after preprocessing.")
+
+    # 3. NaN 값 제거 (전처리 단계에서 모든 NaN 삭제)
+    processed_df.dropna(inplace=True)
+    logger.info(f"DataFrame after NaN removal: {len(processed_df)} rows remaining.")
+
+    if require_rows and processed_df.empty:
+        raise ValueError("Processed DataFrame is empty after removing NaN values.")
+
+    # 3. 날짜 변환 및 비정상 값 제거
+    processed_df['Date'] = pd.to_datetime(processed_df['date'], errors='coerce')
+    processed_df = processed_df.dropna(subset=['Date'])
+    logger.info(f"DataFrame after date processing: {len(processed_df)} rows remaining.")
+    return processed_df
+
+
+def predict_feelings(processed_df, batch_size=64, max_len=128, dynamic_padding=True):
+    """
+    Sentiment labels for the preprocessed comments, in row order (analysis step 4).
+    """
+    # 4. 감정 분석 (길이별 배치 + 동적 패딩 또는 고정 길이 패딩)
+    if dynamic_padding:
+        return predict_dynamic_padding(processed_df, batch_size, max_len)
+    else:
+        return predict_fixed_padding(processed_df, batch_size, max_len)
+
+
+def count_words(processed_df, predictions, version):
+    """
+    Merge the word counts of newly seen comments into the per-source store
+    (a comment's source is its link). Returns the sources of `processed_df`.
+    """
+    labeled = pd.DataFrame({
+        "link": processed_df['link'].to_numpy(),
+        "comment": processed_df['comment'].to_numpy(),
+        "Feelings": np.asarray(predictions),
+    })
+    for source, rows in labeled.groupby("link", sort=False):
+        word_count_store.add(version, source, rows['comment'], rows['Feelings'])
+    return set(labeled['link'])
+
+
+def stored_word_frequencies(sources_by_version):
+    """
+    Merge the stored counters of each version's sources ({model_version: sources}).
+    """
+    frequencies = WordFrequencies()
+    for version, sources in sources_by_version.items():
+        frequencies.merge(word_count_store.load(version, sources))
+    return frequencies
+
+
+def save_analysis_results(original_df, processed_df, predictions, save_dir=None, word_frequencies=None):
+    """
+    Attach predictions, aggregate ratios, period counts and word frequencies
+    and write the result files (analysis steps 5-11) into `save_dir`
+    (default: the frontend's public data directory). Pass `word_frequencies`
+    when they were already counted incrementally; otherwise they are merged
+    from the per-source store.
+    """
+    # 5. 감정 결과 통합
+    if len(predictions) != len(processed_df):
+        mismatch_count = len(processed_df) - len(predictions)
+        logger.warning(f"Mismatch between predictions and DataFrame rows: {mismatch_count} rows removed.")
+
+        # 누락된 데이터 삭제
+        processed_df = processed_df.iloc[:len(predictions)].reset_index(drop=True)
+        logger.info(f"Processed DataFrame resized to match predictions: {len(processed_df)} rows remaining.")
+
+    processed_df['Feelings'] = predictions
+    COMMENTS_PROCESSED.inc(len(processed_df), stage="analyzed")
+
+    original_df = original_df.reset_index(drop=True)
+    original_df = original_df.iloc[:len(processed_df)].reset_index(drop=True)
+    original_df['Feelings'] = processed_df['Feelings']
+    logger.info(f"Feelings column added to original DataFrame.")
+
+    # 6. NaN 값 확인 및 로그 출력
+    nan_count = original_df['Feelings'].isna().sum()
+    if nan_count > 0:
+        logger.warning(f"There are {nan_count} NaN values in the 'Feelings' column.")
+    else:
+        logger.info("No NaN values found in the 'Feelings' column.")
+
+    # Null 값 삭제
+    original_df.dropna(subset=['Feelings'], inplace=True)
+    logger.info("Null values removed from Feelings column.")
+
+    # 6. 데이터 저장 경로 설정
+    save_dir = os.path.abspath(save_dir or "../front/public/data")
+    os.makedirs(save_dir, exist_ok=True)
+
+    # 7. 댓글 데이터 저장 (원본 데이터에 감정 추가)
+    comments_files = write_result(original_df, save_dir, "comments", RESULT_FORMAT, RESULT_CSV_EXPORT)
+    logger.info(f"Comments saved to {comments_files}.")
+
+    # 8. 감정 비율 계산 및 저장
+    emotion_counts = processed_df['Feelings'].value_counts()
+    total_comments = len(processed_df)
+    emotion_ratios = {
+        0: round(emotion_counts.get(0, 0) / total_comments * 100, 2),
+        1: round(emotion_counts.get(1, 0) / total_comments * 100, 2),
+        2: round(emotion_counts.get(2, 0) / total_comments * 100, 2),
+    }
+    ratio_df = pd.DataFrame({
+        "Ratio": [emotion_ratios[0], emotion_ratios[1], emotion_ratios[2]],
+    }, index=["Positive", "Neutral", "Negative"])
+    ratio_files = write_result(ratio_df, save_dir, "ratio", RESULT_FORMAT, RESULT_CSV_EXPORT)
+    logger.info(f"Ratios saved to {ratio_files}.")
+
+    # 9. 연도-분기별 감정 데이터 집계
+    min_date, max_date = processed_df['Date'].min(), processed_df['Date'].max()
+    if pd.isna(min_date) or pd.isna(max_date):
+        raise ValueError("Date range is invalid. Ensure the 'Date' column has valid entries.")
+
+    date_ranges = pd.date_range(start=min_date, end=max_date, periods=5)
+    labels = [date_ranges[i].strftime('%Y-%m-%d') for i in range(len(date_ranges) - 1)]
+
+    processed_df['Period'] = pd.cut(
+        processed_df['Date'],
+        bins=date_ranges,
+        labels=labels,
+        right=False
+    )
+
+    period_counts = (
+        processed_df.groupby(['Period', 'Feelings'])
+        .size()
+        .unstack(fill_value=0)
+        .reset_index()
+    )
+
+    if period_counts.empty:
+        raise ValueError("Period counts DataFrame is empty. Check the input data.")
+
+    # 컬럼 이름을 문자열로 통일 (Parquet/Arrow 컬럼 이름은 문자열이어야 함)
+    period_counts.columns = [str(column) for column in period_counts.columns]
+    count_files = write_result(period_counts, save_dir, "count", RESULT_FORMAT, RESULT_CSV_EXPORT)
+    logger.info(f"Counts saved to {count_files}.")
+
+    # 감정별 단어 빈도 (출처별 저장된 카운터에 새 댓글만 더한 뒤 합산, 스트리밍 분석은 합산 결과를 전달)
+    if word_frequencies is None:
+        _, version = active_engine()
+        sources = count_words(processed_df, processed_df['Feelings'], version)
+        word_frequencies = stored_word_frequencies({version: sources})
+    words_files = write_json(save_dir, "words", word_frequencies.to_dict())
+
+    # 대시보드용 집계 (비율, 기간별 개수, 감정별 상위 단어)를 한 번만 계산하여 저장
+    summary_files = write_json(save_dir, "summary", build_summary(original_df, ratio_df, period_counts, word_frequencies))
+    logger.info(f"Summary saved to {summary_files}.")
+
+    # 10. 감정 결과 통합
+    null_count = original_df['Feelings'].isnull().sum()  # Null 값 계산
+    logger.info(f"Null values in Feelings column: {null_count}")
+
+    # Null 값 삭제
+    original_df.dropna(subset=['Feelings'], inplace=True)
+    logger.info("Null values removed from Feelings column.")
+
+    # 11. 결과 반환
+    return {
+        "message": "분석 완료",
+        "comments_file": comments_files.get("csv", comments_files.get(RESULT_FORMAT)),
+        "ratio_file": ratio_files.get("csv", ratio_files.get(RESULT_FORMAT)),
+        "count_file": count_files.get("csv", count_files.get(RESULT_FORMAT)),
+        "files": {"comments": comments_files, "ratio": ratio_files, "count": count_files, "summary": summary_files,
+                  "words": words_files},
+        "null_values_in_feelings": null_count,
+        "results": processed_df[['comment', 'Feelings']].to_dict(orient="records"),
+    }
 
-                predictions.extend([int(pred) for pred in batch_predictions])
 
-        # 5. 감정 결과 통합
-        if len(predictions) != len(processed_df):
-            mismatch_count = len(processed_df) - len(predictions)
-            logger.warning(f"Mismatch between predictions and DataFrame rows: {mismatch_count} rows removed.")
-            
-            # 누락된 데이터 삭제
-            processed_df = processed_df.iloc[:len(predictions)].reset_index(drop=True)
-            logger.info(f"Processed DataFrame resized to match predictions: {len(processed_df)} rows remaining.")
-
-        processed_df['Feelings'] = predictions
-
-        original_df = original_df.reset_index(drop=True)
-        original_df = original_df.iloc[:len(processed_df)].reset_index(drop=True)
-        original_df['Feelings'] = processed_df['Feelings']
-        logger.info(f"Feelings column added to original DataFrame.")
-
-        # 6. NaN 값 확인 및 로그 출력
-        nan_count = original_df['Feelings'].isna().sum()
-        if nan_count > 0:
-            logger.warning(f"There are {nan_count} NaN values in the 'Feelings' column.")
+@app.post("/analyze-comments/")
+def analyze_comments(input_data, batch_size: int = 64, max_len: int = 128, dynamic_padding: bool = True,
+                     save_dir: Optional[str] = None):
+    """
+    Analyze crawled comments given either as a DataFrame (date, comment, link)
+    or as the path of a crawled CSV file, writing the results into `save_dir`.
+    """
+    try:
+        # 1. 원본 데이터 로드 (메모리의 DataFrame은 그대로 사용)
+        if isinstance(input_data, pd.DataFrame):
+            original_df = input_data
         else:
-            logger.info("No NaN values found in the 'Feelings' column.")
-        
-        # Null 값 삭제
-        original_df.dropna(subset=['Feelings'], inplace=True)
-        logger.info("Null values removed from Feelings column.")
-
-        # 6. 데이터 저장 경로 설정
-        save_dir = os.path.abspath("../front/public/data")
-        os.makedirs(save_dir, exist_ok=True)
-
-        # 7. 댓글 데이터 저장 (원본 데이터에 감정 추가)
-        comments_file = os.path.join(save_dir, "comments.csv")
-        original_df.to_csv(comments_file, index=False, encoding='utf-8-sig', float_format='%.0f')
-        logger.info(f"Comments saved to {comments_file}.")
-
-        # 8. 감정 비율 계산 및 저장
-        ratio_file = os.path.join(save_dir, "ratio.csv")
-        emotion_counts = processed_df['Feelings'].value_counts()
-        total_comments = len(processed_df)
-        emotion_ratios = {
-            0: round(emotion_counts.get(0, 0) / total_comments * 100, 2),
-            1: round(emotion_counts.get(1, 0) / total_comments * 100, 2),
-            2: round(emotion_counts.get(2, 0) / total_comments * 100, 2),
-        }
-        pd.DataFrame({
-            "Ratio": [emotion_ratios[0], emotion_ratios[1], emotion_ratios[2]],
-        }, index=["Positive", "Neutral", "Negative"]).to_csv(ratio_file, index=False, encoding='utf-8-sig')
-        logger.info(f"Ratios saved to {ratio_file}.")
-
-        # 9. 연도-분기별 감정 데이터 집계
-        min_date, max_date = processed_df['Date'].min(), processed_df['Date'].max()
-        if pd.isna(min_date) or pd.isna(max_date):
-            raise ValueError("Date range is invalid. Ensure the 'Date' column has valid entries.")
-
-        date_ranges = pd.date_range(start=min_date, end=max_date, periods=5)
-        labels = [date_ranges[i].strftime('%Y-%m-%d') for i in range(len(date_ranges) - 1)]
-
-        processed_df['Period'] = pd.cut(
-            processed_df['Date'],
-            bins=date_ranges,
-            labels=labels,
-            right=False
-        )
-
-        period_counts = (
-            processed_df.groupby(['Period', 'Feelings'])
-            .size()
-            .unstack(fill_value=0)
-            .reset_index()
-        )
-
-        if period_counts.empty:
-            raise ValueError("Period counts DataFrame is empty. Check the input data.")
-
-        count_file = os.path.join(save_dir, "count.csv")
-        period_counts.to_csv(count_file, index=False, encoding='utf-8-sig')
-        logger.info(f"Counts saved to {count_file}.")
+            original_df = pd.read_csv(
+                input_data,
+                quotechar='"',
+                escapechar="\\",
+                encoding="utf-8"
+            )
+        logger.info(f"Original DataFrame loaded with {len(original_df)} rows.")
 
-        # 10. 감정 결과 통합
-        null_count = original_df['Feelings'].isnull().sum()  # Null 값 계산
-        logger.info(f"Null values in Feelings column: {null_count}")
+        # 2~3. 댓글 전처리 및 날짜 변환
+        processed_df = prepare_comments(original_df)
 
-        # Null 값 삭제
-        original_df.dropna(subset=['Feelings'], inplace=True)
-        logger.info("Null values removed from Feelings column.")
+        # 4. 감정 분석
+        predictions = predict_feelings(processed_df, batch_size, max_len, dynamic_padding)
 
-        # 11. 결과 반환
-        return {
-            "message": "분석 완료",
-            "comments_file": comments_file,
-            "ratio_file": ratio_file,
-            "count_file": count_file,
-            "null_values_in_feelings": null_count,
-            "results": processed_df[['comment', 'Feelings']].to_dict(orient="records"),
-        }
+        # 5~11. 결과 통합, 집계 및 저장
+        return save_analysis_results(original_df, processed_df, predictions, save_dir)
 
     except Exception as e:
         logger.exception("Error during analysis.")
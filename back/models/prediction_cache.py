@@ -0,0 +1,110 @@
+import hashlib
+import os
+import sqlite3
+import threading
+import time
+import numpy as np
+from .token_cache import normalize_text
+
+
+def file_digest(path, chunk_size=1 << 20):
+    """
+    SHA-256 of a file's contents, used as the model version.
+    """
+    digest = hashlib.sha256()
+    with open(path, "rb") as f:
+        for chunk in iter(lambda: f.read(chunk_size), b""):
+            digest.update(chunk)
+    return digest.hexdigest()[:16]
+
+
+class PredictionCache:
+    """
+    SQLite-backed cache of class probabilities per comment.
+
+    Keys hash the normalized (preprocessed) text together with the model version
+    and max_len, so new weights never read stale entries. The least recently
+    used rows are evicted in one batch once the table grows past `max_entries`.
+    """
+
+    def __init__(self, path, max_entries=1_000_000, num_labels=3):
+        os.makedirs(os.path.dirname(os.path.abspath(path)), exist_ok=True)
+        self.max_entries = max_entries
+        self.num_labels = num_labels
+        self._conn = sqlite3.connect(path, timeout=30, check_same_thread=False)
+        self._conn.execute("PRAGMA journal_mode=WAL")
+        self._conn.execute(
+            "CREATE TABLE IF NOT EXISTS predictions "
+            "(key BLOB PRIMARY KEY, probs BLOB NOT NULL, last_used REAL NOT NULL)"
+        )
+        self._conn.execute("CREATE INDEX IF NOT EXISTS idx_predictions_last_used ON predictions (last_used)")
+        self._lock = threading.Lock()
+        # 행 수 상한 추정치 (put마다 COUNT(*)를 실행하지 않도록 상한을 넘을 때만 다시 셈)
+        self._count = self._conn.execute("SELECT COUNT(*) FROM predictions").fetchone()[0]
+
+    @staticmethod
+    def key(text, model_version, max_len):
+        return hashlib.sha1(f"{model_version}\0{max_len}\0{normalize_text(text)}".encode("utf-8")).digest()
+
+    def get_many(self, keys):
+        found = {}
+        now = time.time()
+        with self._lock, self._conn:
+            # SQLite 변수 개수 제한을 피하기 위해 나누어 조회
+            for i in range(0, len(keys), 500):
+                chunk = keys[i:i + 500]
+                placeholders = ",".join("?" * len(chunk))
+                rows = self._conn.execute(
+                    f"SELECT key, probs FROM predictions WHERE key IN ({placeholders})", chunk
+                ).fetchall()
+                self._conn.execute(
+                    f"UPDATE predictions SET last_used = ? WHERE key IN ({placeholders})", [now, *chunk]
+                )
+                for key, blob in rows:
+                    found[key] = np.frombuffer(blob, dtype=np.float32)
+        return found
+
+    def put_many(self, keys, probs):
+        now = time.time()
+        rows = [(key, np.asarray(p, dtype=np.float32).tobytes(), now) for key, p in zip(keys, probs)]
+        with self._lock, self._conn:
+            self._conn.executemany(
+                "INSERT OR REPLACE INTO predictions (key, probs, last_used) VALUES (?, ?, ?)", rows
+            )
+            # 교체된 행도 더하므로 실제 행 수보다 크거나 같음
+            self._count += len(rows)
+            if self._count > self.max_entries:
+                self._evict()
+
+    def _evict(self):
+        # 다른 프로세스가 추가한 행까지 반영하여 정확한 수로 갱신
+        self._count = self._conn.execute("SELECT COUNT(*) FROM predictions").fetchone()[0]
+        if self._count <= self.max_entries:
+            return
+        # 여유 공간 확보를 위해 최대 크기의 90%까지 한 번에 정리
+        excess = self._count - int(self.max_entries * 0.9)
+        self._count -= excess
+        self._conn.execute(
+            "DELETE FROM predictions WHERE key IN "
+            "(SELECT key FROM predictions ORDER BY last_used LIMIT ?)",
+            (excess,),
+        )
+
+    def lookup(self, texts, model_version, max_len):
+        """
+        Return (keys, probs, missing) where probs has NaN rows for cache misses
+        and `missing` lists the positions that still need inference.
+        """
+        keys = [self.key(text, model_version, max_len) for text in texts]
+        cached = self.get_many(list(set(keys)))
+        probs = np.full((len(texts), self.num_labels), np.nan, dtype=np.float32)
+        missing = []
+        for i, key in enumerate(keys):
+            if key in cached:
+                probs[i] = cached[key]
+            else:
+                missing.append(i)
+        return keys, probs, missing
+
+    def close(self):
+        self._conn.close()
@@ -0,0 +1,91 @@
+import json
+import os
+import re
+import shutil
+import threading
+import time
+from .result_io import atomic_write
+
+CHECKPOINT_FILE = "model.pt"
+META_FILE = "meta.json"
+ACTIVE_FILE = "ACTIVE"
+
+VERSION_PATTERN = re.compile(r"^v\d{4,}$")
+
+
+class ModelRegistry:
+    """
+    Local registry of retrained checkpoints.
+
+    Each version lives in `root/vNNNN/` (model.pt + meta.json) and is never
+    modified after it is written. The serving version is a pointer in
+    `root/ACTIVE`; without one the base checkpoint (MODEL_PATH) is served.
+    """
+
+    def __init__(self, root):
+        self.root = root
+        self._lock = threading.Lock()
+
+    def versions(self):
+        if not os.path.isdir(self.root):
+            return []
+        return sorted(
+            (name for name in os.listdir(self.root)
+             if VERSION_PATTERN.match(name) and os.path.exists(os.path.join(self.root, name, META_FILE))),
+            key=lambda name: int(name[1:]),
+        )
+
+    def exists(self, version):
+        return version in self.versions()
+
+    def checkpoint_path(self, version):
+        return os.path.join(self.root, version, CHECKPOINT_FILE)
+
+    def meta(self, version):
+        with open(os.path.join(self.root, version, META_FILE), encoding="utf-8") as f:
+            return json.load(f)
+
+    def list(self):
+        return [self.meta(version) for version in self.versions()]
+
+    def register(self, write_checkpoint, meta):
+        """
+        Store a new version. `write_checkpoint(path)` writes the weights into
+        a staging directory that is renamed into place only when complete.
+        """
+        with self._lock:
+            versions = self.versions()
+            version = f"v{(int(versions[-1][1:]) + 1 if versions else 1):04d}"
+            staging = os.path.join(self.root, f".{version}.staging")
+            shutil.rmtree(staging, ignore_errors=True)
+            os.makedirs(staging)
+            try:
+                write_checkpoint(os.path.join(staging, CHECKPOINT_FILE))
+                meta = dict(meta, version=version, created_at=time.time())
+                with open(os.path.join(staging, META_FILE), "w", encoding="utf-8") as f:
+                    json.dump(meta, f, ensure_ascii=False, indent=2)
+                os.replace(staging, os.path.join(self.root, version))
+            except Exception:
+                shutil.rmtree(staging, ignore_errors=True)
+                raise
+        return meta
+
+    def active(self):
+        try:
+            with open(os.path.join(self.root, ACTIVE_FILE), encoding="utf-8") as f:
+                version = f.read().strip()
+        except FileNotFoundError:
+            return None
+        return version if self.exists(version) else None
+
+    def activate(self, version):
+        # None이면 기본 체크포인트로 되돌림
+        if version is not None and not self.exists(version):
+            raise KeyError(f"Unknown model version: {version}")
+        os.makedirs(self.root, exist_ok=True)
+
+        def write_pointer(path):
+            with open(path, "w", encoding="utf-8") as f:
+                f.write(version or "")
+
+        atomic_write(os.path.join(self.root, ACTIVE_FILE), write_pointer)
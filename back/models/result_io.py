@@ -0,0 +1,127 @@
+import json
+import os
+import threading
+import pandas as pd
+from logging_config import setup_logger
+from packages.metrics import STAGE_SECONDS
+
+# 로그 설정
+logger = setup_logger(__name__)
+
+# 형식별 파일 확장자 (arrow는 Arrow IPC/Feather v2)
+EXTENSIONS = {"parquet": ".parquet", "arrow": ".arrow", "csv": ".csv"}
+
+# 읽기 시 우선순위
+READ_ORDER = ["parquet", "arrow", "csv"]
+
+# 결과별 CSV 저장 옵션 (미리 저장할 때와 요청 시 생성할 때 동일하게 사용)
+CSV_KWARGS = {"comments": {"float_format": '%.0f'}}
+
+
+def columnar_available():
+    try:
+        import pyarrow  # noqa: F401
+    except ImportError:
+        return False
+    return True
+
+
+def resolve_format(fmt):
+    """
+    Validate a result format, falling back to CSV when pyarrow is missing.
+    """
+    if fmt not in EXTENSIONS:
+        raise ValueError(f"Unknown result format: {fmt}")
+    if fmt != "csv" and not columnar_available():
+        logger.warning(f"pyarrow is not installed; writing {fmt} results as CSV instead.")
+        return "csv"
+    return fmt
+
+
+def atomic_write(path, write_fn):
+    """
+    Call write_fn(tmp_path) and move the file into place with os.replace,
+    so readers never see a partially written file.
+    """
+    directory, name = os.path.split(path)
+    tmp_path = os.path.join(directory, f".{name}.{os.getpid()}.{threading.get_ident()}.tmp")
+    try:
+        write_fn(tmp_path)
+        os.replace(tmp_path, path)
+    except BaseException:
+        if os.path.exists(tmp_path):
+            os.remove(tmp_path)
+        raise
+    return path
+
+
+def write_result(df, directory, name, fmt="parquet", csv_export=False):
+    """
+    Write `df` as `<directory>/<name>.<ext>` in the given format and,
+    if `csv_export` is set, also as UTF-8-BOM CSV (otherwise see export_csv).
+    Returns {format: path} for every file written.
+    """
+    os.makedirs(directory, exist_ok=True)
+    fmt = resolve_format(fmt)
+    paths = {}
+
+    with STAGE_SECONDS.time(stage="output_write"):
+        path = os.path.join(directory, name + EXTENSIONS[fmt])
+        if fmt == "parquet":
+            paths[fmt] = atomic_write(path, lambda tmp: df.to_parquet(tmp, index=False, compression="zstd"))
+        elif fmt == "arrow":
+            paths[fmt] = atomic_write(path, lambda tmp: df.reset_index(drop=True).to_feather(tmp, compression="zstd"))
+
+        if fmt == "csv" or csv_export:
+            csv_path = os.path.join(directory, name + EXTENSIONS["csv"])
+            paths["csv"] = atomic_write(csv_path, lambda tmp: _to_csv(df, tmp, name))
+    return paths
+
+
+def _to_csv(df, path, name):
+    df.to_csv(path, index=False, encoding="utf-8-sig", **CSV_KWARGS.get(name, {}))
+
+
+def export_csv(directory, name):
+    """
+    Write `<directory>/<name>.csv` from the stored result table (on first
+    request when CSV export is off) and return its path.
+    """
+    csv_path = os.path.join(directory, name + EXTENSIONS["csv"])
+    if os.path.exists(csv_path):
+        return csv_path
+    df = read_result(directory, name)
+    with STAGE_SECONDS.time(stage="output_write"):
+        return atomic_write(csv_path, lambda tmp: _to_csv(df, tmp, name))
+
+
+def write_json(directory, name, payload):
+    """
+    Write `payload` as compact UTF-8 JSON to `<directory>/<name>.json`.
+    """
+    os.makedirs(directory, exist_ok=True)
+    with STAGE_SECONDS.time(stage="output_write"):
+        body = json.dumps(payload, ensure_ascii=False, separators=(",", ":")).encode("utf-8")
+
+        def write(tmp):
+            with open(tmp, "wb") as f:
+                f.write(body)
+
+        return {"json": atomic_write(os.path.join(directory, name + ".json"), write)}
+
+
+def read_result(directory, name):
+    """
+    Load a result table written by write_result, preferring columnar files.
+    """
+    for fmt in READ_ORDER:
+        path = os.path.join(directory, name + EXTENSIONS[fmt])
+        if not os.path.exists(path):
+            continue
+        if fmt == "parquet" and columnar_available():
+            return pd.read_parquet(path)
+        if fmt == "arrow" and columnar_available():
+            return pd.read_feather(path)
+        if fmt == "csv":
+            return pd.read_csv(path, encoding="utf-8-sig")
+    raise FileNotFoundError(f"No result file found for {name} in {directory}")
@@ -1,8 +1,21 @@
-import torch
+import argparse
+import copy
+import os
+import numpy as np
 import pandas as pd
+import torch
 import torch.nn as nn
-from transformers import AdamW
-from torch.utils.data import DataLoader
+from transformers import BertModel
+from .batching import iter_dynamic_batches
+from .bundle import load_tokenizer_and_config
+from .check import clean_text
+from .registry import ModelRegistry
+from .prediction_cache import file_digest
+from .token_cache import BatchTokenizer, TokenCache
+from .aggregates import SENTIMENTS
+
+# 피드백 데이터에서 라벨로 사용할 컬럼 (라벨 번호 또는 감정 이름)
+LABEL_COLUMNS = ("label", "Feelings", "sentiment")
 
 # 모델 정의
 class BERTClassifier(nn.Module):
@@ -18,60 +31,173 @@ class BERTClassifier(nn.Module):
         dropped_output = self.dropout(pooled_output)
         return self.classifier(dropped_output)
 
-# 데이터셋 클래스 정의
-class BERTDataset(torch.utils.data.Dataset):
-    def __init__(self, df, tokenizer, max_len):
-        self.texts = df['comment'].tolist()
-        self.tokenizer = tokenizer
-        self.max_len = max_len
-
-    def __len__(self):
-        return len(self.texts)
-
-    def __getitem__(self, idx):
-        text = self.texts[idx]
-        inputs = self.tokenizer(
-            text,
-            padding="max_length",
-            truncation=True,
-            max_length=self.max_len,
-            return_tensors="pt",
-        )
+
+def _parse_label(value):
+    if isinstance(value, str) and value in SENTIMENTS:
+        return SENTIMENTS.index(value)
+    try:
+        label = int(value)
+    except (TypeError, ValueError):
+        return None
+    return label if 0 <= label < len(SENTIMENTS) else None
+
+
+def load_feedback(feedback_data_path):
+    """
+    Feedback rows as (comment, label), cleaned the same way as analysis
+    input. Rows without a comment or a valid label are dropped.
+    """
+    feedback_data = pd.read_csv(feedback_data_path)
+    label_columns = [column for column in LABEL_COLUMNS if column in feedback_data.columns]
+    if 'comment' not in feedback_data.columns or not label_columns:
+        raise ValueError(f"Feedback data needs a 'comment' column and one of {LABEL_COLUMNS}.")
+
+    # 피드백마다 라벨 컬럼이 다를 수 있으므로 앞선 컬럼부터 유효한 값을 사용
+    labels = feedback_data[label_columns[0]].map(_parse_label)
+    for column in label_columns[1:]:
+        labels = labels.combine_first(feedback_data[column].map(_parse_label))
+
+    df = pd.DataFrame({
+        'comment': feedback_data['comment'].astype(str).map(clean_text),
+        'label': labels,
+    }).dropna()
+    df = df[df['comment'].str.len() > 0]
+    return df.astype({'label': int}).reset_index(drop=True)
+
+
+def pooled_features(model, batch_tokenizer, texts, batch_size=16, max_len=128):
+    # BERT는 고정하고 분류기만 학습하므로 pooled 출력은 한 번만 계산
+    # 추론과 같은 정규화/토큰 캐시를 거쳐 길이별로 묶은 배치로 실행
+    sequences = batch_tokenizer.encode(texts, max_len)
+    features = torch.zeros(len(sequences), model.bert.config.hidden_size)
+    model.eval()
+    with torch.no_grad():
+        for indices, input_ids, attention_mask in iter_dynamic_batches(
+            sequences, batch_size, batch_tokenizer.tokenizer.pad_token_id
+        ):
+            output = model.bert(input_ids=input_ids, attention_mask=attention_mask)
+            features[torch.as_tensor(indices)] = output.pooler_output
+    return features
+
+
+def evaluate(classifier, features, labels):
+    if len(labels) == 0:
+        return {"accuracy": None, "loss": None}
+    with torch.no_grad():
+        logits = classifier(features)
         return {
-            "input_ids": inputs["input_ids"].squeeze(0),
-            "attention_mask": inputs["attention_mask"].squeeze(0),
+            "accuracy": round(float((logits.argmax(dim=1) == labels).float().mean()), 4),
+            "loss": round(float(nn.CrossEntropyLoss()(logits, labels)), 4),
         }
 
 
-def retrain_kobert_model(feedback_data_path):
-    # Load feedback data
-    feedback_data = pd.read_csv(feedback_data_path)
-    
-    # Dataset & DataLoader
-    tokenizer = ...  # KoBERT 토크나이저 로드
-    train_dataset = BERTDataset(feedback_data, tokenizer, max_len=128)
-    train_dataloader = DataLoader(train_dataset, batch_size=16, shuffle=True)
-    
-    # Load existing model
-    model = BERTClassifier(...).to("cuda")  # KoBERT 모델 로드
-    model.load_state_dict(torch.load("existing_kobert_model.pt"))
+def retrain_kobert_model(feedback_data_path, base_model_path, bundle_dir, pretrained_name,
+                         epochs=3, learning_rate=5e-6, batch_size=16, max_len=128,
+                         holdout_fraction=0.2, seed=42, allow_hub=False, token_cache_path=None,
+                         token_cache_max_entries=2_000_000):
+    """
+    Fine-tune the classifier head of the base checkpoint on feedback data
+    (CPU only). Returns (state_dict, metrics) where metrics compare the base
+    and retrained heads on a held-out split of the feedback. Token IDs are
+    shared with serving through the token cache at `token_cache_path`.
+    """
+    torch.manual_seed(seed)
+    feedback = load_feedback(feedback_data_path)
+    if feedback.empty:
+        raise ValueError("No usable feedback rows.")
+
+    # 학습/검증 분리 (검증 데이터는 재학습 전후 비교에만 사용)
+    order = np.random.default_rng(seed).permutation(len(feedback))
+    holdout_size = int(len(feedback) * holdout_fraction)
+    holdout_rows, train_rows = order[:holdout_size], order[holdout_size:]
+
+    # 기존 모델 로드 (BERT 가중치도 체크포인트에 포함되어 있음)
+    tokenizer, config, _ = load_tokenizer_and_config(bundle_dir, pretrained_name, allow_hub=allow_hub)
+    model = BERTClassifier(BertModel(config))
+    model.load_state_dict(torch.load(base_model_path, map_location="cpu"))
+
+    token_cache = TokenCache(token_cache_path, token_cache_max_entries) if token_cache_path else None
+    try:
+        batch_tokenizer = BatchTokenizer(tokenizer, token_cache, namespace=pretrained_name)
+        features = pooled_features(model, batch_tokenizer, feedback['comment'].tolist(), batch_size, max_len)
+    finally:
+        if token_cache is not None:
+            token_cache.close()
+    labels = torch.tensor(feedback['label'].to_numpy(), dtype=torch.long)
+    base_classifier = copy.deepcopy(model.classifier)
 
     # Fine-tuning 설정
-    optimizer = AdamW(model.classifier.parameters(), lr=5e-6, weight_decay=0.01)
+    optimizer = torch.optim.AdamW(model.classifier.parameters(), lr=learning_rate, weight_decay=0.01)
+    loss_fn = nn.CrossEntropyLoss()
     model.train()
-    
-    for epoch in range(3):  # 소량 데이터에 적합한 Epoch 수
-        for batch in train_dataloader:
-            optimizer.zero_grad()
-            input_ids = batch["input_ids"].to("cuda")
-            attention_mask = batch["attention_mask"].to("cuda")
-            labels = batch["labels"].to("cuda")
 
-            outputs = model(input_ids=input_ids, attention_mask=attention_mask)
-            loss = torch.nn.CrossEntropyLoss()(outputs, labels)
+    train_features, train_labels = features[train_rows], labels[train_rows]
+    for epoch in range(epochs):  # 소량 데이터에 적합한 Epoch 수
+        for batch in torch.randperm(len(train_rows)).split(batch_size):
+            optimizer.zero_grad()
+            outputs = model.classifier(model.dropout(train_features[batch]))
+            loss = loss_fn(outputs, train_labels[batch])
             loss.backward()
             optimizer.step()
+    model.eval()
+
+    holdout_features, holdout_labels = features[holdout_rows], labels[holdout_rows]
+    metrics = {
+        "train_rows": int(len(train_rows)),
+        "holdout_rows": int(len(holdout_rows)),
+        "base": evaluate(base_classifier, holdout_features, holdout_labels),
+        "retrained": evaluate(model.classifier, holdout_features, holdout_labels),
+    }
+    return model.state_dict(), metrics
+
+
+def is_improvement(metrics):
+    # 검증 정확도가 떨어지지 않을 때만 자동 적용
+    base, retrained = metrics["base"]["accuracy"], metrics["retrained"]["accuracy"]
+    return base is None or (retrained is not None and retrained >= base)
+
+
+def run_retraining(feedback_data_path, registry_dir, base_model_path, bundle_dir, pretrained_name,
+                   base_version=None, threads=1, **train_kwargs):
+    """
+    Retraining worker entry point (run in a separate process): train on
+    the feedback starting from `base_version` (or the base checkpoint),
+    store the result as a new registry version and return its metadata.
+    Serving is not touched here.
+    """
+    # 서빙 프로세스와 CPU를 나눠 쓰므로 스레드 수와 우선순위를 낮춤
+    torch.set_num_threads(max(1, threads))
+    if hasattr(os, "nice"):
+        os.nice(10)
+
+    registry = ModelRegistry(registry_dir)
+    if base_version is not None:
+        base_model_path = registry.checkpoint_path(base_version)
+
+    state_dict, metrics = retrain_kobert_model(
+        feedback_data_path, base_model_path, bundle_dir, pretrained_name, **train_kwargs
+    )
+    return registry.register(
+        lambda path: torch.save(state_dict, path),
+        {
+            "parent": base_version,
+            "parent_digest": file_digest(base_model_path),
+            "feedback_file": feedback_data_path,
+            "metrics": metrics,
+            "improved": is_improvement(metrics),
+        },
+    )
+
+
+if __name__ == "__main__":
+    from packages.config import MODEL_PATH, MODEL_BUNDLE_DIR, MODEL_HUB_FALLBACK, PRETRAINED_MODEL_NAME, MODEL_REGISTRY_DIR
+    from packages.config import TOKEN_CACHE_PATH, TOKEN_CACHE_MAX_ENTRIES
 
-    # Fine-tuned 모델 저장
-    torch.save(model.state_dict(), "fine_tuned_kobert_model.pt")
-    print("Fine-tuned model saved successfully!")
+    parser = argparse.ArgumentParser(description="Retrain the classifier head on feedback data.")
+    parser.add_argument("feedback", help="feedback CSV (comment + label)")
+    parser.add_argument("--base-version", default=None, help="registry version to start from (default: MODEL_PATH)")
+    parser.add_argument("--registry", default=MODEL_REGISTRY_DIR)
+    args = parser.parse_args()
+    print(run_retraining(args.feedback, args.registry, MODEL_PATH, MODEL_BUNDLE_DIR, PRETRAINED_MODEL_NAME,
+                         base_version=args.base_version, allow_hub=MODEL_HUB_FALLBACK,
+                         token_cache_path=TOKEN_CACHE_PATH, token_cache_max_entries=TOKEN_CACHE_MAX_ENTRIES))
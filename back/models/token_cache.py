@@ -0,0 +1,158 @@
+import hashlib
+import os
+import sqlite3
+import threading
+import time
+import unicodedata
+import numpy as np
+from packages.metrics import CACHE_REQUESTS
+
+
+def normalize_text(text):
+    """
+    Normalization applied before hashing, so equivalent comments share a cache entry.
+    """
+    return unicodedata.normalize("NFC", str(text)).strip()
+
+
+class TokenizedTexts:
+    """
+    Ragged token ID arrays stored as one flat array plus row offsets.
+    The attention mask is implied by each row's length (all ones before padding).
+    """
+
+    def __init__(self, ids, offsets):
+        self.ids = ids
+        self.offsets = offsets
+
+    def __len__(self):
+        return len(self.offsets) - 1
+
+    def __getitem__(self, idx):
+        return self.ids[self.offsets[idx]:self.offsets[idx + 1]]
+
+    @property
+    def lengths(self):
+        return np.diff(self.offsets)
+
+    @classmethod
+    def from_sequences(cls, sequences, dtype):
+        lengths = np.fromiter((len(seq) for seq in sequences), dtype=np.int64, count=len(sequences))
+        offsets = np.zeros(len(sequences) + 1, dtype=np.int64)
+        np.cumsum(lengths, out=offsets[1:])
+        ids = np.empty(offsets[-1], dtype=dtype)
+        for row, seq in enumerate(sequences):
+            ids[offsets[row]:offsets[row + 1]] = seq
+        return cls(ids, offsets)
+
+
+class TokenCache:
+    """
+    SQLite-backed store of token ID arrays keyed by a hash of the normalized text.
+    The least recently used rows are evicted in one batch once the table grows
+    past `max_entries`.
+    """
+
+    def __init__(self, path, max_entries=2_000_000):
+        os.makedirs(os.path.dirname(os.path.abspath(path)), exist_ok=True)
+        self.max_entries = max_entries
+        self._conn = sqlite3.connect(path, timeout=30, check_same_thread=False)
+        self._conn.execute("PRAGMA journal_mode=WAL")
+        self._conn.execute(
+            "CREATE TABLE IF NOT EXISTS tokens (key BLOB PRIMARY KEY, ids BLOB NOT NULL, last_used REAL NOT NULL)"
+        )
+        # last_used 열이 없던 기존 캐시 파일 마이그레이션
+        columns = {row[1] for row in self._conn.execute("PRAGMA table_info(tokens)")}
+        if "last_used" not in columns:
+            with self._conn:
+                self._conn.execute("ALTER TABLE tokens ADD COLUMN last_used REAL NOT NULL DEFAULT 0")
+        self._conn.execute("CREATE INDEX IF NOT EXISTS idx_tokens_last_used ON tokens (last_used)")
+        self._lock = threading.Lock()
+        # 행 수 상한 추정치 (put마다 COUNT(*)를 실행하지 않도록 상한을 넘을 때만 다시 셈)
+        self._count = self._conn.execute("SELECT COUNT(*) FROM tokens").fetchone()[0]
+
+    def get_many(self, keys):
+        found = {}
+        now = time.time()
+        with self._lock, self._conn:
+            # SQLite 변수 개수 제한을 피하기 위해 나누어 조회
+            for i in range(0, len(keys), 500):
+                chunk = keys[i:i + 500]
+                placeholders = ",".join("?" * len(chunk))
+                rows = self._conn.execute(
+                    f"SELECT key, ids FROM tokens WHERE key IN ({placeholders})", chunk
+                ).fetchall()
+                self._conn.execute(f"UPDATE tokens SET last_used = ? WHERE key IN ({placeholders})", [now, *chunk])
+                found.update(rows)
+        return found
+
+    def put_many(self, items):
+        now = time.time()
+        rows = [(key, ids, now) for key, ids in items]
+        with self._lock, self._conn:
+            self._conn.executemany("INSERT OR REPLACE INTO tokens (key, ids, last_used) VALUES (?, ?, ?)", rows)
+            # 교체된 행도 더하므로 실제 행 수보다 크거나 같음
+            self._count += len(rows)
+            if self._count > self.max_entries:
+                self._evict()
+
+    def _evict(self):
+        # 다른 프로세스가 추가한 행까지 반영하여 정확한 수로 갱신
+        self._count = self._conn.execute("SELECT COUNT(*) FROM tokens").fetchone()[0]
+        if self._count <= self.max_entries:
+            return
+        # 여유 공간 확보를 위해 최대 크기의 90%까지 한 번에 정리
+        excess = self._count - int(self.max_entries * 0.9)
+        self._count -= excess
+        self._conn.execute(
+            "DELETE FROM tokens WHERE key IN (SELECT key FROM tokens ORDER BY last_used LIMIT ?)", (excess,)
+        )
+
+    def close(self):
+        self._conn.close()
+
+
+class BatchTokenizer:
+    """
+    Tokenize a whole column at once, reusing cached token IDs.
+    Only unique texts missing from the cache are sent to the tokenizer, in one
+    batched call, and the new results are written back to the cache.
+    """
+
+    def __init__(self, tokenizer, cache=None, namespace=""):
+        self.tokenizer = tokenizer
+        self.cache = cache
+        self.namespace = namespace
+        self.dtype = np.uint16 if len(tokenizer) <= np.iinfo(np.uint16).max + 1 else np.int32
+
+    def _key(self, text, max_len):
+        return hashlib.sha1(f"{self.namespace}\0{max_len}\0{text}".encode("utf-8")).digest()
+
+    def encode(self, texts, max_len=128):
+        normalized = [normalize_text(text) for text in texts]
+        unique = list(dict.fromkeys(normalized))
+        keys = {text: self._key(text, max_len) for text in unique}
+
+        encoded = {}
+        if self.cache is not None:
+            cached = self.cache.get_many(list(keys.values()))
+            for text in unique:
+                blob = cached.get(keys[text])
+                if blob is not None:
+                    encoded[text] = np.frombuffer(blob, dtype=self.dtype)
+
+        missing = [text for text in unique if text not in encoded]
+        if self.cache is not None:
+            CACHE_REQUESTS.inc(len(unique) - len(missing), cache="token", result="hit")
+            CACHE_REQUESTS.inc(len(missing), cache="token", result="miss")
+        if missing:
+            input_ids = self.tokenizer(missing, truncation=True, max_length=max_len)["input_ids"]
+            new_items = []
+            for text, ids in zip(missing, input_ids):
+                ids = np.asarray(ids, dtype=self.dtype)
+                encoded[text] = ids
+                new_items.append((keys[text], ids.tobytes()))
+            if self.cache is not None:
+                self.cache.put_many(new_items)
+
+        return TokenizedTexts.from_sequences([encoded[text] for text in normalized], self.dtype)
@@ -0,0 +1,212 @@
+import hashlib
+import json
+import os
+import re
+import sqlite3
+import threading
+import time
+from collections import Counter
+from .token_cache import normalize_text
+
+# 감정 라벨 수 (0: 긍정, 1: 중립, 2: 부정)
+NUM_LABELS = 3
+
+# 한글 음절/영문/숫자 단위 토큰 (ㅋㅋ, ㅠㅠ 같은 자모만 있는 토큰은 제외)
+TOKEN_PATTERN = re.compile(r"[가-힣]+|[a-zA-Z]+|[0-9]+")
+
+# 어절 끝에서 제거할 조사 (긴 것부터 검사)
+# 명사 끝 글자와 겹치기 쉬운 이/가/와/과/만 같은 한 글자 조사는 제외
+PARTICLES = sorted([
+    "에서는", "에게서", "으로는", "이라고", "이라는", "에서", "에게", "한테", "까지", "부터",
+    "으로", "처럼", "보다", "이랑", "라고", "라는", "은", "는", "을", "를", "에", "의", "도", "로",
+], key=len, reverse=True)
+
+# 불용어 (댓글에서 자주 쓰이지만 의미가 적은 단어)
+STOPWORDS = frozenset([
+    "그리고", "그런데", "근데", "그래서", "그냥", "진짜", "정말", "너무", "완전", "약간",
+    "이거", "이건", "이게", "저거", "저건", "그거", "그건", "그게", "여기", "저기", "거기",
+    "우리", "저희", "제가", "내가", "나는", "저는", "하는", "하고", "해서", "있는", "없는",
+    "있어요", "없어요", "합니다", "입니다", "있습니다", "같아요", "같은", "이제", "지금", "아니",
+    "the", "and", "for", "you", "this", "that", "are", "was", "with",
+])
+
+MIN_TOKEN_LENGTH = 2
+
+
+def strip_particle(token):
+    for particle in PARTICLES:
+        # 조사를 떼고 남는 어간이 두 글자 이상일 때만 제거
+        if token.endswith(particle) and len(token) - len(particle) >= MIN_TOKEN_LENGTH:
+            return token[:-len(particle)]
+    return token
+
+
+def tokenize(text):
+    """
+    Korean-aware word tokens: Hangul/Latin/digit runs, trailing particles
+    stripped, Latin lowercased, stopwords and 1-character tokens dropped.
+    """
+    tokens = []
+    for token in TOKEN_PATTERN.findall(text):
+        if token[0] >= "가":
+            token = strip_particle(token)
+        else:
+            token = token.lower()
+        if len(token) >= MIN_TOKEN_LENGTH and token not in STOPWORDS:
+            tokens.append(token)
+    return tokens
+
+
+class WordFrequencies:
+    """
+    Per-sentiment term counters. Counters from separate batches (pages,
+    chunks or crawls) can be merged with merge() or `+` instead of
+    recounting the comments they came from.
+    """
+
+    def __init__(self, counters=None):
+        self.counters = counters or [Counter() for _ in range(NUM_LABELS)]
+
+    def add(self, texts, labels):
+        for text, label in zip(texts, labels):
+            if isinstance(text, str) and 0 <= label < NUM_LABELS:
+                self.counters[label].update(tokenize(text))
+        return self
+
+    def merge(self, other):
+        for counter, other_counter in zip(self.counters, other.counters):
+            counter.update(other_counter)
+        return self
+
+    def __add__(self, other):
+        return WordFrequencies([Counter(counter) for counter in self.counters]).merge(other)
+
+    def top(self, label, n=10):
+        return self.counters[label].most_common(n)
+
+    def to_dict(self):
+        return {str(label): dict(counter) for label, counter in enumerate(self.counters)}
+
+    @classmethod
+    def from_dict(cls, data):
+        return cls([Counter(data.get(str(label), {})) for label in range(NUM_LABELS)])
+
+    @classmethod
+    def load(cls, path):
+        with open(path, encoding="utf-8") as f:
+            return cls.from_dict(json.load(f))
+
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS versions (
+    model_version TEXT PRIMARY KEY,
+    last_used REAL NOT NULL
+);
+CREATE TABLE IF NOT EXISTS counted (
+    model_version TEXT NOT NULL,
+    source TEXT NOT NULL,
+    key BLOB NOT NULL,
+    PRIMARY KEY (model_version, source, key)
+);
+CREATE TABLE IF NOT EXISTS word_counts (
+    model_version TEXT NOT NULL,
+    source TEXT NOT NULL,
+    label INTEGER NOT NULL,
+    word TEXT NOT NULL,
+    count INTEGER NOT NULL,
+    PRIMARY KEY (model_version, source, label, word)
+);
+"""
+
+
+class WordCountStore:
+    """
+    SQLite-backed word counters per source (video/post link), keyed by the
+    model version that labeled the comments.
+
+    add() merges only comments not yet counted for that source and version,
+    so repeat crawls of the same source never recount its history, and a
+    new model version (e.g. after retraining) starts from empty counters.
+    Only the `keep_versions` most recently used versions are kept.
+    """
+
+    def __init__(self, path, keep_versions=3):
+        os.makedirs(os.path.dirname(os.path.abspath(path)), exist_ok=True)
+        self.keep_versions = keep_versions
+        self._conn = sqlite3.connect(path, timeout=30, check_same_thread=False)
+        self._conn.execute("PRAGMA journal_mode=WAL")
+        self._conn.executescript(SCHEMA)
+        self._lock = threading.Lock()
+        self._versions = set()
+
+    @staticmethod
+    def key(text):
+        return hashlib.sha1(normalize_text(text).encode("utf-8")).digest()
+
+    def _use_version(self, model_version):
+        # 새로 사용하는 버전이면 기록하고 오래된 버전의 카운터 정리
+        if model_version in self._versions:
+            return
+        self._conn.execute(
+            "INSERT OR REPLACE INTO versions (model_version, last_used) VALUES (?, ?)", (model_version, time.time())
+        )
+        stale = [row[0] for row in self._conn.execute(
+            "SELECT model_version FROM versions ORDER BY last_used DESC LIMIT -1 OFFSET ?", (self.keep_versions,)
+        )]
+        for version in stale:
+            for table in ("versions", "counted", "word_counts"):
+                self._conn.execute(f"DELETE FROM {table} WHERE model_version = ?", (version,))
+        self._versions.add(model_version)
+        self._versions.difference_update(stale)
+
+    def add(self, model_version, source, texts, labels):
+        """
+        Merge the comments of `source` that are new for `model_version`.
+        Returns the number of newly counted comments.
+        """
+        batch = WordFrequencies()
+        new = 0
+        with self._lock, self._conn:
+            self._use_version(model_version)
+            for text, label in zip(texts, labels):
+                if not isinstance(text, str) or not 0 <= label < NUM_LABELS:
+                    continue
+                cursor = self._conn.execute(
+                    "INSERT OR IGNORE INTO counted (model_version, source, key) VALUES (?, ?, ?)",
+                    (model_version, source, self.key(text)),
+                )
+                if cursor.rowcount:
+                    batch.add([text], [label])
+                    new += 1
+            rows = [
+                (model_version, source, label, word, count)
+                for label, counter in enumerate(batch.counters) for word, count in counter.items()
+            ]
+            self._conn.executemany(
+                "INSERT INTO word_counts (model_version, source, label, word, count) VALUES (?, ?, ?, ?, ?) "
+                "ON CONFLICT (model_version, source, label, word) DO UPDATE SET count = count + excluded.count",
+                rows,
+            )
+        return new
+
+    def load(self, model_version, sources):
+        """
+        Merged WordFrequencies of `sources` under `model_version`.
+        """
+        sources = list(sources)
+        counters = [Counter() for _ in range(NUM_LABELS)]
+        with self._lock:
+            # SQLite 변수 개수 제한을 피하기 위해 나누어 조회
+            for i in range(0, len(sources), 500):
+                chunk = sources[i:i + 500]
+                rows = self._conn.execute(
+                    f"SELECT label, word, SUM(count) FROM word_counts WHERE model_version = ? "
+                    f"AND source IN ({','.join('?' * len(chunk))}) GROUP BY label, word",
+                    (model_version, *chunk),
+                )
+                for label, word, count in rows:
+                    counters[label][word] += count
+        return WordFrequencies(counters)
+
+    def close(self):
+        self._conn.close()
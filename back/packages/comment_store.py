@@ -0,0 +1,134 @@
+import os
+import sqlite3
+import threading
+import time
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS sources (
+    platform TEXT NOT NULL,
+    owner TEXT NOT NULL,
+    source_id TEXT NOT NULL,
+    published_at TEXT NOT NULL,
+    PRIMARY KEY (platform, source_id)
+);
+CREATE INDEX IF NOT EXISTS idx_sources_owner ON sources (platform, owner, published_at);
+CREATE TABLE IF NOT EXISTS comments (
+    platform TEXT NOT NULL,
+    comment_id TEXT NOT NULL,
+    source_id TEXT NOT NULL,
+    published_at TEXT NOT NULL,
+    date TEXT NOT NULL,
+    comment TEXT NOT NULL,
+    link TEXT NOT NULL,
+    PRIMARY KEY (platform, comment_id)
+);
+CREATE INDEX IF NOT EXISTS idx_comments_source ON comments (platform, source_id, published_at);
+CREATE TABLE IF NOT EXISTS watermarks (
+    platform TEXT NOT NULL,
+    scope TEXT NOT NULL,
+    key TEXT NOT NULL,
+    value TEXT NOT NULL,
+    updated_at REAL NOT NULL,
+    PRIMARY KEY (platform, scope, key)
+);
+"""
+
+
+class CommentStore:
+    """
+    Local history of crawled comments with per-channel, per-video and per-post
+    watermarks, so repeat crawls only fetch what is new.
+
+    - sources: videos/posts known for an owner (channel or account) with their publish time
+    - comments: every fetched comment, deduplicated by (platform, comment_id)
+    - watermarks: how far each channel/video/post has been fetched
+    Timestamps are UTC ISO-8601 strings ("%Y-%m-%dT%H:%M:%SZ"), which sort lexicographically.
+    """
+
+    def __init__(self, path):
+        os.makedirs(os.path.dirname(os.path.abspath(path)), exist_ok=True)
+        self._conn = sqlite3.connect(path, timeout=30, check_same_thread=False)
+        self._conn.execute("PRAGMA journal_mode=WAL")
+        self._conn.executescript(SCHEMA)
+        self._lock = threading.Lock()
+
+    def get_watermark(self, platform, scope, key):
+        with self._lock:
+            row = self._conn.execute(
+                "SELECT value, updated_at FROM watermarks WHERE platform = ? AND scope = ? AND key = ?",
+                (platform, scope, key),
+            ).fetchone()
+        return row
+
+    def get_watermarks(self, platform, scope, keys):
+        with self._lock:
+            rows = []
+            for i in range(0, len(keys), 500):
+                chunk = keys[i:i + 500]
+                rows.extend(self._conn.execute(
+                    f"SELECT key, value FROM watermarks WHERE platform = ? AND scope = ? "
+                    f"AND key IN ({','.join('?' * len(chunk))})",
+                    (platform, scope, *chunk),
+                ).fetchall())
+        return dict(rows)
+
+    def set_watermark(self, platform, scope, key, value):
+        with self._lock, self._conn:
+            self._conn.execute(
+                "INSERT OR REPLACE INTO watermarks (platform, scope, key, value, updated_at) VALUES (?, ?, ?, ?, ?)",
+                (platform, scope, key, value, time.time()),
+            )
+
+    def upsert_sources(self, platform, owner, sources):
+        """
+        sources: iterable of (source_id, published_at)
+        """
+        with self._lock, self._conn:
+            self._conn.executemany(
+                "INSERT OR REPLACE INTO sources (platform, owner, source_id, published_at) VALUES (?, ?, ?, ?)",
+                [(platform, owner, source_id, published_at) for source_id, published_at in sources],
+            )
+
+    def sources_in_range(self, platform, owner, start, end):
+        """
+        Source IDs published in [start, end), newest first.
+        """
+        with self._lock:
+            rows = self._conn.execute(
+                "SELECT source_id FROM sources WHERE platform = ? AND owner = ? "
+                "AND published_at >= ? AND published_at < ? ORDER BY published_at DESC, source_id",
+                (platform, owner, start, end),
+            ).fetchall()
+        return [row[0] for row in rows]
+
+    def upsert_comments(self, platform, comments):
+        """
+        comments: iterable of dicts with comment_id, source_id, published_at, date, comment, link
+        """
+        with self._lock, self._conn:
+            self._conn.executemany(
+                "INSERT OR REPLACE INTO comments (platform, comment_id, source_id, published_at, date, comment, link) "
+                "VALUES (?, ?, ?, ?, ?, ?, ?)",
+                [
+                    (platform, c["comment_id"], c["source_id"], c["published_at"], c["date"], c["comment"], c["link"])
+                    for c in comments
+                ],
+            )
+
+    def comments_for_sources(self, platform, source_ids):
+        """
+        Stored comments of the given sources, in `source_ids` order and newest first within a source.
+        """
+        comments = []
+        with self._lock:
+            for source_id in source_ids:
+                rows = self._conn.execute(
+                    "SELECT date, comment, link FROM comments WHERE platform = ? AND source_id = ? "
+                    "ORDER BY published_at DESC, comment_id",
+                    (platform, source_id),
+                ).fetchall()
+                comments.extend({"date": date, "comment": comment, "link": link} for date, comment, link in rows)
+        return comments
+
+    def close(self):
+        self._conn.close()
@@ -0,0 +1,92 @@
+import os
+from dotenv import load_dotenv
+
+# .env 파일에서 환경변수 로드
+load_dotenv()
+
+# 작업(Job) 실행기 설정
+CRAWL_WORKERS = int(os.getenv("CRAWL_WORKERS", "4"))  # 동시에 실행할 크롤링 작업 수
+INFER_WORKERS = int(os.getenv("INFER_WORKERS", "1"))  # 동시에 실행할 추론 작업 수
+MAX_JOBS = int(os.getenv("MAX_JOBS", "500"))  # 메모리에 보관할 최대 작업 수
+
+# YouTube API 동시 요청 설정
+YOUTUBE_FETCH_WORKERS = int(os.getenv("YOUTUBE_FETCH_WORKERS", "8"))  # 동시에 댓글을 가져올 비디오 수
+YOUTUBE_REQUESTS_PER_SECOND = float(os.getenv("YOUTUBE_REQUESTS_PER_SECOND", "10"))  # 초당 API 요청 수 제한
+YOUTUBE_REQUEST_BURST = int(os.getenv("YOUTUBE_REQUEST_BURST", "10"))  # 순간 최대 요청 수
+
+# 유사 댓글 제거 설정
+DEDUP_THRESHOLD = float(os.getenv("DEDUP_THRESHOLD", "0.5"))  # 이 유사도를 초과하면 유사 댓글로 분류
+DEDUP_LSH_THRESHOLD = float(os.getenv("DEDUP_LSH_THRESHOLD", "0.2"))  # LSH 후보 추출 기준 (n-gram Jaccard)
+
+# 토큰 ID 캐시 경로
+TOKEN_CACHE_PATH = os.getenv("TOKEN_CACHE_PATH", "cache/tokens.sqlite")
+TOKEN_CACHE_MAX_ENTRIES = int(os.getenv("TOKEN_CACHE_MAX_ENTRIES", "2000000"))  # 최대 저장 텍스트 수
+
+# 감정 예측 캐시 설정
+PREDICTION_CACHE_PATH = os.getenv("PREDICTION_CACHE_PATH", "cache/predictions.sqlite")
+PREDICTION_CACHE_MAX_ENTRIES = int(os.getenv("PREDICTION_CACHE_MAX_ENTRIES", "1000000"))  # 최대 저장 댓글 수
+
+# 출처별 단어 빈도 저장소 설정
+WORD_COUNT_PATH = os.getenv("WORD_COUNT_PATH", "cache/word_counts.sqlite")
+WORD_COUNT_KEEP_VERSIONS = int(os.getenv("WORD_COUNT_KEEP_VERSIONS", "3"))  # 카운터를 보관할 최근 모델 버전 수
+
+# 증분 크롤링 저장소 설정
+COMMENT_STORE_PATH = os.getenv("COMMENT_STORE_PATH", "dataset/comments.sqlite")
+INSTAGRAM_REFRESH_DAYS = int(os.getenv("INSTAGRAM_REFRESH_DAYS", "7"))  # 게시 후 이 기간이 지난 게시물은 재수집하지 않음
+
+# 모델 로딩 설정
+PRETRAINED_MODEL_NAME = os.getenv("PRETRAINED_MODEL_NAME", "skt/kobert-base-v1")
+MODEL_PATH = os.getenv("MODEL_PATH", "models/best_kobert_model.pt")  # 파인튜닝된 분류기 가중치
+MODEL_BUNDLE_DIR = os.getenv("MODEL_BUNDLE_DIR", "models/bundle")  # python -m models.bundle 로 생성한 오프라인 번들
+MODEL_HUB_FALLBACK = os.getenv("MODEL_HUB_FALLBACK", "false").lower() == "true"  # 번들이 없거나 손상된 경우 허브에서 로드 허용
+WARMUP_ON_STARTUP = os.getenv("WARMUP_ON_STARTUP", "true").lower() == "true"  # 서버 시작 시 모델 로딩 및 워밍업
+
+# 추론 엔진 설정
+INFERENCE_BACKEND = os.getenv("INFERENCE_BACKEND", "torch")  # torch / torch_int8 / onnx
+ONNX_MODEL_PATH = os.getenv("ONNX_MODEL_PATH", "models/kobert.onnx")  # python -m models.engine export 로 생성
+INFERENCE_THREADS = int(os.getenv("INFERENCE_THREADS", "0"))  # 0이면 라이브러리 기본값 사용
+
+# /predict 마이크로 배치 설정
+PREDICT_MAX_BATCH_SIZE = int(os.getenv("PREDICT_MAX_BATCH_SIZE", "64"))  # 한 번에 추론할 최대 댓글 수
+PREDICT_MAX_WAIT_MS = float(os.getenv("PREDICT_MAX_WAIT_MS", "10"))  # 배치를 모으기 위해 기다리는 최대 시간
+PREDICT_MAX_TEXTS = int(os.getenv("PREDICT_MAX_TEXTS", "256"))  # 요청당 최대 댓글 수
+
+# 전처리 설정
+PREPROCESS_WORKERS = int(os.getenv("PREPROCESS_WORKERS", "0"))  # 대용량 데이터 전처리 프로세스 수 (0이면 사용 안 함)
+
+# 크롤링과 분석을 겹쳐 실행하는 스트리밍 파이프라인 사용 여부
+STREAMING_PIPELINE = os.getenv("STREAMING_PIPELINE", "true").lower() == "true"
+
+# 분석 결과 저장 설정
+RESULT_FORMAT = os.getenv("RESULT_FORMAT", "parquet").lower()  # 결과 저장 형식 (parquet, arrow, csv)
+RESULT_CSV_EXPORT = os.getenv("RESULT_CSV_EXPORT", "false").lower() == "true"  # CSV 미리 저장 여부 (끄면 요청 시 생성)
+RESULT_DIR = os.getenv("RESULT_DIR", "results")  # 작업별 결과 저장 루트 디렉토리
+RESULT_RETENTION_JOBS = int(os.getenv("RESULT_RETENTION_JOBS", "100"))  # 보관할 최대 작업 결과 수
+RESULT_RETENTION_HOURS = float(os.getenv("RESULT_RETENTION_HOURS", "24"))  # 작업 결과 보관 시간
+RESULT_CLEANUP_INTERVAL = float(os.getenv("RESULT_CLEANUP_INTERVAL", "300"))  # 작업 결과 정리 주기 (초)
+
+# Selenium WebDriver 풀 설정
+WEBDRIVER_POOL_SIZE = int(os.getenv("WEBDRIVER_POOL_SIZE", "2"))  # 동시에 유지할 브라우저 수
+WEBDRIVER_MAX_USES = int(os.getenv("WEBDRIVER_MAX_USES", "20"))  # 브라우저 재사용 횟수 (초과 시 재시작)
+INSTAGRAM_SESSION_PATH = os.getenv("INSTAGRAM_SESSION_PATH", "cache/instagram_session.json")  # 로그인 세션(쿠키/스토리지) 저장 경로
+INSTAGRAM_SCRAPE_WORKERS = int(os.getenv("INSTAGRAM_SCRAPE_WORKERS", "2"))  # 게시물 동시 수집 브라우저 수 (1이면 순차 탐색)
+INSTAGRAM_REQUESTS_PER_SECOND = float(os.getenv("INSTAGRAM_REQUESTS_PER_SECOND", "1"))  # 페이지 이동/더보기 클릭 초당 최대 횟수
+
+# YouTube API 응답 캐시 및 할당량 기록 설정
+YOUTUBE_CACHE_PATH = os.getenv("YOUTUBE_CACHE_PATH", "cache/youtube_api.sqlite")  # 응답 캐시/할당량 기록 저장 경로
+YOUTUBE_CHANNEL_CACHE_TTL = int(os.getenv("YOUTUBE_CHANNEL_CACHE_TTL", str(30 * 24 * 3600)))  # 채널 ID 조회 결과 캐시 시간 (초)
+YOUTUBE_PAGE_CACHE_TTL = int(os.getenv("YOUTUBE_PAGE_CACHE_TTL", "600"))  # 목록/댓글 페이지 응답 캐시 시간 (초, 0이면 사용 안 함)
+
+# 재학습 및 모델 버전 관리 설정
+MODEL_REGISTRY_DIR = os.getenv("MODEL_REGISTRY_DIR", "models/registry")  # 재학습된 모델 버전 저장 경로
+MODEL_KEEP_LOADED = int(os.getenv("MODEL_KEEP_LOADED", "2"))  # 즉시 롤백을 위해 메모리에 유지할 모델 수
+RETRAIN_THREADS = int(os.getenv("RETRAIN_THREADS", "1"))  # 재학습 프로세스가 사용할 CPU 스레드 수
+RETRAIN_EPOCHS = int(os.getenv("RETRAIN_EPOCHS", "3"))  # 재학습 Epoch 수
+RETRAIN_LEARNING_RATE = float(os.getenv("RETRAIN_LEARNING_RATE", "5e-6"))  # 분류기 학습률
+RETRAIN_HOLDOUT_FRACTION = float(os.getenv("RETRAIN_HOLDOUT_FRACTION", "0.2"))  # 재학습 전후 비교용 검증 데이터 비율
+RETRAIN_AUTO_ACTIVATE = os.getenv("RETRAIN_AUTO_ACTIVATE", "true").lower() == "true"  # 검증 정확도가 유지되면 자동 적용
+
+# 피드백 저장 설정
+FEEDBACK_LOG_PATH = os.getenv("FEEDBACK_LOG_PATH", "dataset/feedback.sqlite")  # 피드백 기록 저장 경로 (추가만 함)
+FEEDBACK_BATCH_SIZE = int(os.getenv("FEEDBACK_BATCH_SIZE", "256"))  # 한 트랜잭션으로 저장할 최대 피드백 수
+FEEDBACK_MAX_WAIT_MS = float(os.getenv("FEEDBACK_MAX_WAIT_MS", "5"))  # 피드백을 모으기 위해 기다리는 최대 시간
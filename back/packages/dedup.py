@@ -0,0 +1,149 @@
+import zlib
+from difflib import SequenceMatcher
+import numpy as np
+
+# MinHash 해시 함수 파라미터
+_MERSENNE_PRIME = np.uint64((1 << 61) - 1)
+_MAX_HASH = np.uint64((1 << 32) - 1)
+
+
+def _optimal_bands(num_perm, threshold, min_rows=1):
+    """
+    Pick (bands, rows) with bands * rows <= num_perm and rows >= `min_rows`
+    whose S-curve threshold (1 / bands) ** (1 / rows) is closest to `threshold`.
+    """
+    best = (num_perm // min_rows, min_rows)
+    best_error = float("inf")
+    for rows in range(min_rows, num_perm + 1):
+        bands = num_perm // rows
+        error = abs((1.0 / bands) ** (1.0 / rows) - threshold)
+        if error < best_error:
+            best, best_error = (bands, rows), error
+    return best
+
+
+def _similar(text, other, threshold):
+    # quick_ratio 계열은 ratio의 상한이므로 먼저 확인해도 결과는 같음
+    matcher = SequenceMatcher(None, text, other)
+    return (matcher.real_quick_ratio() > threshold and matcher.quick_ratio() > threshold
+            and matcher.ratio() > threshold)
+
+
+class NearDuplicateIndex:
+    """
+    Near-duplicate detector replacing the pairwise SequenceMatcher scan.
+
+    Texts are indexed by character n-gram MinHash signatures split into LSH bands,
+    so each lookup only compares against texts that share a band bucket.
+    Exact repeats are caught by a hash set before any signature is computed.
+
+    Work per lookup is bounded so the whole pass stays close to linear:
+    every bucket keeps only its `max_bucket` most recent texts, candidates
+    whose estimated Jaccard similarity (from the signatures) is below
+    `min_jaccard` are skipped, and at most `max_candidates` of the most
+    similar remaining ones are verified with the same SequenceMatcher ratio
+    used before (`verify="sequence"`) or with the estimated Jaccard itself
+    (`verify="jaccard"`).
+    """
+
+    def __init__(self, threshold=0.5, ngram=2, num_perm=128, lsh_threshold=0.2, min_rows=2, min_jaccard=0.1,
+                 max_bucket=64, max_candidates=64, verify="sequence", seed=1):
+        if verify not in ("sequence", "jaccard"):
+            raise ValueError(f"Unknown verify mode: {verify}")
+        self.threshold = threshold
+        self.ngram = ngram
+        self.verify = verify
+        self.min_jaccard = min_jaccard
+        self.max_bucket = max_bucket
+        self.max_candidates = max_candidates
+        self.bands, self.rows = _optimal_bands(num_perm, lsh_threshold, min_rows)
+
+        rng = np.random.RandomState(seed)
+        size = self.bands * self.rows
+        self._a = rng.randint(1, 1 << 31, size=size).astype(np.uint64)
+        self._b = rng.randint(0, 1 << 31, size=size).astype(np.uint64)
+
+        self._exact = set()
+        self._texts = []
+        # 후보 유사도 추정을 위해 서명을 한 배열에 모아 둠 (32비트 해시값, 필요할 때 두 배로 확장)
+        self._signatures = np.empty((1024, size), dtype=np.uint32)
+        self._buckets = [dict() for _ in range(self.bands)]
+
+    def __len__(self):
+        return len(self._texts)
+
+    def _shingles(self, text):
+        if len(text) <= self.ngram:
+            return {text}
+        return {text[i:i + self.ngram] for i in range(len(text) - self.ngram + 1)}
+
+    def _signature(self, text):
+        hashes = np.fromiter(
+            (zlib.crc32(s.encode("utf-8")) for s in self._shingles(text)),
+            dtype=np.uint64,
+        )
+        permuted = (np.outer(self._a, hashes) + self._b[:, None]) % _MERSENNE_PRIME & _MAX_HASH
+        return permuted.min(axis=1).astype(np.uint32)
+
+    def _band_keys(self, signature):
+        for band in range(self.bands):
+            yield band, signature[band * self.rows:(band + 1) * self.rows].tobytes()
+
+    def _candidates(self, signature):
+        """
+        Indexed doc ids sharing a bucket with `signature`, most similar first,
+        limited to `max_candidates` with estimated Jaccard >= `min_jaccard`.
+        """
+        doc_ids = set()
+        for band, key in self._band_keys(signature):
+            bucket = self._buckets[band].get(key)
+            if bucket:
+                doc_ids.update(bucket)
+        if not doc_ids:
+            return np.empty(0, dtype=np.int64), np.empty(0)
+        doc_ids = np.fromiter(doc_ids, dtype=np.int64, count=len(doc_ids))
+        estimates = (self._signatures[doc_ids] == signature).mean(axis=1)
+        keep = estimates >= self.min_jaccard
+        doc_ids, estimates = doc_ids[keep], estimates[keep]
+        order = np.argsort(-estimates, kind="stable")[:self.max_candidates]
+        return doc_ids[order], estimates[order]
+
+    def query(self, text, signature=None):
+        """
+        Return True if `text` is similar to any indexed text.
+        """
+        if text in self._exact:
+            return True
+        if signature is None:
+            signature = self._signature(text)
+        doc_ids, estimates = self._candidates(signature)
+        if self.verify == "jaccard":
+            return bool(len(estimates)) and float(estimates[0]) > self.threshold
+        return any(_similar(text, self._texts[doc_id], self.threshold) for doc_id in doc_ids)
+
+    def add(self, text, signature=None):
+        if signature is None:
+            signature = self._signature(text)
+        doc_id = len(self._texts)
+        if doc_id == len(self._signatures):
+            self._signatures = np.concatenate([self._signatures, np.empty_like(self._signatures)])
+        self._texts.append(text)
+        self._signatures[doc_id] = signature
+        self._exact.add(text)
+        for band, key in self._band_keys(signature):
+            bucket = self._buckets[band].setdefault(key, [])
+            bucket.append(doc_id)
+            if len(bucket) > self.max_bucket:
+                del bucket[0]
+
+    def check_and_add(self, text):
+        """
+        Return True if `text` is a near-duplicate; otherwise index it and return False.
+        """
+        if text in self._exact:
+            return True
+        signature = self._signature(text)
+        if self.query(text, signature):
+            return True
+        self.add(text, signature)
+        return False
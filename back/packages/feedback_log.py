@@ -0,0 +1,96 @@
+import hashlib
+import json
+import os
+import sqlite3
+import threading
+import time
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS feedback (
+    id INTEGER PRIMARY KEY AUTOINCREMENT,
+    key TEXT NOT NULL UNIQUE,
+    record TEXT NOT NULL,
+    received_at REAL NOT NULL
+);
+CREATE TABLE IF NOT EXISTS offsets (
+    consumer TEXT PRIMARY KEY,
+    position INTEGER NOT NULL
+);
+"""
+
+
+def record_key(record):
+    # 같은 내용의 피드백은 키 순서와 관계없이 한 번만 저장
+    return hashlib.sha1(json.dumps(record, sort_keys=True, ensure_ascii=False).encode("utf-8")).hexdigest()
+
+
+class FeedbackLog:
+    """
+    Append-only feedback log shared by every server process.
+
+    Records are only ever inserted (duplicates ignored) and each batch is
+    one fsync'd transaction. Consumers such as the retrain trigger keep an
+    offset (last consumed id) and read only what arrived after it.
+    """
+
+    def __init__(self, path):
+        os.makedirs(os.path.dirname(os.path.abspath(path)), exist_ok=True)
+        self._conn = sqlite3.connect(path, timeout=30, check_same_thread=False)
+        self._conn.execute("PRAGMA journal_mode=WAL")
+        # 커밋마다 WAL을 디스크에 기록 (배포/재시작 후에도 유지)
+        self._conn.execute("PRAGMA synchronous=FULL")
+        self._conn.executescript(SCHEMA)
+        self._lock = threading.Lock()
+
+    def append_many(self, records):
+        """
+        Append `records` in one transaction. Returns, per record, whether it
+        was new (False for duplicates).
+        """
+        now = time.time()
+        inserted = []
+        with self._lock, self._conn:
+            for record in records:
+                cursor = self._conn.execute(
+                    "INSERT OR IGNORE INTO feedback (key, record, received_at) VALUES (?, ?, ?)",
+                    (record_key(record), json.dumps(record, ensure_ascii=False), now),
+                )
+                inserted.append(cursor.rowcount == 1)
+        return inserted
+
+    def _position(self, consumer):
+        row = self._conn.execute("SELECT position FROM offsets WHERE consumer = ?", (consumer,)).fetchone()
+        return row[0] if row else 0
+
+    def pending(self, consumer):
+        with self._lock:
+            return self._conn.execute(
+                "SELECT COUNT(*) FROM feedback WHERE id > ?", (self._position(consumer),)
+            ).fetchone()[0]
+
+    def consume(self, consumer, min_records, handler):
+        """
+        If at least `min_records` arrived since `consumer`'s offset, pass them
+        to `handler(records)` and advance the offset past them. Runs under a
+        write lock, so concurrent processes never hand out the same records;
+        if `handler` raises, the offset stays where it was.
+        Returns the number of records consumed.
+        """
+        with self._lock:
+            self._conn.execute("BEGIN IMMEDIATE")
+            try:
+                rows = self._conn.execute(
+                    "SELECT id, record FROM feedback WHERE id > ? ORDER BY id", (self._position(consumer),)
+                ).fetchall()
+                if len(rows) < min_records:
+                    self._conn.rollback()
+                    return 0
+                handler([json.loads(record) for _, record in rows])
+                self._conn.execute(
+                    "INSERT OR REPLACE INTO offsets (consumer, position) VALUES (?, ?)", (consumer, rows[-1][0])
+                )
+                self._conn.commit()
+            except Exception:
+                self._conn.rollback()
+                raise
+        return len(rows)
@@ -0,0 +1,197 @@
+import threading
+import time
+import uuid
+from collections import deque
+from concurrent.futures import Future, ThreadPoolExecutor
+from logging_config import setup_logger
+
+# 로그 설정
+logger = setup_logger(__name__)
+
+# 작업 상태 정의
+QUEUED = "queued"
+RUNNING = "running"
+SUCCEEDED = "succeeded"
+FAILED = "failed"
+
+# 작업별로 보관하는 최근 이벤트 수 (SSE 재연결 시 이어받기용)
+EVENT_HISTORY = 1000
+
+
+class Job:
+    def __init__(self, params):
+        self.id = uuid.uuid4().hex
+        self.params = params
+        self.state = QUEUED
+        self.stage = None
+        self.counts = {}
+        self.result = None
+        self.error = None
+        self.created_at = time.time()
+        self.updated_at = self.created_at
+        self.events = deque(maxlen=EVENT_HISTORY)
+        self.event_seq = 0
+
+    def to_dict(self):
+        # 필드는 JobManager의 lock 아래에서 변경되므로 JobManager.snapshot()을 통해 호출
+        return {
+            "job_id": self.id,
+            "state": self.state,
+            "stage": self.stage,
+            "counts": dict(self.counts),
+            "result": self.result,
+            "error": self.error,
+            "params": self.params,
+            "created_at": self.created_at,
+            "updated_at": self.updated_at,
+        }
+
+
+class JobManager:
+    """
+    Run crawl-and-analyze jobs outside the event loop.
+    Crawling (network/Selenium bound) and inference (CPU bound) use separate
+    executors so that a long crawl never waits behind another job's inference.
+    Streaming jobs analyze on their own consumer thread instead, so one job's
+    analysis never queues behind another's; only the model forward passes
+    are serialized (see models.predict).
+    """
+
+    def __init__(self, crawl_workers=4, infer_workers=1, max_jobs=500):
+        self.crawl_executor = ThreadPoolExecutor(max_workers=crawl_workers, thread_name_prefix="crawl")
+        self.infer_executor = ThreadPoolExecutor(max_workers=infer_workers, thread_name_prefix="infer")
+        self.max_jobs = max_jobs
+        self._jobs = {}
+        self._lock = threading.Lock()
+
+    def submit(self, params, crawl_fn, analyze_fn):
+        """
+        Register a job and start it. Returns the job immediately.
+        crawl_fn(job) runs on the crawl executor and its return value is passed to
+        analyze_fn(job, crawled) on the inference executor. If crawl_fn returns
+        a Future (e.g. from start_consumer), analyze_fn(job, future) runs as
+        soon as that future completes instead.
+        """
+        job = Job(params)
+        with self._lock:
+            self._jobs[job.id] = job
+            self._evict()
+        self.crawl_executor.submit(self._run_crawl, job, crawl_fn, analyze_fn)
+        logger.info("Job %s submitted: %s", job.id, params)
+        return job
+
+    def get(self, job_id):
+        with self._lock:
+            return self._jobs.get(job_id)
+
+    def list(self):
+        with self._lock:
+            return list(self._jobs.values())
+
+    def update(self, job, **fields):
+        with self._lock:
+            counts = fields.pop("counts", None)
+            if counts:
+                job.counts.update(counts)
+                self._record(job, "progress", dict(job.counts))
+            for key, value in fields.items():
+                changed = getattr(job, key) != value
+                setattr(job, key, value)
+                if key == "stage" and changed:
+                    self._record(job, "stage", {"stage": value})
+            if fields.get("state") == SUCCEEDED:
+                self._record(job, "done", {"result": job.result, "counts": dict(job.counts)})
+            elif fields.get("state") == FAILED:
+                self._record(job, "failed", {"error": job.error})
+            job.updated_at = time.time()
+
+    def snapshot(self, job):
+        """
+        The job's state and the sequence number of its latest event, read
+        together under the lock so they always match.
+        """
+        with self._lock:
+            return job.to_dict(), job.event_seq
+
+    def publish(self, job, event, data):
+        """
+        Record a custom event (e.g. partial results) for the job's event stream.
+        """
+        with self._lock:
+            self._record(job, event, data)
+
+    def events_since(self, job, seq):
+        """
+        Events recorded after sequence number `seq`, as (seq, event, data).
+        """
+        with self._lock:
+            return [item for item in job.events if item[0] > seq]
+
+    def start_consumer(self, job, fn):
+        """
+        Run `fn()` on a dedicated thread for `job` and return a Future of its
+        result (e.g. a streaming analysis that lives as long as the crawl).
+        """
+        future = Future()
+
+        def run():
+            if not future.set_running_or_notify_cancel():
+                return
+            try:
+                future.set_result(fn())
+            except Exception as e:
+                future.set_exception(e)
+
+        threading.Thread(target=run, name=f"consume-{job.id[:8]}", daemon=True).start()
+        return future
+
+    def in_flight(self):
+        with self._lock:
+            return sum(1 for job in self._jobs.values() if job.state in (QUEUED, RUNNING))
+
+    def active_ids(self):
+        with self._lock:
+            return [job.id for job in self._jobs.values() if job.state in (QUEUED, RUNNING)]
+
+    def shutdown(self):
+        self.crawl_executor.shutdown(wait=False, cancel_futures=True)
+        self.infer_executor.shutdown(wait=False, cancel_futures=True)
+
+    def _run_crawl(self, job, crawl_fn, analyze_fn):
+        try:
+            self.update(job, state=RUNNING, stage="crawling")
+            crawled = crawl_fn(job)
+            if isinstance(crawled, Future):
+                # 분석이 작업 전용 스레드에서 진행 중이면 추론 실행기 대기열을 거치지 않고 완료 시 바로 마무리
+                crawled.add_done_callback(lambda future: self._run_analyze(job, analyze_fn, future))
+                return
+            self.update(job, stage="waiting_for_analysis")
+            self.infer_executor.submit(self._run_analyze, job, analyze_fn, crawled)
+        except Exception as e:
+            logger.exception("Job %s failed during crawling", job.id)
+            self.update(job, state=FAILED, error=str(e))
+
+    def _run_analyze(self, job, analyze_fn, crawled):
+        try:
+            self.update(job, stage="analyzing")
+            result = analyze_fn(job, crawled)
+            self.update(job, state=SUCCEEDED, stage="done", result=result)
+            logger.info("Job %s finished", job.id)
+        except Exception as e:
+            logger.exception("Job %s failed during analysis", job.id)
+            self.update(job, state=FAILED, error=str(e))
+
+    def _record(self, job, event, data):
+        job.event_seq += 1
+        job.events.append((job.event_seq, event, data))
+
+    def _evict(self):
+        # 완료된 오래된 작업부터 제거하여 메모리 사용량 제한
+        if len(self._jobs) <= self.max_jobs:
+            return
+        finished = sorted(
+            (job for job in self._jobs.values() if job.state in (SUCCEEDED, FAILED)),
+            key=lambda job: job.updated_at,
+        )
+        for job in finished[: len(self._jobs) - self.max_jobs]:
+            del self._jobs[job.id]
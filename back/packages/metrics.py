@@ -0,0 +1,161 @@
+import bisect
+import math
+import threading
+import time
+from contextlib import contextmanager
+
+# 단계별 소요 시간 구간 (초, 배치 추론 수 ms ~ 크롤링 수십 분)
+DEFAULT_BUCKETS = (0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1, 2.5, 5, 10, 30, 60, 120, 300, 600, 1800)
+
+CONTENT_TYPE = "text/plain; version=0.0.4; charset=utf-8"
+
+_registry = []
+
+
+def _escape(value):
+    return str(value).replace("\\", "\\\\").replace("\n", "\\n").replace('"', '\\"')
+
+
+def _format_labels(names, values, extra=()):
+    pairs = list(zip(names, values)) + list(extra)
+    if not pairs:
+        return ""
+    return "{" + ",".join(f'{name}="{_escape(value)}"' for name, value in pairs) + "}"
+
+
+def _format_value(value):
+    if value == math.inf:
+        return "+Inf"
+    return repr(float(value)) if isinstance(value, float) else str(value)
+
+
+class _Metric:
+    kind = None
+    # 노출 이름 접미사 (HELP/TYPE와 샘플이 같은 이름을 쓰도록 함)
+    suffix = ""
+
+    def __init__(self, name, documentation, labelnames=()):
+        self.name = name
+        self.documentation = documentation
+        self.labelnames = tuple(labelnames)
+        self._values = {}
+        self._lock = threading.Lock()
+        _registry.append(self)
+
+    def _key(self, labels):
+        if set(labels) != set(self.labelnames):
+            raise ValueError(f"{self.name} expects labels {self.labelnames}, got {tuple(labels)}")
+        return tuple(str(labels[name]) for name in self.labelnames)
+
+    def samples(self):
+        raise NotImplementedError
+
+    def render(self):
+        name = self.name + self.suffix
+        lines = [f"# HELP {name} {self.documentation}", f"# TYPE {name} {self.kind}"]
+        for suffix, label_values, extra, value in self.samples():
+            lines.append(f"{name}{suffix}{_format_labels(self.labelnames, label_values, extra)} {_format_value(value)}")
+        return "\n".join(lines)
+
+
+class Counter(_Metric):
+    kind = "counter"
+    suffix = "_total"
+
+    def inc(self, amount=1, **labels):
+        key = self._key(labels)
+        with self._lock:
+            self._values[key] = self._values.get(key, 0) + amount
+
+    def samples(self):
+        with self._lock:
+            return [("", key, (), value) for key, value in sorted(self._values.items())]
+
+
+class Gauge(_Metric):
+    """
+    Gauge set directly or read from callbacks registered per label set
+    (e.g. a queue's current depth) when /metrics is scraped.
+    """
+
+    kind = "gauge"
+
+    def __init__(self, name, documentation, labelnames=()):
+        super().__init__(name, documentation, labelnames)
+        self._functions = {}
+
+    def set(self, value, **labels):
+        key = self._key(labels)
+        with self._lock:
+            self._values[key] = value
+
+    def set_function(self, fn, **labels):
+        key = self._key(labels)
+        with self._lock:
+            self._functions[key] = fn
+
+    def samples(self):
+        with self._lock:
+            values = dict(self._values)
+            functions = dict(self._functions)
+        for key, fn in functions.items():
+            try:
+                values[key] = fn()
+            except Exception:
+                continue
+        return [("", key, (), value) for key, value in sorted(values.items())]
+
+
+class Histogram(_Metric):
+    kind = "histogram"
+
+    def __init__(self, name, documentation, labelnames=(), buckets=DEFAULT_BUCKETS):
+        super().__init__(name, documentation, labelnames)
+        self.buckets = tuple(sorted(buckets)) + (math.inf,)
+
+    def observe(self, value, **labels):
+        key = self._key(labels)
+        with self._lock:
+            counts, total = self._values.get(key, ([0] * len(self.buckets), 0.0))
+            counts[bisect.bisect_left(self.buckets, value)] += 1
+            self._values[key] = (counts, total + value)
+
+    @contextmanager
+    def time(self, **labels):
+        start = time.perf_counter()
+        try:
+            yield
+        finally:
+            self.observe(time.perf_counter() - start, **labels)
+
+    def samples(self):
+        samples = []
+        with self._lock:
+            for key, (counts, total) in sorted(self._values.items()):
+                cumulative = 0
+                for bound, count in zip(self.buckets, counts):
+                    cumulative += count
+                    samples.append(("_bucket", key, (("le", _format_value(bound)),), cumulative))
+                samples.append(("_count", key, (), cumulative))
+                samples.append(("_sum", key, (), total))
+        return samples
+
+
+def render():
+    """
+    All registered metrics in the Prometheus text exposition format.
+    """
+    return "\n".join(metric.render() for metric in _registry) + "\n"
+
+
+# 단계별 소요 시간 (crawl, api_page, preprocess, tokenize, inference_batch, output_write)
+STAGE_SECONDS = Histogram("sentiment_stage_duration_seconds", "Time spent per pipeline stage.", ["stage"])
+
+# 처리량 및 캐시/할당량
+COMMENTS_PROCESSED = Counter("sentiment_comments_processed", "Comments handled per stage.", ["stage"])
+CACHE_REQUESTS = Counter("sentiment_cache_requests", "Cache lookups by cache and result.", ["cache", "result"])
+QUOTA_UNITS = Counter("sentiment_youtube_quota_units", "YouTube API quota units spent on calls or saved by the cache.", ["kind"])
+
+# 현재 상태 (조회 시점의 값)
+QUEUE_DEPTH = Gauge("sentiment_queue_depth", "Items waiting in each internal queue.", ["queue"])
+JOBS_IN_FLIGHT = Gauge("sentiment_jobs_in_flight", "Crawl-and-analyze jobs queued or running.")
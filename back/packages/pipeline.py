@@ -0,0 +1,157 @@
+import queue
+import weakref
+import numpy as np
+import pandas as pd
+from models.aggregates import SENTIMENTS
+from models.predict import prepare_comments, predict_feelings, save_analysis_results, active_engine
+from models.predict import count_words, stored_word_frequencies
+from logging_config import setup_logger
+
+# 로그 설정
+logger = setup_logger(__name__)
+
+_DONE = object()
+
+# 실행 중인 스트리밍 분석 (큐 대기 페이지 수 집계용)
+_pipelines = weakref.WeakSet()
+
+
+def queued_pages():
+    return sum(pipeline.queue_depth() for pipeline in list(_pipelines))
+
+
+class StreamingAnalysis:
+    """
+    Overlap crawling with preprocessing and inference.
+
+    The crawler calls put_page() with each page of comments as soon as it is
+    fetched; pages go through a bounded queue, so a slow consumer applies
+    backpressure instead of buffering the whole crawl. consume() runs on the
+    job's own consumer thread, preprocesses every page and runs batched inference
+    whenever `min_infer_rows` preprocessed comments are pending, merging the
+    chunk's word counts into the per-source store as it goes and reporting
+    running sentiment ratios through `on_partial`. Once the crawler calls
+    close(), the remaining rows are scored and the usual result files are
+    written into `save_dir`.
+    """
+
+    def __init__(self, batch_size=64, max_len=128, queue_size=16, min_infer_rows=None, on_progress=None,
+                 save_dir=None, on_partial=None):
+        self.batch_size = batch_size
+        self.max_len = max_len
+        self.min_infer_rows = min_infer_rows or batch_size * 4
+        self.on_progress = on_progress
+        self.on_partial = on_partial
+        self.label_counts = np.zeros(len(SENTIMENTS), dtype=np.int64)
+        self.chunks_inferred = 0
+        self.save_dir = save_dir
+        # 단어 빈도를 누적한 출처 -> 모델 버전
+        self.word_sources = {}
+        self._queue = queue.Queue(maxsize=queue_size)
+        self._error = None
+        self._aborted = False
+        _pipelines.add(self)
+
+    def _put(self, item):
+        while True:
+            if self._error is not None:
+                raise RuntimeError(f"Analysis stage failed: {self._error}")
+            try:
+                self._queue.put(item, timeout=0.5)
+                return
+            except queue.Full:
+                continue
+
+    def put_page(self, comments):
+        """
+        Producer side: hand over one page of crawled comment dicts.
+        """
+        if comments:
+            self._put(list(comments))
+
+    def close(self):
+        self._put(_DONE)
+
+    def abort(self):
+        """
+        Stop the consumer without writing results (e.g. the crawl failed).
+        """
+        self._aborted = True
+
+    def queue_depth(self):
+        return self._queue.qsize()
+
+    def consume(self):
+        raw_pages = []
+        processed_pages = []
+        predictions = []
+        pending = []
+        offset = 0
+        try:
+            while True:
+                try:
+                    page = self._queue.get(timeout=0.5)
+                except queue.Empty:
+                    if self._aborted:
+                        raise RuntimeError("Crawling failed; streaming analysis aborted.")
+                    continue
+                if page is _DONE:
+                    break
+
+                # 원본 순서를 유지하도록 전체 기준 인덱스 부여
+                page_df = pd.DataFrame(page, columns=["date", "comment", "link"])
+                page_df.index = pd.RangeIndex(offset, offset + len(page_df))
+                offset += len(page_df)
+                raw_pages.append(page_df)
+
+                pending.append(prepare_comments(page_df, require_rows=False))
+                if sum(len(df) for df in pending) >= self.min_infer_rows:
+                    predictions.extend(self._infer(pending, processed_pages, offset))
+                    pending = []
+
+            if pending:
+                predictions.extend(self._infer(pending, processed_pages, offset))
+
+            if not processed_pages or not predictions:
+                raise ValueError("Processed DataFrame is empty after preprocessing.")
+            original_df = pd.concat(raw_pages)
+            processed_df = pd.concat(processed_pages)
+            logger.info(f"Streaming analysis finished: {len(original_df)} crawled, {len(processed_df)} analyzed.")
+            sources_by_version = {}
+            for source, version in self.word_sources.items():
+                sources_by_version.setdefault(version, []).append(source)
+            word_frequencies = stored_word_frequencies(sources_by_version)
+            return save_analysis_results(original_df, processed_df, predictions, self.save_dir, word_frequencies)
+        except Exception as e:
+            self._error = e
+            raise
+
+    def _infer(self, pending, processed_pages, crawled):
+        chunk = pd.concat(pending)
+        processed_pages.append(chunk)
+        if chunk.empty:
+            return []
+        _, version = active_engine()
+        chunk_predictions = predict_feelings(chunk, self.batch_size, self.max_len)
+        for source in count_words(chunk, chunk_predictions, version):
+            self.word_sources[source] = version
+        self.label_counts += np.bincount(chunk_predictions, minlength=len(SENTIMENTS))[:len(SENTIMENTS)]
+        self.chunks_inferred += 1
+        analyzed = sum(len(df) for df in processed_pages)
+        if self.on_progress is not None:
+            self.on_progress({
+                "crawled_comments": crawled,
+                "analyzed_comments": analyzed,
+                "inference_chunks": self.chunks_inferred,
+            })
+        if self.on_partial is not None:
+            # 지금까지 분석된 댓글 기준 감정 비율 (최종 ratio와 같은 방식으로 계산)
+            total = int(self.label_counts.sum())
+            self.on_partial({
+                "analyzed_comments": analyzed,
+                "ratio": {
+                    sentiment: round(int(count) / total * 100, 2)
+                    for sentiment, count in zip(SENTIMENTS, self.label_counts)
+                },
+            })
+        return chunk_predictions
@@ -0,0 +1,87 @@
+import os
+import re
+import shutil
+import time
+from logging_config import setup_logger
+
+# 로그 설정
+logger = setup_logger(__name__)
+
+# 작업 ID는 uuid4 hex 형식만 허용 (경로 조작 방지)
+JOB_ID_PATTERN = re.compile(r"^[0-9a-f]{32}$")
+
+# 작업 디렉토리 안의 크롤링 결과 하위 디렉토리
+CRAWL_DIR = "crawl"
+
+
+class ResultStore:
+    """
+    Per-job result directories under one root: <root>/<job_id>/<file>.
+    Old directories are removed by cleanup() once there are more than
+    `max_jobs` of them or they are older than `max_age_hours`; directories
+    of jobs that are still running are never removed.
+    """
+
+    def __init__(self, root, max_jobs=100, max_age_hours=24):
+        self.root = os.path.abspath(root)
+        self.max_jobs = max_jobs
+        self.max_age = max_age_hours * 3600
+        os.makedirs(self.root, exist_ok=True)
+
+    def job_dir(self, job_id, create=True):
+        if not JOB_ID_PATTERN.match(job_id):
+            raise ValueError(f"Invalid job id: {job_id}")
+        path = os.path.join(self.root, job_id)
+        if create:
+            os.makedirs(path, exist_ok=True)
+        return path
+
+    def crawl_dir(self, job_id, create=True):
+        path = os.path.join(self.job_dir(job_id, create), CRAWL_DIR)
+        if create:
+            os.makedirs(path, exist_ok=True)
+        return path
+
+    def file_path(self, job_id, filename, subdir=""):
+        """
+        Path of a stored result file (optionally in `subdir`, e.g. CRAWL_DIR),
+        or None if it does not exist.
+        """
+        if not JOB_ID_PATTERN.match(job_id) or os.path.basename(filename) != filename or filename.startswith("."):
+            return None
+        path = os.path.join(self.root, job_id, subdir, filename)
+        return path if os.path.isfile(path) else None
+
+    def list_files(self, job_id):
+        if not JOB_ID_PATTERN.match(job_id):
+            return []
+        path = os.path.join(self.root, job_id)
+        if not os.path.isdir(path):
+            return []
+        # 쓰기 중인 임시 파일은 제외
+        return sorted(
+            name for name in os.listdir(path)
+            if not name.startswith(".") and os.path.isfile(os.path.join(path, name))
+        )
+
+    def cleanup(self, active_ids=()):
+        """
+        Apply the retention policy. Returns the number of removed directories.
+        """
+        active_ids = set(active_ids)
+        entries = []
+        for name in os.listdir(self.root):
+            path = os.path.join(self.root, name)
+            if JOB_ID_PATTERN.match(name) and os.path.isdir(path) and name not in active_ids:
+                entries.append((os.path.getmtime(path), path))
+        entries.sort(reverse=True)
+
+        now = time.time()
+        removed = 0
+        for index, (mtime, path) in enumerate(entries):
+            if index >= self.max_jobs or now - mtime > self.max_age:
+                shutil.rmtree(path, ignore_errors=True)
+                removed += 1
+        if removed:
+            logger.info(f"Removed {removed} expired result directories from {self.root}.")
+        return removed
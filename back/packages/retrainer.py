@@ -0,0 +1,82 @@
+import multiprocessing
+import threading
+import time
+from concurrent.futures import ProcessPoolExecutor, ThreadPoolExecutor
+from models.predict import model_registry, swap_model
+from models.retrain import run_retraining
+from logging_config import setup_logger
+from packages.config import MODEL_PATH, MODEL_BUNDLE_DIR, MODEL_HUB_FALLBACK, PRETRAINED_MODEL_NAME, MODEL_REGISTRY_DIR
+from packages.config import TOKEN_CACHE_PATH, TOKEN_CACHE_MAX_ENTRIES
+from packages.config import RETRAIN_THREADS, RETRAIN_EPOCHS, RETRAIN_LEARNING_RATE, RETRAIN_HOLDOUT_FRACTION
+
+# 로그 설정
+logger = setup_logger(__name__)
+
+
+class Retrainer:
+    """
+    Run retraining in a separate worker process, one run at a time, and
+    hot-swap the serving model when the new version does not lose accuracy
+    on its holdout split. The serving process only waits for the result.
+    """
+
+    def __init__(self, auto_activate=True):
+        self.auto_activate = auto_activate
+        self._runner = ThreadPoolExecutor(max_workers=1, thread_name_prefix="retrain")
+        self._processes = None
+        self._lock = threading.Lock()
+        self.status = {"state": "idle", "pending": 0, "last_version": None, "last_seconds": None, "error": None}
+
+    def _process_pool(self):
+        # spawn: 서빙 프로세스의 스레드/모델 메모리를 물려받지 않고, 실행 후 프로세스를 종료하여 메모리 반환
+        if self._processes is None:
+            self._processes = ProcessPoolExecutor(
+                max_workers=1, mp_context=multiprocessing.get_context("spawn"), max_tasks_per_child=1
+            )
+        return self._processes
+
+    def submit(self, feedback_path):
+        with self._lock:
+            self.status["pending"] += 1
+        return self._runner.submit(self._run, feedback_path)
+
+    def _run(self, feedback_path):
+        with self._lock:
+            self.status.update(state="running", pending=self.status["pending"] - 1, error=None)
+        start_time = time.time()
+        try:
+            meta = self._process_pool().submit(
+                run_retraining,
+                feedback_path,
+                MODEL_REGISTRY_DIR,
+                MODEL_PATH,
+                MODEL_BUNDLE_DIR,
+                PRETRAINED_MODEL_NAME,
+                base_version=model_registry.active(),
+                threads=RETRAIN_THREADS,
+                epochs=RETRAIN_EPOCHS,
+                learning_rate=RETRAIN_LEARNING_RATE,
+                holdout_fraction=RETRAIN_HOLDOUT_FRACTION,
+                allow_hub=MODEL_HUB_FALLBACK,
+                token_cache_path=TOKEN_CACHE_PATH,
+                token_cache_max_entries=TOKEN_CACHE_MAX_ENTRIES,
+            ).result()
+            logger.info(f"Retrained model {meta['version']}: {meta['metrics']}")
+            if self.auto_activate and meta["improved"]:
+                swap_model(meta["version"])
+            with self._lock:
+                self.status.update(last_version=meta["version"], last_seconds=round(time.time() - start_time, 2))
+            return meta
+        except Exception as e:
+            logger.exception("Retraining failed.")
+            with self._lock:
+                self.status["error"] = str(e)
+            raise
+        finally:
+            with self._lock:
+                self.status["state"] = "running" if self.status["pending"] else "idle"
+
+    def shutdown(self):
+        self._runner.shutdown(wait=False, cancel_futures=True)
+        if self._processes is not None:
+            self._processes.shutdown(wait=False, cancel_futures=True)
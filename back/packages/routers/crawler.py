@@ -13,9 +13,24 @@ from dotenv import load_dotenv
 from starlette.middleware.cors import CORSMiddleware
 import time
 import os
+import hashlib
+import json
+import threading
+from concurrent.futures import ThreadPoolExecutor
 import pandas as pd
 import re
-from difflib import SequenceMatcher
+from packages.youtube_fetch import YouTubeFetcher, TokenBucket
+from packages.youtube_cache import YouTubeApiCache, api_key_id
+from packages.dedup import NearDuplicateIndex
+from packages.comment_store import CommentStore
+from packages.webdriver_pool import WebDriverPool
+from models.result_io import atomic_write, write_result
+from packages.config import YOUTUBE_FETCH_WORKERS, YOUTUBE_REQUESTS_PER_SECOND, YOUTUBE_REQUEST_BURST
+from packages.config import DEDUP_THRESHOLD, DEDUP_LSH_THRESHOLD, COMMENT_STORE_PATH, INSTAGRAM_REFRESH_DAYS
+from packages.config import WEBDRIVER_POOL_SIZE, WEBDRIVER_MAX_USES, INSTAGRAM_SESSION_PATH
+from packages.config import INSTAGRAM_SCRAPE_WORKERS, INSTAGRAM_REQUESTS_PER_SECOND
+from packages.config import YOUTUBE_CACHE_PATH, YOUTUBE_CHANNEL_CACHE_TTL, YOUTUBE_PAGE_CACHE_TTL
+from packages.config import RESULT_FORMAT, RESULT_CSV_EXPORT
 
 # .env 파일에서 환경변수 로드
 load_dotenv()
@@ -24,10 +39,42 @@ INSTAGRAM_USERNAME = os.getenv("INSTAGRAM_USERNAME")
 INSTAGRAM_PASSWORD = os.getenv("INSTAGRAM_PASSWORD")
 YOUTUBE_API_KEY = os.getenv("YOUTUBE_API_KEY")
 
-if not YOUTUBE_API_KEY:
-    raise EnvironmentError("YOUTUBE_API_KEY is not set in .env file")
-
-youtube = build('youtube', 'v3', developerKey=YOUTUBE_API_KEY)
+comment_store = CommentStore(COMMENT_STORE_PATH)
+
+# YouTube API 응답 캐시 및 일일 할당량 기록
+youtube_api_cache = YouTubeApiCache(YOUTUBE_CACHE_PATH)
+
+# YouTube API 클라이언트 (첫 사용 시 생성)
+_youtube = None
+_youtube_fetcher = None
+_youtube_lock = threading.Lock()
+
+
+def get_youtube():
+    global _youtube
+    with _youtube_lock:
+        if _youtube is None:
+            if not YOUTUBE_API_KEY:
+                raise EnvironmentError("YOUTUBE_API_KEY is not set in .env file")
+            _youtube = build('youtube', 'v3', developerKey=YOUTUBE_API_KEY, static_discovery=True, cache_discovery=False)
+        return _youtube
+
+
+def get_youtube_fetcher():
+    global _youtube_fetcher
+    youtube = get_youtube()
+    with _youtube_lock:
+        if _youtube_fetcher is None:
+            _youtube_fetcher = YouTubeFetcher(
+                youtube,
+                workers=YOUTUBE_FETCH_WORKERS,
+                rate=YOUTUBE_REQUESTS_PER_SECOND,
+                burst=YOUTUBE_REQUEST_BURST,
+                cache=youtube_api_cache,
+                api_key_id=api_key_id(YOUTUBE_API_KEY),
+                page_ttl=YOUTUBE_PAGE_CACHE_TTL,
+            )
+        return _youtube_fetcher
 
 KST = timezone(timedelta(hours=9))
 app = FastAPI()
@@ -50,21 +97,40 @@ class CrawlRequest(BaseModel):
     end_date: str
     platform: str
 
+# ChromeDriver 경로 (프로세스당 한 번만 설치/확인)
+_chromedriver_path = None
+_chromedriver_lock = threading.Lock()
+
+def get_chromedriver_path():
+    global _chromedriver_path
+    with _chromedriver_lock:
+        if _chromedriver_path is None:
+            _chromedriver_path = ChromeDriverManager().install()
+        return _chromedriver_path
+
 # Selenium WebDriver 설정
 def create_webdriver():
     chrome_options = Options()
     chrome_options.add_argument("--no-sandbox")
     chrome_options.add_argument("--disable-dev-shm-usage")
-    return webdriver.Chrome(service=Service(ChromeDriverManager().install()), options=chrome_options)
+    return webdriver.Chrome(service=Service(get_chromedriver_path()), options=chrome_options)
+
+# 요청 간에 재사용하는 브라우저 풀
+webdriver_pool = WebDriverPool(create_webdriver, size=WEBDRIVER_POOL_SIZE, max_uses=WEBDRIVER_MAX_USES)
 
-# CSV 저장
-def save_to_csv(comments_data, filename="comments.csv"):
+# 크롤링 결과 저장
+def save_crawled(comments_data, name="comments", save_dir=None, csv_export=RESULT_CSV_EXPORT):
+    df = pd.DataFrame(comments_data, columns=["date", "comment", "link"])
+    if save_dir is not None:
+        # 작업별 디렉토리에는 분석 결과와 같은 형식으로 저장 (CSV는 csv_export일 때만)
+        paths = write_result(df, save_dir, name, RESULT_FORMAT, csv_export)
+        print(f"크롤링 결과가 {', '.join(os.path.basename(path) for path in paths.values())} 파일에 저장되었습니다.")
+        return
+    # 단독 크롤링은 dataset/ 아래 CSV로 저장 (전처리/검증 스크립트 입력)
     base_path = os.path.abspath(os.path.join(os.path.dirname(__file__), "..", "..", "dataset"))
     os.makedirs(base_path, exist_ok=True)
-    file_path = os.path.join(base_path, filename)
-    df = pd.DataFrame(comments_data, columns=["date", "comment", "link"])
-    df.to_csv(file_path, index=False, encoding="utf-8-sig")
-    print(f"크롤링 결과가 {filename} 파일에 저장되었습니다.")
+    atomic_write(os.path.join(base_path, name + ".csv"), lambda tmp: df.to_csv(tmp, index=False, encoding="utf-8-sig"))
+    print(f"크롤링 결과가 {name}.csv 파일에 저장되었습니다.")
 
 # 날짜 변환
 def convert_to_utc(kst_date: str) -> str:
@@ -72,19 +138,109 @@ def convert_to_utc(kst_date: str) -> str:
     utc_datetime = kst_datetime - timedelta(hours=9)
     return utc_datetime.strftime("%Y-%m-%dT%H:%M:%SZ")
 
-# Instagram 로그인
+# Instagram 로그인 (세션 쿠키가 생길 때까지 대기)
 def instagram_login(driver, username, password):
     driver.get("https://www.instagram.com/accounts/login/")
     WebDriverWait(driver, 15).until(EC.presence_of_element_located((By.NAME, "username"))).send_keys(username)
     driver.find_element(By.NAME, "password").send_keys(password)
     driver.find_element(By.XPATH, "//button[@type='submit']").click()
-    time.sleep(5)
+    WebDriverWait(driver, 15).until(is_instagram_logged_in)
+
+def is_instagram_logged_in(driver):
+    return driver.get_cookie("sessionid") is not None
+
+# 로그인 세션(쿠키와 localStorage)을 파일에 저장
+def save_instagram_session(driver):
+    session = {
+        "cookies": driver.get_cookies(),
+        "local_storage": driver.execute_script("return Object.assign({}, window.localStorage);"),
+    }
+    os.makedirs(os.path.dirname(os.path.abspath(INSTAGRAM_SESSION_PATH)), exist_ok=True)
+
+    def write(tmp):
+        with open(tmp, "w", encoding="utf-8") as f:
+            json.dump(session, f)
+        os.chmod(tmp, 0o600)  # 인증 정보이므로 소유자만 읽기 가능
+
+    atomic_write(INSTAGRAM_SESSION_PATH, write)
+
+# 저장된 세션을 브라우저에 복원하고 로그인 상태인지 확인
+def restore_instagram_session(driver):
+    if not os.path.exists(INSTAGRAM_SESSION_PATH):
+        return False
+    try:
+        with open(INSTAGRAM_SESSION_PATH, encoding="utf-8") as f:
+            session = json.load(f)
+        driver.get("https://www.instagram.com/")
+        for cookie in session.get("cookies", []):
+            cookie = {key: value for key, value in cookie.items() if key != "sameSite"}
+            if "expiry" in cookie:
+                cookie["expiry"] = int(cookie["expiry"])
+            driver.add_cookie(cookie)
+        driver.execute_script(
+            "for (const [key, value] of Object.entries(arguments[0])) window.localStorage.setItem(key, value);",
+            session.get("local_storage", {}),
+        )
+        driver.get("https://www.instagram.com/")
+        return is_instagram_logged_in(driver)
+    except Exception as e:
+        print(f"저장된 세션 복원 실패: {e}")
+        return False
+
+# 풀에서 받은 브라우저의 로그인 상태 보장 (로그인된 브라우저 > 저장된 세션 > 새 로그인 순)
+def ensure_instagram_login(pooled):
+    driver = pooled.driver
+    if pooled.state.get("instagram_logged_in") and is_instagram_logged_in(driver):
+        return
+    if restore_instagram_session(driver):
+        print("저장된 Instagram 세션 사용")
+    else:
+        instagram_login(driver, INSTAGRAM_USERNAME, INSTAGRAM_PASSWORD)
+        save_instagram_session(driver)
+    pooled.state["instagram_logged_in"] = True
+
+# 게시 후 INSTAGRAM_REFRESH_DAYS가 지난 뒤에 수집된 게시물은 다시 수집하지 않음
+def is_settled_post(post_link, post_date):
+    watermark = comment_store.get_watermark("instagram", "post", post_link)
+    if watermark is None:
+        return False
+    return watermark[1] >= (post_date + timedelta(days=INSTAGRAM_REFRESH_DAYS)).timestamp()
+
+# 게시물 댓글 저장 및 게시물 워터마크 갱신
+def save_post_comments(account, post_link, post_date, post_comments):
+    post_published_at = post_date.astimezone(timezone.utc).strftime("%Y-%m-%dT%H:%M:%SZ")
+    comment_store.upsert_sources("instagram", account, [(post_link, post_published_at)])
+    comment_store.upsert_comments("instagram", post_comments)
+    newest = max((c["published_at"] for c in post_comments), default=post_published_at)
+    comment_store.set_watermark("instagram", "post", post_link, newest)
 
 # Instagram 댓글 크롤링
-def scrape_instagram_comments(account, start_date, end_date):
+def scrape_instagram_comments(account, start_date, end_date, on_page=None, save_dir=None):
     start_time = time.time()
-    driver = create_webdriver()
-    instagram_login(driver, INSTAGRAM_USERNAME, INSTAGRAM_PASSWORD)
+    parallel = INSTAGRAM_SCRAPE_WORKERS > 1
+    with webdriver_pool.driver() as pooled:
+        ensure_instagram_login(pooled)
+        if parallel:
+            # 날짜 범위 내 게시물 링크를 먼저 모은 뒤 여러 브라우저에서 동시에 수집
+            posts = list_instagram_posts(pooled.driver, account, start_date, end_date)
+        else:
+            post_links = crawl_instagram_posts(pooled.driver, account, start_date, end_date, on_page)
+    if parallel:
+        post_links = None if posts is None else scrape_instagram_posts(account, posts, on_page)
+    if post_links is None:
+        return
+
+    # 저장된 전체 이력(기존 + 새 댓글)을 게시물 순서대로 사용
+    comments_data = comment_store.comments_for_sources("instagram", post_links)
+    save_crawled(comments_data, save_dir=save_dir)
+    end_time = time.time()
+    elapsed_time = end_time - start_time
+    print(f"크롤링 소요 시간: {elapsed_time:.2f}초")
+    return comments_data, elapsed_time
+
+# 계정을 검색하여 첫 번째(최신) 게시물 열기
+def open_first_instagram_post(driver, account):
+    driver.get("https://www.instagram.com/")
 
     # 검색 버튼 클릭
     try:
@@ -96,8 +252,7 @@ def scrape_instagram_comments(account, start_date, end_date):
         time.sleep(2)
     except Exception as e:
         print(f"검색 버튼 클릭 실패: {e}")
-        driver.quit()
-        return
+        return False
 
     # 검색 입력 필드에 채널 이름 입력
     try:
@@ -109,8 +264,7 @@ def scrape_instagram_comments(account, start_date, end_date):
         time.sleep(3)  # 검색 결과가 나타나기까지 잠시 대기
     except Exception as e:
         print(f"검색 입력 실패: {e}")
-        driver.quit()
-        return
+        return False
 
     # 검색 결과에서 채널 선택
     try:
@@ -123,236 +277,370 @@ def scrape_instagram_comments(account, start_date, end_date):
         time.sleep(3)
     except Exception as e:
         print(f"채널 클릭 실패: {e}")
-        driver.quit()
-        return
+        return False
 
     first_post = WebDriverWait(driver, 5).until(
         EC.presence_of_element_located((By.CSS_SELECTOR, "a[href*='/p/']"))
     )
     first_post.click()
     time.sleep(3)
-    comments_data = []
+    return True
+
+# 현재 게시물의 게시 날짜 (KST)
+def read_post_date(driver):
+    date_element = WebDriverWait(driver, 5).until(
+        EC.presence_of_element_located((By.CSS_SELECTOR, "time.x1p4m5qa"))
+    )
+    post_date_str = date_element.get_attribute("datetime")
+    return datetime.fromisoformat(post_date_str.replace("Z", "+00:00")).astimezone(KST)
+
+# 조회 기간 (KST)
+def kst_date_range(start_date, end_date):
+    start_dt = datetime.strptime(start_date, "%Y-%m-%d").replace(tzinfo=KST)
+    end_dt = datetime.strptime(end_date, "%Y-%m-%d").replace(tzinfo=KST)
+    return start_dt, end_dt
+
+# 다음 게시물로 이동 (다음 버튼이 없으면 False)
+def click_next_post(driver):
+    try:
+        next_button = WebDriverWait(driver, 5).until(
+            EC.presence_of_element_located(
+                (By.CSS_SELECTOR, 'button._abl- > div > span > svg[aria-label="다음"]'))
+        )
+        next_button.click()
+        print("다음 버튼을 클릭했습니다.")
+        time.sleep(2)
+        return True
+    except Exception as e:
+        print("다음 버튼이 없어 크롤링 종료:", e)
+        return False
+
+# 게시물 본문에 '이벤트' 단어가 있는지 확인 (본문을 찾지 못하면 예외 발생)
+def is_event_post(driver):
+    post_text_element = WebDriverWait(driver, 5).until(
+        EC.presence_of_element_located((By.CSS_SELECTOR, "div._a9zs > h1"))
+    )
+    post_text = post_text_element.text
+    print(f"게시물 본문: {post_text}")
+    return "이벤트" in post_text
+
+# 댓글 더 보기 버튼 반복 클릭 (throttle이 있으면 클릭마다 요청 한도 적용)
+def expand_post_comments(driver, throttle=None):
+    while True:
+        try:
+            load_more_button = WebDriverWait(driver, 5).until(
+                EC.presence_of_element_located(
+                    (By.CSS_SELECTOR, 'button._abl- > div > svg[aria-label="댓글 더 읽어들이기"]'))
+            )
+            if throttle is not None:
+                throttle.acquire()
+            load_more_button.click()
+            print("더보기 버튼을 클릭했습니다.")
+            time.sleep(2)
+        except Exception:
+            print("더보기 버튼이 더이상 없습니다.")
+            break
+
+# 현재 게시물의 댓글 텍스트와 날짜 수집
+def collect_post_comments(driver, post_link):
+    post_comments = []
+    comment_elements = WebDriverWait(driver, 5).until(
+        EC.presence_of_all_elements_located((By.CSS_SELECTOR, "ul li"))
+    )
+    for comment_element in comment_elements:
+        try:
+            comment_text = comment_element.find_element(By.CSS_SELECTOR, "span._ap3a").text
+            if not comment_text.strip():
+                continue
+
+            comment_date_element = comment_element.find_element(By.CSS_SELECTOR, "time")
+            comment_date_str = comment_date_element.get_attribute("datetime")
+            comment_date = datetime.fromisoformat(comment_date_str.replace("Z", "+00:00")).astimezone(
+                KST)
+
+            post_comments.append({
+                "comment_id": hashlib.sha1(f"{post_link}|{comment_date_str}|{comment_text}".encode("utf-8")).hexdigest(),
+                "source_id": post_link,
+                "published_at": comment_date.astimezone(timezone.utc).strftime("%Y-%m-%dT%H:%M:%SZ"),
+                "date": comment_date.strftime("%Y-%m-%d"),
+                "comment": comment_text,
+                "link": post_link
+            })
+        except Exception as e:
+            print(f"댓글 또는 날짜 추출 실패: {e}")
+            continue
+    return post_comments
+
+# 채널 게시물을 최신순으로 탐색하며 날짜 범위 내 게시물 댓글 수집 (게시물 링크 목록 반환)
+def crawl_instagram_posts(driver, account, start_date, end_date, on_page=None):
+    if not open_first_instagram_post(driver, account):
+        return None
+    post_links = []  # 날짜 범위 내 게시물 (최신순)
+    start_dt, end_dt = kst_date_range(start_date, end_date)
 
     # 댓글 크롤링 로직
     while True:
         try:
             # 게시물 날짜 가져오기
-            date_element = WebDriverWait(driver, 5).until(
-                EC.presence_of_element_located((By.CSS_SELECTOR, "time.x1p4m5qa"))
-            )
-            post_date_str = date_element.get_attribute("datetime")
-            post_date = datetime.fromisoformat(post_date_str.replace("Z", "+00:00")).astimezone(KST)
+            post_date = read_post_date(driver)
             print(f"게시물 날짜: {post_date}")
 
             # 날짜 범위 확인
-            start_dt = datetime.strptime(start_date, "%Y-%m-%d").replace(tzinfo=KST)
-            end_dt = datetime.strptime(end_date, "%Y-%m-%d").replace(tzinfo=KST)
-
             if post_date > end_dt:
                 print("end_date 이후 게시물 - 다음 게시물로 이동")
             elif post_date < start_dt:
                 print("start_date 이전 게시물 - 크롤링 종료")
                 break
+            elif is_settled_post(driver.current_url.split("?")[0], post_date):
+                print("이미 수집이 끝난 게시물 - 저장된 댓글 사용")
+                post_links.append(driver.current_url.split("?")[0])
+                if on_page is not None:
+                    on_page(comment_store.comments_for_sources("instagram", post_links[-1:]))
             else:
                 print("날짜 범위 내 게시물 - 본문 해시태그 확인 진행")
 
-                # 게시물 본문 확인
+                # 게시물 본문 확인 (특정 단어 또는 해시태그 존재 여부)
                 try:
-                    post_text_element = WebDriverWait(driver, 5).until(
-                        EC.presence_of_element_located((By.CSS_SELECTOR, "div._a9zs > h1"))
-                    )
-                    post_text = post_text_element.text
-                    print(f"게시물 본문: {post_text}")
-
-                    # 특정 단어 또는 해시태그 존재 여부 확인
-                    if "이벤트" in post_text:
+                    if is_event_post(driver):
                         print("'이벤트' 단어 발견 - 다음 게시물로 이동")
-                        try:
-                            next_button = WebDriverWait(driver, 5).until(
-                                EC.presence_of_element_located(
-                                    (By.CSS_SELECTOR, 'button._abl- > div > span > svg[aria-label="다음"]'))
-                            )
-                            next_button.click()
-                            time.sleep(2)
+                        if click_next_post(driver):
                             continue
-                        except Exception as e:
-                            print("다음 버튼이 없어 크롤링 종료:", e)
-                            break
+                        break
                 except Exception as e:
                     print(f"본문 추출 실패: {e}")
                     continue
 
-                # 댓글 더 보기 버튼 반복 클릭
-                while True:
-                    try:
-                        load_more_button = WebDriverWait(driver, 5).until(
-                            EC.presence_of_element_located(
-                                (By.CSS_SELECTOR, 'button._abl- > div > svg[aria-label="댓글 더 읽어들이기"]'))
-                        )
-                        load_more_button.click()
-                        print("더보기 버튼을 클릭했습니다.")
-                        time.sleep(2)
-                    except Exception:
-                        print("더보기 버튼이 더이상 없습니다.")
-                        break
+                # 댓글 더 보기 버튼 반복 클릭 후 댓글 수집
+                expand_post_comments(driver)
+                post_link = driver.current_url.split("?")[0]
+                post_comments = collect_post_comments(driver, post_link)
 
-                # 댓글 텍스트와 날짜 수집
-                comment_elements = WebDriverWait(driver, 5).until(
-                    EC.presence_of_all_elements_located((By.CSS_SELECTOR, "ul li"))
-                )
-                for comment_element in comment_elements:
-                    try:
-                        comment_text = comment_element.find_element(By.CSS_SELECTOR, "span._ap3a").text
-                        if not comment_text.strip():
-                            continue
-
-                        comment_date_element = comment_element.find_element(By.CSS_SELECTOR, "time")
-                        comment_date_str = comment_date_element.get_attribute("datetime")
-                        comment_date = datetime.fromisoformat(comment_date_str.replace("Z", "+00:00")).astimezone(
-                            KST)
-
-                        comments_data.append({
-                            "date": comment_date.strftime("%Y-%m-%d"),
-                            "comment": comment_text,
-                            "link": driver.current_url
-                        })
-                    except Exception as e:
-                        print(f"댓글 또는 날짜 추출 실패: {e}")
-                        continue
+                # 게시물 댓글을 저장소에 병합하고 워터마크 갱신
+                save_post_comments(account, post_link, post_date, post_comments)
+                post_links.append(post_link)
+                if on_page is not None:
+                    on_page(comment_store.comments_for_sources("instagram", [post_link]))
 
             # 다음 버튼 클릭
-            try:
-                next_button = WebDriverWait(driver, 5).until(
-                    EC.presence_of_element_located(
-                        (By.CSS_SELECTOR, 'button._abl- > div > span > svg[aria-label="다음"]'))
-                )
-                next_button.click()
-                print("다음 버튼을 클릭했습니다.")
-                time.sleep(2)
-            except Exception as e:
-                print("다음 버튼이 없어 크롤링 종료:", e)
+            if not click_next_post(driver):
                 break
 
         except Exception as e:
             print(f"오류 발생: {e}")
             break
 
-    driver.quit()
+    return post_links
 
-    save_to_csv(comments_data)
-    end_time = time.time()
-    elapsed_time = end_time - start_time
-    print(f"크롤링 소요 시간: {elapsed_time:.2f}초")
-    return comments_data, elapsed_time
+# 날짜 범위 내 게시물의 (링크, 게시 날짜) 목록 (최신순, 댓글은 열지 않음)
+def list_instagram_posts(driver, account, start_date, end_date):
+    if not open_first_instagram_post(driver, account):
+        return None
+    posts = []
+    start_dt, end_dt = kst_date_range(start_date, end_date)
+    while True:
+        try:
+            post_date = read_post_date(driver)
+            if post_date < start_dt:
+                break
+            if post_date <= end_dt:
+                posts.append((driver.current_url.split("?")[0], post_date))
+            if not click_next_post(driver):
+                break
+        except Exception as e:
+            print(f"오류 발생: {e}")
+            break
+    print(f"날짜 범위 내 게시물 {len(posts)}개")
+    return posts
+
+# 게시물 하나의 댓글 수집 (풀에서 브라우저를 빌려 사용, 이벤트 게시물이면 False)
+def scrape_instagram_post(account, post_link, post_date, throttle):
+    with webdriver_pool.driver() as pooled:
+        ensure_instagram_login(pooled)
+        driver = pooled.driver
+        throttle.acquire()
+        driver.get(post_link)
+        if is_event_post(driver):
+            print(f"'이벤트' 단어 발견 - 제외: {post_link}")
+            return False
+        expand_post_comments(driver, throttle)
+        post_comments = collect_post_comments(driver, post_link)
+    save_post_comments(account, post_link, post_date, post_comments)
+    return True
+
+# 게시물들을 여러 브라우저에서 동시에 수집하고 게시물 순서(최신순)대로 결과 전달
+def scrape_instagram_posts(account, posts, on_page=None):
+    throttle = TokenBucket(INSTAGRAM_REQUESTS_PER_SECOND, INSTAGRAM_SCRAPE_WORKERS)
+    post_links = []
+    with ThreadPoolExecutor(max_workers=INSTAGRAM_SCRAPE_WORKERS, thread_name_prefix="instagram") as executor:
+        futures = [
+            None if is_settled_post(post_link, post_date)
+            else executor.submit(scrape_instagram_post, account, post_link, post_date, throttle)
+            for post_link, post_date in posts
+        ]
+        for (post_link, post_date), future in zip(posts, futures):
+            if future is not None:
+                try:
+                    if not future.result():
+                        continue
+                except Exception as e:
+                    print(f"게시물 수집 실패: {post_link} ({e})")
+                    continue
+            post_links.append(post_link)
+            if on_page is not None:
+                on_page(comment_store.comments_for_sources("instagram", [post_link]))
+    return post_links
+
+# 채널 업로드 재생목록 ID 조회 (channels.list, 1 unit)
+def get_uploads_playlist_id(channel_id):
+    response = get_youtube_fetcher().execute(
+        get_youtube().channels().list(part='contentDetails', id=channel_id),
+        ttl=YOUTUBE_CHANNEL_CACHE_TTL
+    )
+    return response['items'][0]['contentDetails']['relatedPlaylists']['uploads']
+
+# 채널 비디오 목록 조회 (publishedAfter <= 게시일 < publishedBefore)
+# 업로드 재생목록은 최신순이므로 publishedAfter보다 오래된 비디오가 나온 페이지에서 중단
+def list_channel_videos(channel_id, published_after, published_before):
+    playlist_id = get_uploads_playlist_id(channel_id)
+    videos = []
+    page_token = None
+    while True:
+        params = dict(
+            part='contentDetails',
+            playlistId=playlist_id,
+            maxResults=50
+        )
+        if page_token:
+            params['pageToken'] = page_token
+        response = get_youtube_fetcher().execute(get_youtube().playlistItems().list(**params))
+        oldest = None
+        for item in response['items']:
+            published_at = item['contentDetails'].get('videoPublishedAt')
+            if not published_at:  # 비공개/삭제된 비디오
+                continue
+            # convert_to_utc와 같은 형식으로 맞춤 (소수 초 제거)
+            published_at = published_at[:19] + "Z"
+            if published_after <= published_at < published_before:
+                videos.append((item['contentDetails']['videoId'], published_at))
+            oldest = published_at if oldest is None else min(oldest, published_at)
+        page_token = response.get('nextPageToken')
+        if not page_token or (oldest is not None and oldest < published_after):
+            return videos
+
+# 저장소에 아직 조회되지 않은 기간 계산 (조회 범위가 하나의 연속 구간이 되도록 확장)
+def missing_ranges(covered, start, end):
+    if covered is None:
+        return [(start, end)], (start, end)
+    covered_start, covered_end = covered
+    ranges = []
+    if start < covered_start:
+        ranges.append((start, covered_start))
+    if end > covered_end:
+        ranges.append((covered_end, end))
+    return ranges, (min(start, covered_start), max(end, covered_end))
 
 # YouTube 댓글 크롤링
-def scrape_youtube_comments(account, start_date, end_date):
+def scrape_youtube_comments(account, start_date, end_date, on_page=None, save_dir=None, on_progress=None):
     start_time = time.time()
-    # 채널 ID 가져오기
-    channel_id = youtube.search().list(
+    # 채널 ID 가져오기 (search 호출은 100 units이므로 오래 캐시)
+    channel_id = get_youtube_fetcher().execute(get_youtube().search().list(
         part='snippet',
         q=account,
         type='channel',
         maxResults=1
-    ).execute()['items'][0]['id']['channelId']
+    ), ttl=YOUTUBE_CHANNEL_CACHE_TTL)['items'][0]['id']['channelId']
 
     start_date_utc = convert_to_utc(start_date)
     end_date_utc = convert_to_utc(end_date)
 
-    # 모든 비디오 데이터 가져오기
-    video_data = []
-    response = youtube.search().list(
-        part='id,snippet',
-        channelId=channel_id,
-        maxResults=50,
-        order='date',
-        type='video',
-        publishedAfter=start_date_utc,
-        publishedBefore=end_date_utc
-    ).execute()
-    video_data.extend(response['items'])
-
-    while 'nextPageToken' in response:
-        response = youtube.search().list(
-            part='id,snippet',
-            channelId=channel_id,
-            maxResults=50,
-            order='date',
-            type='video',
-            pageToken=response['nextPageToken'],
-            publishedAfter=start_date_utc,
-            publishedBefore=end_date_utc
-        ).execute()
-        video_data.extend(response['items'])
+    # 새로 조회가 필요한 기간의 비디오만 가져와 저장소에 추가 (미래 구간은 조회 완료로 기록하지 않음)
+    now_utc = datetime.now(timezone.utc).strftime("%Y-%m-%dT%H:%M:%SZ")
+    watermark = comment_store.get_watermark("youtube", "channel", channel_id)
+    covered = tuple(watermark[0].split("|")) if watermark else None
+    ranges, new_covered = missing_ranges(covered, start_date_utc, min(end_date_utc, now_utc))
+    for published_after, published_before in ranges:
+        if published_after < published_before:
+            comment_store.upsert_sources("youtube", channel_id, list_channel_videos(channel_id, published_after, published_before))
+    if new_covered[0] < new_covered[1]:
+        comment_store.set_watermark("youtube", "channel", channel_id, "|".join(new_covered))
+    print(f"비디오 목록 조회 구간: {ranges}")
 
     # 댓글 크롤링
     comments_data = []
     similar_comments = []  # 유사 댓글 저장 리스트
-    seen_comments = []  # 중복 및 유사 댓글 확인을 위한 리스트
+    seen_comments = NearDuplicateIndex(threshold=DEDUP_THRESHOLD, lsh_threshold=DEDUP_LSH_THRESHOLD)  # 중복 및 유사 댓글 확인을 위한 인덱스
     exclusion_patterns = [  # 제외할 패턴 정의
         r":",
         r"정답",
         r"이벤트"
     ]
 
-    def is_similar(new_comment, existing_comments, threshold=0.5):
-        # 기존 댓글들과 유사도 비교
-        return any(SequenceMatcher(None, new_comment, existing).ratio() > threshold for existing in existing_comments)
-
-    for video in video_data:
-        video_id = video['id']['videoId']
-        video_comments = []
-        response = youtube.commentThreads().list(
-            part='snippet',
-            videoId=video_id,
-            textFormat='plainText',
-            maxResults=100
-        ).execute()
-        video_comments.extend(response['items'])
-
-        while 'nextPageToken' in response:
-            response = youtube.commentThreads().list(
-                part='snippet',
-                videoId=video_id,
-                textFormat='plainText',
-                maxResults=100,
-                pageToken=response['nextPageToken']
-            ).execute()
-            video_comments.extend(response['items'])
-
-        # 댓글 데이터 저장
-        for item in video_comments:
-            comment = item['snippet']['topLevelComment']['snippet']['textDisplay']
-            published_at = item['snippet']['topLevelComment']['snippet']['publishedAt']
+    # 여러 비디오의 새 댓글만 동시에 요청 (비디오별 워터마크 이후, 비디오 순서대로 도착하는 즉시 처리)
+    video_ids = comment_store.sources_in_range("youtube", channel_id, start_date_utc, end_date_utc)
+    video_watermarks = comment_store.get_watermarks("youtube", "video", video_ids)
+    if on_progress is not None:
+        on_progress({"videos": len(video_ids)})
+    fetched = get_youtube_fetcher().iter_comment_threads(video_ids, since=video_watermarks)
+    for videos_fetched, (video_id, video_comments) in enumerate(fetched, start=1):
+        if video_comments:
+            comment_store.upsert_comments("youtube", [
+                {
+                    "comment_id": item['id'],
+                    "source_id": video_id,
+                    "published_at": item['snippet']['topLevelComment']['snippet']['publishedAt'],
+                    "date": item['snippet']['topLevelComment']['snippet']['publishedAt'].split("T")[0],
+                    "comment": item['snippet']['topLevelComment']['snippet']['textDisplay'],
+                    "link": f"https://www.youtube.com/watch?v={video_id}",
+                }
+                for item in video_comments
+            ])
+            newest = max(item['snippet']['topLevelComment']['snippet']['publishedAt'] for item in video_comments)
+            comment_store.set_watermark("youtube", "video", video_id, newest)
+
+        # 저장된 전체 이력(기존 + 새 댓글) 처리
+        page = []
+        for item in comment_store.comments_for_sources("youtube", [video_id]):
+            comment = item["comment"]
 
             # 1. 특정 패턴 확인 및 제외
             if any(re.search(pattern, comment) for pattern in exclusion_patterns):
                 continue
 
-            # 2. 유사도 확인
-            if is_similar(comment, seen_comments):
-                similar_comments.append({
-                    "date": published_at.split("T")[0],
-                    "comment": comment,
-                    "link": f"https://www.youtube.com/watch?v={video_id}"
-                })
+            # 2. 유사도 확인 (유사하지 않은 댓글은 인덱스에 추가)
+            if seen_comments.check_and_add(comment):
+                similar_comments.append(item)
                 continue
 
             # 3. 댓글 저장
-            comments_data.append({
-                "date": published_at.split("T")[0],
-                "comment": comment,
-                "link": f"https://www.youtube.com/watch?v={video_id}"
-            })
-            seen_comments.append(comment)  # 중복 및 유사도 비교를 위해 저장
+            page.append(item)
 
-    save_to_csv(comments_data, filename="comments.csv")
-    save_to_csv(similar_comments, filename="similar.csv")
+        comments_data.extend(page)
+        if on_page is not None:
+            on_page(page)
+        if on_progress is not None:
+            on_progress({"videos_fetched": videos_fetched})
+
+    save_crawled(comments_data, save_dir=save_dir)
+    save_crawled(similar_comments, name="similar", save_dir=save_dir, csv_export=True)  # similar.csv는 항상 생성
     end_time = time.time()
     elapsed_time = end_time - start_time
     print(f"크롤링 소요 시간: {elapsed_time:.2f}초")
     return comments_data, elapsed_time
 
+# YouTube API 할당량 사용 내역 (최근 days일, 태평양 시간 기준)
+@router.get("/youtube/quota")
+async def youtube_quota(days: int = 1):
+    if not 1 <= days <= 30:
+        raise HTTPException(status_code=400, detail="days must be between 1 and 30.")
+    rows = youtube_api_cache.ledger(days)
+    return {
+        "days": days,
+        "ledger": rows,
+        "units_spent": sum(row["units_spent"] for row in rows),
+        "units_saved": sum(row["units_saved"] for row in rows),
+        "errors": sum(row["errors"] for row in rows),
+    }
+
 # API 엔드포인트
 # @router.post("/crawl")
 # async def crawl(request: CrawlRequest):
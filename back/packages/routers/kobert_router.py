@@ -1,11 +1,44 @@
-""" 모델 로드
-model = torch.load("model.pth")
-model.eval()
-
-@app.post("/predict")
-def predict(data: dict):
-    input_tensor = torch.tensor(data["input"])
-    with torch.no_grad():
-        output = model(input_tensor)
-    return {"output": output.tolist()}
-"""
\ No newline at end of file
+from typing import List
+from fastapi import APIRouter, HTTPException
+from pydantic import BaseModel
+from models.check import clean_text
+from models.aggregates import SENTIMENTS
+from models.micro_batch import MicroBatcher
+from models.predict import cached_probabilities
+from packages.config import PREDICT_MAX_BATCH_SIZE, PREDICT_MAX_WAIT_MS, PREDICT_MAX_TEXTS
+
+router = APIRouter()
+
+
+class PredictRequest(BaseModel):
+    texts: List[str]
+
+
+def score_texts(texts):
+    # analyze_comments와 동일한 전처리 후 예측 캐시를 거쳐 추론
+    return cached_probabilities([clean_text(text) for text in texts], batch_size=PREDICT_MAX_BATCH_SIZE)
+
+
+# 동시에 들어온 요청을 하나의 모델 배치로 묶어 처리
+batcher = MicroBatcher(score_texts, max_batch_size=PREDICT_MAX_BATCH_SIZE, max_wait_ms=PREDICT_MAX_WAIT_MS)
+
+
+@router.post("/predict")
+async def predict(request: PredictRequest):
+    if not request.texts:
+        raise HTTPException(status_code=400, detail="texts must not be empty.")
+    if len(request.texts) > PREDICT_MAX_TEXTS:
+        raise HTTPException(status_code=400, detail=f"At most {PREDICT_MAX_TEXTS} texts per request.")
+
+    probs = await batcher.submit(request.texts)
+    return {
+        "results": [
+            {
+                "text": text,
+                "label": int(p.argmax()),
+                "sentiment": SENTIMENTS[int(p.argmax())],
+                "probabilities": dict(zip(SENTIMENTS, (round(float(x), 4) for x in p))),
+            }
+            for text, p in zip(request.texts, probs)
+        ]
+    }
@@ -0,0 +1,142 @@
+import asyncio
+import hashlib
+import os
+import threading
+from collections import OrderedDict
+from typing import Optional
+from fastapi import APIRouter, HTTPException, Request, Response
+from fastapi.responses import FileResponse, JSONResponse
+from models.aggregates import SENTIMENTS, comments_page
+from models.result_io import EXTENSIONS, export_csv, read_result
+from packages.result_store import ResultStore, CRAWL_DIR
+from packages.config import RESULT_DIR, RESULT_RETENTION_JOBS, RESULT_RETENTION_HOURS
+
+router = APIRouter()
+
+# 작업별 결과 저장소 (동시 작업 간 결과 파일 분리)
+result_store = ResultStore(RESULT_DIR, max_jobs=RESULT_RETENTION_JOBS, max_age_hours=RESULT_RETENTION_HOURS)
+
+# 최근 조회한 작업의 댓글 DataFrame 캐시 (페이지 요청마다 파일을 다시 읽지 않도록)
+COMMENTS_CACHE_SIZE = 8
+_comments_cache = OrderedDict()
+_comments_lock = threading.Lock()
+
+MAX_PAGE_SIZE = 200
+
+# 요청 시 CSV로 내보낼 수 있는 결과 테이블 -> 작업 디렉토리 안의 위치
+TABLES = {"comments": "", "ratio": "", "count": "", "similar": CRAWL_DIR}
+
+
+def make_etag(path, *parts):
+    # 파일 변경 시각/크기와 요청 파라미터로 ETag 생성 (본문을 만들기 전에 304 판단 가능)
+    stat = os.stat(path)
+    key = "|".join(str(part) for part in (path, stat.st_mtime_ns, stat.st_size) + parts)
+    return '"' + hashlib.sha1(key.encode("utf-8")).hexdigest() + '"'
+
+
+def not_modified(request, etag):
+    return etag in (tag.strip() for tag in request.headers.get("if-none-match", "").split(","))
+
+
+def result_file(job_id, filename):
+    path = result_store.file_path(job_id, filename)
+    if path is None:
+        raise HTTPException(status_code=404, detail=f"Result file not found: {filename}")
+    return path
+
+
+def csv_name(filename):
+    # 저장된 결과 테이블의 CSV 파일 이름이면 테이블 이름, 아니면 None
+    name, ext = os.path.splitext(filename)
+    return name if ext == EXTENSIONS["csv"] and name in TABLES else None
+
+
+def table_exists(job_id, name, subdir):
+    return any(result_store.file_path(job_id, name + ext, subdir) for ext in EXTENSIONS.values())
+
+
+def load_comments(job_id):
+    directory = result_store.job_dir(job_id, create=False)
+    names = [name for name in result_store.list_files(job_id) if name.startswith("comments.")]
+    if not names:
+        raise HTTPException(status_code=404, detail=f"No results for job: {job_id}")
+    key = (directory, max(os.stat(os.path.join(directory, name)).st_mtime_ns for name in names))
+    with _comments_lock:
+        if key in _comments_cache:
+            _comments_cache.move_to_end(key)
+            return _comments_cache[key]
+
+    df = read_result(directory, "comments")
+    with _comments_lock:
+        _comments_cache[key] = df
+        while len(_comments_cache) > COMMENTS_CACHE_SIZE:
+            _comments_cache.popitem(last=False)
+    return df
+
+
+@router.get("/jobs/{job_id}/results")
+async def list_job_results(job_id: str):
+    files = result_store.list_files(job_id)
+    if not files:
+        raise HTTPException(status_code=404, detail=f"No results for job: {job_id}")
+    # 아직 생성되지 않은 CSV도 요청 시 만들어지므로 함께 표시
+    tables = {name for name, subdir in TABLES.items() if table_exists(job_id, name, subdir)}
+    files = sorted(set(files) | {name + EXTENSIONS["csv"] for name in tables})
+    return {"job_id": job_id, "files": {name: f"/jobs/{job_id}/results/{name}" for name in files}}
+
+
+@router.get("/jobs/{job_id}/results/{filename}")
+async def get_job_result(job_id: str, filename: str):
+    name = csv_name(filename)
+    subdir = TABLES[name] if name is not None else ""
+    path = result_store.file_path(job_id, filename, subdir)
+    if path is None and name is not None:
+        # CSV는 처음 요청될 때 Parquet/Arrow 결과에서 생성하여 저장
+        try:
+            directory = os.path.join(result_store.job_dir(job_id, create=False), subdir)
+            path = await asyncio.to_thread(export_csv, directory, name)
+        except (ValueError, FileNotFoundError):
+            path = None
+    if path is None:
+        raise HTTPException(status_code=404, detail=f"Result file not found: {filename}")
+    return FileResponse(path, filename=filename)
+
+
+@router.get("/jobs/{job_id}/summary")
+async def get_job_summary(job_id: str, request: Request):
+    path = result_file(job_id, "summary.json")
+    etag = make_etag(path)
+    headers = {"ETag": etag, "Cache-Control": "no-cache"}
+    if not_modified(request, etag):
+        return Response(status_code=304, headers=headers)
+    with open(path, "rb") as f:
+        return Response(content=f.read(), media_type="application/json", headers=headers)
+
+
+@router.get("/jobs/{job_id}/comments")
+async def get_job_comments(job_id: str, request: Request, page: int = 1, page_size: int = 20,
+                           sentiments: Optional[str] = None):
+    if page < 1 or not 1 <= page_size <= MAX_PAGE_SIZE:
+        raise HTTPException(status_code=400, detail=f"page must be >= 1 and page_size between 1 and {MAX_PAGE_SIZE}.")
+
+    # sentiments: 쉼표로 구분한 감정 이름 또는 라벨 (예: "긍정,부정" 또는 "0,2")
+    labels = None
+    if sentiments is not None:
+        labels = set()
+        for value in filter(None, (part.strip() for part in sentiments.split(","))):
+            if value in SENTIMENTS:
+                labels.add(SENTIMENTS.index(value))
+            elif value.isdigit() and int(value) < len(SENTIMENTS):
+                labels.add(int(value))
+            else:
+                raise HTTPException(status_code=400, detail=f"Unknown sentiment: {value}")
+
+    summary_path = result_file(job_id, "summary.json")
+    etag = make_etag(summary_path, page, page_size, sorted(labels) if labels is not None else None)
+    headers = {"ETag": etag, "Cache-Control": "no-cache"}
+    if not_modified(request, etag):
+        return Response(status_code=304, headers=headers)
+
+    # 파일 읽기와 필터링/정렬은 이벤트 루프 밖에서 실행
+    payload = await asyncio.to_thread(lambda: comments_page(load_comments(job_id), page, page_size, labels))
+    return JSONResponse(content=payload, headers=headers)
@@ -0,0 +1,101 @@
+import queue
+import threading
+import time
+from contextlib import contextmanager
+from logging_config import setup_logger
+
+# 로그 설정
+logger = setup_logger(__name__)
+
+
+class PooledDriver:
+    def __init__(self, driver):
+        self.driver = driver
+        self.uses = 0
+        self.created_at = time.time()
+        self.state = {}  # 드라이버별 상태 (예: 로그인 여부)
+
+
+class WebDriverPool:
+    """
+    Keep up to `size` browser instances alive between crawls.
+
+    acquire() hands out an idle driver (most recently used first) after a
+    health check, or starts a new one with `factory()` while fewer than
+    `size` are alive. release() returns it to the pool; drivers that were
+    used `max_uses` times or reported broken are quit instead.
+    """
+
+    def __init__(self, factory, size=2, max_uses=20):
+        self.factory = factory
+        self.size = size
+        self.max_uses = max_uses
+        self._idle = queue.LifoQueue()
+        self._slots = threading.BoundedSemaphore(size)
+        self._closed = False
+
+    @staticmethod
+    def is_healthy(pooled):
+        try:
+            pooled.driver.execute_script("return 1")
+            return True
+        except Exception:
+            return False
+
+    @staticmethod
+    def _quit(pooled):
+        try:
+            pooled.driver.quit()
+        except Exception:
+            logger.exception("Failed to quit WebDriver")
+
+    def acquire(self, timeout=None):
+        if self._closed:
+            raise RuntimeError("WebDriver pool is shut down.")
+        if not self._slots.acquire(timeout=timeout):
+            raise TimeoutError("No WebDriver available.")
+        try:
+            while True:
+                try:
+                    pooled = self._idle.get_nowait()
+                except queue.Empty:
+                    logger.info("Starting a new WebDriver")
+                    return PooledDriver(self.factory())
+                if self.is_healthy(pooled):
+                    return pooled
+                logger.warning("Discarding unhealthy WebDriver")
+                self._quit(pooled)
+        except Exception:
+            self._slots.release()
+            raise
+
+    def release(self, pooled, broken=False):
+        pooled.uses += 1
+        if broken or self._closed or pooled.uses >= self.max_uses:
+            self._quit(pooled)
+        else:
+            self._idle.put(pooled)
+        self._slots.release()
+
+    @contextmanager
+    def driver(self, timeout=None):
+        """
+        Borrow a pooled driver for the duration of a `with` block.
+        """
+        pooled = self.acquire(timeout)
+        broken = False
+        try:
+            yield pooled
+        except Exception:
+            broken = not self.is_healthy(pooled)
+            raise
+        finally:
+            self.release(pooled, broken=broken)
+
+    def shutdown(self):
+        self._closed = True
+        while True:
+            try:
+                self._quit(self._idle.get_nowait())
+            except queue.Empty:
+                break
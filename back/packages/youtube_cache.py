@@ -0,0 +1,127 @@
+import hashlib
+import json
+import os
+import sqlite3
+import threading
+import time
+from datetime import datetime
+from urllib.parse import urlsplit, urlunsplit, parse_qsl, urlencode
+from zoneinfo import ZoneInfo
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS responses (
+    key TEXT PRIMARY KEY,
+    body TEXT NOT NULL,
+    expires_at REAL NOT NULL
+);
+CREATE TABLE IF NOT EXISTS quota_ledger (
+    day TEXT NOT NULL,
+    api_key TEXT NOT NULL,
+    method TEXT NOT NULL,
+    calls INTEGER NOT NULL DEFAULT 0,
+    units_spent INTEGER NOT NULL DEFAULT 0,
+    cache_hits INTEGER NOT NULL DEFAULT 0,
+    units_saved INTEGER NOT NULL DEFAULT 0,
+    errors INTEGER NOT NULL DEFAULT 0,
+    PRIMARY KEY (day, api_key, method)
+);
+"""
+
+# YouTube Data API 메서드별 할당량 비용 (units)
+QUOTA_COSTS = {
+    "youtube.search.list": 100,
+    "youtube.commentThreads.list": 1,
+    "youtube.channels.list": 1,
+    "youtube.playlistItems.list": 1,
+    "youtube.videos.list": 1,
+}
+
+# 일일 할당량은 태평양 시간 자정에 초기화됨
+QUOTA_TIMEZONE = ZoneInfo("America/Los_Angeles")
+
+
+def quota_day(timestamp=None):
+    return datetime.fromtimestamp(timestamp or time.time(), QUOTA_TIMEZONE).strftime("%Y-%m-%d")
+
+
+def api_key_id(api_key):
+    # 원래 키 대신 짧은 해시로 기록
+    return hashlib.sha256(api_key.encode("utf-8")).hexdigest()[:12]
+
+
+def request_key(request):
+    """
+    Cache key for a googleapiclient HttpRequest: method id plus URI with
+    the API key removed.
+    """
+    parts = urlsplit(request.uri)
+    query = urlencode(sorted((k, v) for k, v in parse_qsl(parts.query) if k != "key"))
+    uri = urlunsplit((parts.scheme, parts.netloc, parts.path, query, ""))
+    return hashlib.sha1(f"{request.methodId}|{uri}".encode("utf-8")).hexdigest()
+
+
+class YouTubeApiCache:
+    """
+    Persistent cache of YouTube Data API responses plus a daily quota
+    ledger per API key and method (units spent on real calls and units
+    saved by cache hits). Calls that raised are counted as spent calls and
+    also under `errors`.
+    """
+
+    def __init__(self, path):
+        os.makedirs(os.path.dirname(os.path.abspath(path)), exist_ok=True)
+        self._conn = sqlite3.connect(path, timeout=30, check_same_thread=False)
+        self._conn.execute("PRAGMA journal_mode=WAL")
+        self._conn.executescript(SCHEMA)
+        # errors 컬럼이 없던 기존 저장소에 추가
+        columns = [row[1] for row in self._conn.execute("PRAGMA table_info(quota_ledger)")]
+        if "errors" not in columns:
+            with self._conn:
+                self._conn.execute("ALTER TABLE quota_ledger ADD COLUMN errors INTEGER NOT NULL DEFAULT 0")
+        self._lock = threading.Lock()
+
+    def get(self, key):
+        with self._lock:
+            row = self._conn.execute(
+                "SELECT body FROM responses WHERE key = ? AND expires_at > ?", (key, time.time())
+            ).fetchone()
+        return json.loads(row[0]) if row else None
+
+    def put(self, key, body, ttl):
+        with self._lock, self._conn:
+            self._conn.execute(
+                "INSERT OR REPLACE INTO responses (key, body, expires_at) VALUES (?, ?, ?)",
+                (key, json.dumps(body, ensure_ascii=False), time.time() + ttl),
+            )
+
+    def purge_expired(self):
+        with self._lock, self._conn:
+            return self._conn.execute("DELETE FROM responses WHERE expires_at <= ?", (time.time(),)).rowcount
+
+    def record(self, api_key, method, hit, failed=False):
+        cost = QUOTA_COSTS.get(method, 1)
+        with self._lock, self._conn:
+            self._conn.execute(
+                "INSERT INTO quota_ledger (day, api_key, method, calls, units_spent, cache_hits, units_saved, errors) "
+                "VALUES (?, ?, ?, ?, ?, ?, ?, ?) "
+                "ON CONFLICT (day, api_key, method) DO UPDATE SET "
+                "calls = calls + excluded.calls, units_spent = units_spent + excluded.units_spent, "
+                "cache_hits = cache_hits + excluded.cache_hits, units_saved = units_saved + excluded.units_saved, "
+                "errors = errors + excluded.errors",
+                (quota_day(), api_key, method, 0 if hit else 1, 0 if hit else cost, 1 if hit else 0,
+                 cost if hit else 0, 1 if failed else 0),
+            )
+
+    def ledger(self, days=1):
+        """
+        Ledger rows for the last `days` quota days, newest first.
+        """
+        since = quota_day(time.time() - (days - 1) * 86400)
+        with self._lock:
+            rows = self._conn.execute(
+                "SELECT day, api_key, method, calls, units_spent, cache_hits, units_saved, errors FROM quota_ledger "
+                "WHERE day >= ? ORDER BY day DESC, api_key, method",
+                (since,),
+            ).fetchall()
+        columns = ["day", "api_key", "method", "calls", "units_spent", "cache_hits", "units_saved", "errors"]
+        return [dict(zip(columns, row)) for row in rows]
@@ -0,0 +1,147 @@
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+from googleapiclient.http import build_http
+from packages.youtube_cache import QUOTA_COSTS, request_key
+from packages.metrics import STAGE_SECONDS, CACHE_REQUESTS, QUOTA_UNITS
+
+# 이 횟수만큼 응답을 캐시에 저장할 때마다 만료된 응답 삭제
+CACHE_PURGE_EVERY = 500
+
+
+class TokenBucket:
+    """
+    Thread-safe token bucket. `rate` tokens are added per second up to `capacity`;
+    acquire() blocks until enough tokens are available.
+    """
+
+    def __init__(self, rate, capacity=None):
+        self.rate = float(rate)
+        self.capacity = float(capacity if capacity is not None else max(1.0, rate))
+        self._tokens = self.capacity
+        self._last = time.monotonic()
+        self._lock = threading.Lock()
+
+    def acquire(self, tokens=1):
+        while True:
+            with self._lock:
+                now = time.monotonic()
+                self._tokens = min(self.capacity, self._tokens + (now - self._last) * self.rate)
+                self._last = now
+                if self._tokens >= tokens:
+                    self._tokens -= tokens
+                    return
+                wait = (tokens - self._tokens) / self.rate
+            time.sleep(wait)
+
+
+class YouTubeFetcher:
+    """
+    Fetch commentThreads pages for many videos concurrently.
+    Pages of a single video are still requested in order (they depend on
+    nextPageToken), but up to `workers` videos are in flight at once and every
+    API call goes through a shared token bucket.
+
+    With a `cache` (YouTubeApiCache), responses are reused for `page_ttl`
+    seconds (or the ttl passed to execute()) and every call or cache hit is
+    recorded in the quota ledger under `api_key_id`, including calls that
+    raise. Expired responses are purged every `purge_every` cache writes.
+    """
+
+    def __init__(self, youtube, workers=8, rate=10.0, burst=None, cache=None, api_key_id="", page_ttl=0,
+                 purge_every=CACHE_PURGE_EVERY):
+        self.youtube = youtube
+        self.workers = max(1, workers)
+        self.bucket = TokenBucket(rate, burst)
+        self.cache = cache
+        self.api_key_id = api_key_id
+        self.page_ttl = page_ttl
+        self.purge_every = purge_every
+        self._cache_writes = 0
+        self._purge_lock = threading.Lock()
+        self._local = threading.local()
+
+    def _http(self):
+        # httplib2.Http는 스레드 안전하지 않으므로 스레드마다 별도 생성
+        http = getattr(self._local, "http", None)
+        if http is None:
+            http = self._local.http = build_http()
+        return http
+
+    def execute(self, request, ttl=None):
+        ttl = self.page_ttl if ttl is None else ttl
+        cost = QUOTA_COSTS.get(request.methodId, 1)
+        key = request_key(request) if self.cache is not None and ttl > 0 else None
+        if key is not None:
+            cached = self.cache.get(key)
+            if cached is not None:
+                self.cache.record(self.api_key_id, request.methodId, hit=True)
+                CACHE_REQUESTS.inc(cache="youtube_api", result="hit")
+                QUOTA_UNITS.inc(cost, kind="saved")
+                return cached
+            CACHE_REQUESTS.inc(cache="youtube_api", result="miss")
+
+        self.bucket.acquire()
+        try:
+            with STAGE_SECONDS.time(stage="api_page"):
+                response = request.execute(http=self._http())
+        except Exception:
+            # 실패한 요청도 할당량이 차감될 수 있으므로 사용량으로 기록한 뒤 다시 발생
+            QUOTA_UNITS.inc(cost, kind="spent")
+            if self.cache is not None:
+                self.cache.record(self.api_key_id, request.methodId, hit=False, failed=True)
+            raise
+        QUOTA_UNITS.inc(cost, kind="spent")
+        if self.cache is not None:
+            self.cache.record(self.api_key_id, request.methodId, hit=False)
+            if key is not None:
+                self.cache.put(key, response, ttl)
+                self._count_cache_write()
+        return response
+
+    def _count_cache_write(self):
+        with self._purge_lock:
+            self._cache_writes += 1
+            due = self._cache_writes % self.purge_every == 0
+        if due:
+            self.cache.purge_expired()
+
+    def fetch_comment_threads(self, video_id, since=None):
+        """
+        Fetch comment threads newest first. With `since` (UTC ISO timestamp),
+        paging stops at the first page reaching comments older than it and
+        only comments published at or after `since` are returned.
+        """
+        items = []
+        page_token = None
+        while True:
+            params = dict(part='snippet', videoId=video_id, textFormat='plainText', maxResults=100)
+            if page_token:
+                params['pageToken'] = page_token
+            response = self.execute(self.youtube.commentThreads().list(**params))
+            page_items = response.get('items', [])
+            if since is not None:
+                fresh = [item for item in page_items if _published_at(item) >= since]
+                items.extend(fresh)
+                if len(fresh) < len(page_items):
+                    return items
+            else:
+                items.extend(page_items)
+            page_token = response.get('nextPageToken')
+            if not page_token:
+                return items
+
+    def iter_comment_threads(self, video_ids, since=None):
+        """
+        Yield (video_id, items) in the same order as `video_ids`, each as soon
+        as that video and all videos before it are fetched.
+        `since` optionally maps video_id to its watermark.
+        """
+        since = since or {}
+        with ThreadPoolExecutor(max_workers=self.workers, thread_name_prefix="youtube") as executor:
+            results = executor.map(lambda video_id: self.fetch_comment_threads(video_id, since.get(video_id)), video_ids)
+            yield from zip(video_ids, results)
+
+
+def _published_at(item):
+    return item['snippet']['topLevelComment']['snippet']['publishedAt']
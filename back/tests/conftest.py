@@ -0,0 +1,8 @@
+import os
+import sys
+
+# 서버와 같이 back/ 기준으로 import (from packages..., from models...)
+BACK_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+if BACK_DIR not in sys.path:
+    sys.path.insert(0, BACK_DIR)
+os.chdir(BACK_DIR)
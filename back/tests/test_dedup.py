@@ -0,0 +1,71 @@
+import random
+from difflib import SequenceMatcher
+import packages.dedup as dedup
+from packages.dedup import NearDuplicateIndex, _optimal_bands
+
+SUBJECTS = ["이번 영상", "오늘 방송", "신제품", "이 노래", "배우님", "무대", "새 앨범", "가격"]
+PHRASES = ["정말 좋아요", "최고입니다", "그냥 그래요", "언제 나와요", "별로예요", "실망했어요", "응원합니다"]
+SYLLABLES = "가나다라마바사아자차카타파하고노도로모보소오조초코토포호"
+
+
+def comments(n, seed=0):
+    rng = random.Random(seed)
+    texts = []
+    for _ in range(n):
+        if texts and rng.random() < 0.1:
+            texts.append(rng.choice(texts) + " 대박")
+            continue
+        word = "".join(rng.choice(SYLLABLES) for _ in range(rng.randint(2, 4)))
+        texts.append(f"{rng.choice(SUBJECTS)} {word} {rng.choice(PHRASES)}")
+    return texts
+
+
+def test_band_layout_respects_min_rows():
+    bands, rows = _optimal_bands(128, 0.2, min_rows=2)
+    assert rows >= 2 and bands * rows <= 128
+
+
+def test_exact_and_near_duplicates():
+    index = NearDuplicateIndex()
+    assert not index.check_and_add("이번 영상 정말 좋아요 최고")
+    assert index.check_and_add("이번 영상 정말 좋아요 최고")
+    assert index.check_and_add("이번 영상 정말 좋아요 최고 ㅋㅋ")
+    assert not index.check_and_add("배송이 너무 늦어서 화가 나요")
+    assert len(index) == 2
+
+
+def test_matches_are_verified_with_sequence_ratio():
+    # 유사 댓글로 분류된 댓글은 기존 방식(SequenceMatcher ratio > threshold)으로도 유사해야 함
+    index = NearDuplicateIndex(threshold=0.5)
+    kept = []
+    for text in comments(500):
+        if index.check_and_add(text):
+            assert text in kept or any(SequenceMatcher(None, text, other).ratio() > 0.5 for other in kept)
+        else:
+            kept.append(text)
+
+
+def test_finds_most_pairwise_duplicates():
+    texts = comments(400, seed=1)
+    seen, expected = [], 0
+    for text in texts:
+        if any(SequenceMatcher(None, text, other).ratio() > 0.5 for other in seen):
+            expected += 1
+        else:
+            seen.append(text)
+    index = NearDuplicateIndex()
+    found = sum(index.check_and_add(text) for text in texts)
+    assert found >= 0.9 * expected
+
+
+def test_work_per_lookup_is_bounded(monkeypatch):
+    # 입력이 커져도 조회당 검증 횟수와 버킷 크기가 상한을 넘지 않아야 선형에 가깝게 유지됨
+    calls = []
+    similar = dedup._similar
+    monkeypatch.setattr(dedup, "_similar", lambda *args: calls.append(1) or similar(*args))
+    index = NearDuplicateIndex(max_bucket=16, max_candidates=8)
+    for text in comments(3000, seed=2):
+        before = len(calls)
+        index.check_and_add(text)
+        assert len(calls) - before <= 8
+    assert max(len(bucket) for buckets in index._buckets for bucket in buckets.values()) <= 16
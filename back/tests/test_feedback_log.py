@@ -0,0 +1,48 @@
+import pytest
+from packages.feedback_log import FeedbackLog
+
+
+@pytest.fixture
+def log(tmp_path):
+    feedback_log = FeedbackLog(str(tmp_path / "feedback.sqlite"))
+    yield feedback_log
+    feedback_log._conn.close()
+
+
+def test_append_many_ignores_duplicates_regardless_of_key_order(log):
+    assert log.append_many([{"comment": "좋아요", "label": 0}, {"comment": "별로", "label": 2}]) == [True, True]
+    assert log.append_many([{"label": 0, "comment": "좋아요"}, {"comment": "보통", "label": 1}]) == [False, True]
+    assert log.pending("retrain") == 3
+
+
+def test_consume_waits_for_threshold_and_advances_offset(log):
+    log.append_many([{"comment": f"댓글 {i}", "label": i % 3} for i in range(3)])
+    batches = []
+    assert log.consume("retrain", 4, batches.append) == 0
+    assert batches == [] and log.pending("retrain") == 3
+
+    assert log.consume("retrain", 3, batches.append) == 3
+    assert [record["comment"] for record in batches[0]] == ["댓글 0", "댓글 1", "댓글 2"]
+    assert log.pending("retrain") == 0
+
+    # 소비자마다 위치를 따로 기록하고, 새로 들어온 기록만 전달
+    log.append_many([{"comment": "새 댓글", "label": 0}])
+    assert log.pending("retrain") == 1
+    assert log.pending("audit") == 4
+    assert log.consume("retrain", 1, batches.append) == 1
+    assert batches[-1] == [{"comment": "새 댓글", "label": 0}]
+
+
+def test_failing_handler_keeps_offset(log):
+    log.append_many([{"comment": "좋아요", "label": 0}])
+
+    def fail(records):
+        raise RuntimeError("retraining could not start")
+
+    with pytest.raises(RuntimeError):
+        log.consume("retrain", 1, fail)
+    assert log.pending("retrain") == 1
+
+    batches = []
+    assert log.consume("retrain", 1, batches.append) == 1
+    assert batches == [[{"comment": "좋아요", "label": 0}]]
@@ -0,0 +1,62 @@
+import threading
+import time
+from packages.jobs import JobManager, RUNNING, SUCCEEDED, FAILED
+
+
+def wait_until(condition, timeout=5.0):
+    deadline = time.time() + timeout
+    while time.time() < deadline:
+        if condition():
+            return True
+        time.sleep(0.01)
+    return False
+
+
+def streaming_job(manager, name, release):
+    # main.run_streaming_crawl과 같은 구조: 크롤링 중 작업 전용 소비 스레드에서 분석
+    def crawl(job):
+        return manager.start_consumer(job, lambda: release.wait(5) and name)
+
+    return manager.submit({"name": name}, crawl, lambda job, analysis: analysis.result())
+
+
+def test_concurrent_streaming_jobs_finish_independently():
+    manager = JobManager(crawl_workers=2, infer_workers=1)
+    release_slow, release_fast = threading.Event(), threading.Event()
+    release_fast.set()
+    try:
+        slow = streaming_job(manager, "slow", release_slow)
+        fast = streaming_job(manager, "fast", release_fast)
+
+        # 먼저 시작한 작업의 분석이 끝나지 않아도 다음 작업은 완료됨
+        assert wait_until(lambda: fast.state == SUCCEEDED)
+        assert fast.result == "fast"
+        assert slow.state == RUNNING
+
+        release_slow.set()
+        assert wait_until(lambda: slow.state == SUCCEEDED)
+        assert slow.result == "slow"
+    finally:
+        release_slow.set()
+        manager.shutdown()
+
+
+def test_failed_consumer_fails_only_its_job():
+    manager = JobManager(crawl_workers=2, infer_workers=1)
+
+    def broken_analysis():
+        raise ValueError("analysis failed")
+
+    try:
+        broken = manager.submit({}, lambda job: manager.start_consumer(job, broken_analysis),
+                                lambda job, analysis: analysis.result())
+        ok_release = threading.Event()
+        ok = streaming_job(manager, "ok", ok_release)
+        ok_release.set()
+
+        assert wait_until(lambda: broken.state == FAILED)
+        assert broken.error == "analysis failed"
+        assert wait_until(lambda: ok.state == SUCCEEDED)
+    finally:
+        manager.shutdown()
+
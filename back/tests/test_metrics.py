@@ -0,0 +1,19 @@
+from packages.metrics import Counter, Histogram
+
+
+def test_counter_family_uses_total_suffix():
+    counter = Counter("test_requests", "Requests.", ["result"])
+    counter.inc(2, result="hit")
+    assert counter.render().splitlines() == [
+        "# HELP test_requests_total Requests.",
+        "# TYPE test_requests_total counter",
+        'test_requests_total{result="hit"} 2',
+    ]
+
+
+def test_histogram_samples_share_family_name():
+    histogram = Histogram("test_seconds", "Durations.", buckets=(1,))
+    histogram.observe(0.5)
+    lines = histogram.render().splitlines()
+    assert lines[:2] == ["# HELP test_seconds Durations.", "# TYPE test_seconds histogram"]
+    assert all(line.startswith("test_seconds_") for line in lines[2:])
@@ -0,0 +1,51 @@
+import asyncio
+import pytest
+from models.micro_batch import MicroBatcher
+
+
+def test_concurrent_requests_share_one_batch():
+    batches = []
+
+    def predict(texts):
+        batches.append(list(texts))
+        return [text.upper() for text in texts]
+
+    async def run():
+        batcher = MicroBatcher(predict, max_batch_size=8, max_wait_ms=50)
+        try:
+            return await asyncio.gather(batcher.submit(["a", "b"]), batcher.submit(["c"]), batcher.submit(["d", "e"]))
+        finally:
+            await batcher.stop()
+
+    # 요청마다 자기 몫의 결과만 순서대로 받음
+    assert asyncio.run(run()) == [["A", "B"], ["C"], ["D", "E"]]
+    assert batches == [["a", "b", "c", "d", "e"]]
+
+
+def test_batch_size_limit_starts_next_batch():
+    batches = []
+
+    async def run():
+        batcher = MicroBatcher(lambda texts: batches.append(texts) or texts, max_batch_size=2, max_wait_ms=50)
+        try:
+            return await asyncio.gather(*(batcher.submit([str(i)]) for i in range(5)))
+        finally:
+            await batcher.stop()
+
+    assert asyncio.run(run()) == [["0"], ["1"], ["2"], ["3"], ["4"]]
+    assert [len(batch) for batch in batches] == [2, 2, 1]
+
+
+def test_failure_reaches_every_caller_in_the_batch():
+    def predict(texts):
+        raise RuntimeError("model not loaded")
+
+    async def run():
+        batcher = MicroBatcher(predict, max_batch_size=8, max_wait_ms=20)
+        try:
+            return await asyncio.gather(batcher.submit(["a"]), batcher.submit(["b"]), return_exceptions=True)
+        finally:
+            await batcher.stop()
+
+    results = asyncio.run(run())
+    assert all(isinstance(result, RuntimeError) for result in results)
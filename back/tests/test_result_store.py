@@ -0,0 +1,60 @@
+import os
+import time
+import pytest
+from packages.result_store import ResultStore, CRAWL_DIR
+
+JOB_IDS = [f"{i:032x}" for i in range(1, 5)]
+
+
+def make_job(store, job_id, age_hours=0.0):
+    path = store.job_dir(job_id)
+    with open(os.path.join(path, "summary.json"), "w") as f:
+        f.write("{}")
+    mtime = time.time() - age_hours * 3600
+    os.utime(path, (mtime, mtime))
+    return path
+
+
+def test_rejects_invalid_job_ids(tmp_path):
+    store = ResultStore(str(tmp_path))
+    for job_id in ("../etc", "ABC", JOB_IDS[0][:-1], JOB_IDS[0] + "/.."):
+        with pytest.raises(ValueError):
+            store.job_dir(job_id)
+        assert store.file_path(job_id, "summary.json") is None
+        assert store.list_files(job_id) == []
+
+
+def test_file_path_only_returns_existing_plain_files(tmp_path):
+    store = ResultStore(str(tmp_path))
+    job_id = JOB_IDS[0]
+    make_job(store, job_id)
+    with open(os.path.join(store.crawl_dir(job_id), "similar.csv"), "w") as f:
+        f.write("date,comment,link\n")
+    with open(os.path.join(store.job_dir(job_id), ".comments.parquet.tmp"), "w") as f:
+        f.write("")
+
+    assert store.file_path(job_id, "summary.json") == os.path.join(str(tmp_path), job_id, "summary.json")
+    assert store.file_path(job_id, "similar.csv") is None
+    assert store.file_path(job_id, "similar.csv", CRAWL_DIR) is not None
+    assert store.file_path(job_id, "../" + JOB_IDS[1] + "/summary.json") is None
+    assert store.file_path(job_id, ".comments.parquet.tmp") is None
+    assert store.file_path(job_id, "missing.json") is None
+    # 하위 디렉토리와 임시 파일은 목록에 포함하지 않음
+    assert store.list_files(job_id) == ["summary.json"]
+
+
+def test_cleanup_applies_count_and_age_limits_but_keeps_active_jobs(tmp_path):
+    store = ResultStore(str(tmp_path), max_jobs=2, max_age_hours=24)
+    newest, recent, old, expired = JOB_IDS
+    make_job(store, newest, age_hours=0)
+    make_job(store, recent, age_hours=1)
+    make_job(store, old, age_hours=2)
+    make_job(store, expired, age_hours=48)
+    os.makedirs(os.path.join(str(tmp_path), "not-a-job"))
+
+    # 실행 중인 작업은 개수/기간 제한과 관계없이 유지
+    assert store.cleanup(active_ids=[expired]) == 1
+    assert sorted(os.listdir(str(tmp_path))) == sorted([newest, recent, expired, "not-a-job"])
+
+    assert store.cleanup() == 1
+    assert sorted(os.listdir(str(tmp_path))) == sorted([newest, recent, "not-a-job"])
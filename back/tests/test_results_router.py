@@ -0,0 +1,58 @@
+import json
+import os
+import pandas as pd
+import pytest
+from fastapi import FastAPI
+from fastapi.testclient import TestClient
+from models.result_io import write_result
+from packages.result_store import ResultStore
+from packages.routers import results_router
+
+JOB_ID = "a" * 32
+
+
+@pytest.fixture
+def client(tmp_path, monkeypatch):
+    store = ResultStore(str(tmp_path))
+    monkeypatch.setattr(results_router, "result_store", store)
+    directory = store.job_dir(JOB_ID)
+    comments = pd.DataFrame({
+        "date": ["2024-01-01", "2024-01-02", "2024-01-03"],
+        "comment": ["좋아요", "그냥 그래요", "별로예요"],
+        "link": ["l"] * 3,
+        "Feelings": [0, 1, 2],
+    })
+    write_result(comments, directory, "comments", "parquet", False)
+    with open(os.path.join(directory, "summary.json"), "w", encoding="utf-8") as f:
+        json.dump({"total": 3}, f)
+    app = FastAPI()
+    app.include_router(results_router.router)
+    return TestClient(app)
+
+
+def test_summary_etag_returns_not_modified(client):
+    response = client.get(f"/jobs/{JOB_ID}/summary")
+    assert response.status_code == 200 and response.json() == {"total": 3}
+    etag = response.headers["etag"]
+    assert client.get(f"/jobs/{JOB_ID}/summary", headers={"If-None-Match": etag}).status_code == 304
+    assert client.get(f"/jobs/{JOB_ID}/summary", headers={"If-None-Match": '"other"'}).status_code == 200
+
+
+def test_comments_etag_depends_on_page_and_filter(client):
+    first = client.get(f"/jobs/{JOB_ID}/comments", params={"page_size": 2})
+    assert first.status_code == 200
+    assert first.json()["total"] == 3 and len(first.json()["comments"]) == 2
+    etag = first.headers["etag"]
+    assert client.get(f"/jobs/{JOB_ID}/comments", params={"page_size": 2},
+                      headers={"If-None-Match": etag}).status_code == 304
+
+    filtered = client.get(f"/jobs/{JOB_ID}/comments", params={"page_size": 2, "sentiments": "부정"},
+                          headers={"If-None-Match": etag})
+    assert filtered.status_code == 200
+    assert filtered.headers["etag"] != etag and filtered.json()["total"] == 1
+
+
+def test_comments_rejects_bad_parameters(client):
+    assert client.get(f"/jobs/{JOB_ID}/comments", params={"sentiments": "unknown"}).status_code == 400
+    assert client.get(f"/jobs/{JOB_ID}/comments", params={"page": 0}).status_code == 400
+    assert client.get(f"/jobs/{'b' * 32}/comments").status_code == 404
@@ -0,0 +1,43 @@
+import sqlite3
+from models.token_cache import TokenCache
+
+
+def test_put_and_get_round_trip(tmp_path):
+    cache = TokenCache(str(tmp_path / "tokens.sqlite"))
+    try:
+        cache.put_many([(b"a", b"\x01\x00"), (b"b", b"\x02\x00")])
+        assert cache.get_many([b"a", b"b", b"c"]) == {b"a": b"\x01\x00", b"b": b"\x02\x00"}
+    finally:
+        cache.close()
+
+
+def test_evicts_least_recently_used_to_ninety_percent(tmp_path):
+    cache = TokenCache(str(tmp_path / "tokens.sqlite"), max_entries=10)
+    try:
+        cache.put_many([(bytes([i]), b"x") for i in range(10)])
+        # 가장 오래된 0번을 다시 읽어 최근 사용으로 갱신
+        cache.get_many([bytes([0])])
+        cache.put_many([(b"new", b"x")])
+        keys = set(cache.get_many([bytes([i]) for i in range(10)] + [b"new"]))
+        assert len(keys) == 9
+        assert bytes([0]) in keys and b"new" in keys
+        assert bytes([1]) not in keys and bytes([2]) not in keys
+    finally:
+        cache.close()
+
+
+def test_migrates_table_without_last_used(tmp_path):
+    path = str(tmp_path / "tokens.sqlite")
+    conn = sqlite3.connect(path)
+    conn.execute("CREATE TABLE tokens (key BLOB PRIMARY KEY, ids BLOB NOT NULL)")
+    conn.execute("INSERT INTO tokens VALUES (?, ?)", (b"old", b"\x01"))
+    conn.commit()
+    conn.close()
+
+    cache = TokenCache(path, max_entries=2)
+    try:
+        assert cache.get_many([b"old"]) == {b"old": b"\x01"}
+        cache.put_many([(b"a", b"x"), (b"b", b"x")])
+        assert len(cache.get_many([b"old", b"a", b"b"])) == 1
+    finally:
+        cache.close()
@@ -0,0 +1,69 @@
+import json
+from models.word_freq import WordFrequencies, WordCountStore, tokenize
+
+COMMENTS = [
+    ("영상에서는 배우가 정말 좋았어요", 0),
+    ("배우 연기는 그냥 그랬어요", 1),
+    ("광고가 너무 많아서 별로", 2),
+    ("배우에게 감동 받았어요 최고", 0),
+    ("광고 광고 광고", 2),
+    ("ㅋㅋㅋ", 1),
+]
+
+
+def test_tokenize_strips_particles_and_stopwords():
+    assert tokenize("영상에서는 배우가 정말 좋았어요 Great") == ["영상", "배우가", "좋았어요", "great"]
+
+
+def test_merged_batches_match_single_pass(tmp_path):
+    texts, labels = zip(*COMMENTS)
+    single = WordFrequencies().add(texts, labels)
+
+    first = WordFrequencies().add(texts[:3], labels[:3])
+    second = WordFrequencies().add(texts[3:], labels[3:])
+    assert (first + second).to_dict() == single.to_dict()
+    # +는 원본을 바꾸지 않고, merge()는 제자리에서 합침
+    assert first.to_dict() == WordFrequencies().add(texts[:3], labels[:3]).to_dict()
+    assert first.merge(second).top(2, 1) == [("광고", 3)]
+
+    path = tmp_path / "words.json"
+    path.write_text(json.dumps(single.to_dict(), ensure_ascii=False), encoding="utf-8")
+    assert WordFrequencies.load(str(path)).to_dict() == single.to_dict()
+
+
+def test_skips_missing_text_and_unknown_labels():
+    frequencies = WordFrequencies().add(["배우 최고", None, "배우 최고"], [0, 0, 5])
+    assert frequencies.to_dict() == {"0": {"배우": 1, "최고": 1}, "1": {}, "2": {}}
+
+
+def test_store_merges_only_new_comments_per_source(tmp_path):
+    store = WordCountStore(str(tmp_path / "words.sqlite"))
+    try:
+        texts, labels = zip(*COMMENTS)
+        assert store.add("v1", "video-a", texts[:4], labels[:4]) == 4
+        # 다시 크롤링한 이력(기존 4개 + 새 댓글 2개)은 새 댓글만 더함
+        assert store.add("v1", "video-a", texts, labels) == 2
+        assert store.load("v1", ["video-a"]).to_dict() == WordFrequencies().add(texts, labels).to_dict()
+
+        store.add("v1", "video-b", ["광고 최고"], [0])
+        merged = store.load("v1", ["video-a", "video-b"])
+        assert merged.top(2, 1) == [("광고", 3)]
+        assert dict(merged.top(0, 10))["최고"] == 2
+    finally:
+        store.close()
+
+
+def test_store_separates_and_expires_model_versions(tmp_path):
+    store = WordCountStore(str(tmp_path / "words.sqlite"), keep_versions=2)
+    try:
+        store.add("v1", "video-a", ["배우 최고"], [0])
+        # 재학습된 모델의 카운터는 비어 있는 상태에서 시작
+        assert store.load("v2", ["video-a"]).to_dict() == {"0": {}, "1": {}, "2": {}}
+        assert store.add("v2", "video-a", ["배우 최고"], [2]) == 1
+        assert store.load("v2", ["video-a"]).top(2, 1) == [("배우", 1)]
+
+        store.add("v3", "video-a", ["배우 최고"], [1])
+        assert store.load("v1", ["video-a"]).to_dict() == {"0": {}, "1": {}, "2": {}}
+        assert store.load("v2", ["video-a"]).top(2, 1) == [("배우", 1)]
+    finally:
+        store.close()
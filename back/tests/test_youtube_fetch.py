@@ -0,0 +1,140 @@
+import threading
+import time
+import pytest
+from packages.youtube_cache import YouTubeApiCache, request_key
+from packages.youtube_fetch import TokenBucket, YouTubeFetcher
+
+
+class FakeRequest:
+    def __init__(self, method_id, uri, response=None, error=None):
+        self.methodId = method_id
+        self.uri = uri
+        self.response = response
+        self.error = error
+        self.calls = 0
+
+    def execute(self, http=None):
+        self.calls += 1
+        if self.error is not None:
+            raise self.error
+        return self.response
+
+
+def thread_page(comment_id, published_at):
+    return {"id": comment_id, "snippet": {"topLevelComment": {"snippet": {"publishedAt": published_at}}}}
+
+
+class FakeYouTube:
+    """
+    commentThreads().list() over fixed pages per video (newest first).
+    """
+
+    def __init__(self, pages):
+        self.pages = pages
+        self.requests = []
+
+    def commentThreads(self):
+        return self
+
+    def list(self, videoId, pageToken=None, **params):
+        index = int(pageToken or 0)
+        response = {"items": self.pages[videoId][index]}
+        if index + 1 < len(self.pages[videoId]):
+            response["nextPageToken"] = str(index + 1)
+        uri = f"https://youtube.googleapis.com/youtube/v3/commentThreads?videoId={videoId}&pageToken={index}&key=k"
+        request = FakeRequest("youtube.commentThreads.list", uri, response)
+        self.requests.append(request)
+        return request
+
+
+@pytest.fixture
+def cache(tmp_path):
+    api_cache = YouTubeApiCache(str(tmp_path / "youtube.sqlite"))
+    yield api_cache
+    api_cache._conn.close()
+
+
+def test_token_bucket_limits_rate_after_burst():
+    bucket = TokenBucket(rate=50, capacity=5)
+    start = time.monotonic()
+    for _ in range(10):
+        bucket.acquire()
+    # 처음 5개는 즉시, 나머지 5개는 초당 50개 속도로 (약 0.1초)
+    assert time.monotonic() - start >= 0.08
+
+
+def test_token_bucket_is_thread_safe():
+    bucket = TokenBucket(rate=1000, capacity=20)
+    acquired = []
+    threads = [threading.Thread(target=lambda: [bucket.acquire() or acquired.append(1) for _ in range(10)])
+               for _ in range(4)]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join(5)
+    assert len(acquired) == 40
+
+
+def test_request_key_ignores_api_key_and_parameter_order():
+    a = FakeRequest("youtube.videos.list", "https://h/v3/videos?id=x&part=snippet&key=one")
+    b = FakeRequest("youtube.videos.list", "https://h/v3/videos?part=snippet&key=two&id=x")
+    c = FakeRequest("youtube.channels.list", "https://h/v3/videos?id=x&part=snippet")
+    assert request_key(a) == request_key(b) != request_key(c)
+
+
+def test_cached_response_is_reused_and_recorded_in_ledger(cache):
+    fetcher = YouTubeFetcher(None, rate=1000, cache=cache, api_key_id="key1", page_ttl=60)
+    request = FakeRequest("youtube.search.list", "https://h/v3/search?q=a", {"items": [1]})
+    assert fetcher.execute(request) == {"items": [1]}
+    assert fetcher.execute(request) == {"items": [1]}
+    assert request.calls == 1
+
+    [row] = cache.ledger()
+    assert (row["api_key"], row["method"]) == ("key1", "youtube.search.list")
+    assert (row["calls"], row["units_spent"], row["cache_hits"], row["units_saved"], row["errors"]) == (1, 100, 1, 100, 0)
+
+
+def test_zero_ttl_skips_cache_but_still_records_calls(cache):
+    fetcher = YouTubeFetcher(None, rate=1000, cache=cache, api_key_id="key1", page_ttl=0)
+    request = FakeRequest("youtube.videos.list", "https://h/v3/videos?id=x", {"items": []})
+    fetcher.execute(request)
+    fetcher.execute(request)
+    assert request.calls == 2
+    assert cache.ledger()[0]["calls"] == 2 and cache.ledger()[0]["cache_hits"] == 0
+
+
+def test_failed_call_is_recorded_and_not_cached(cache):
+    fetcher = YouTubeFetcher(None, rate=1000, cache=cache, api_key_id="key1", page_ttl=60)
+    request = FakeRequest("youtube.channels.list", "https://h/v3/channels?id=x", error=RuntimeError("quotaExceeded"))
+    with pytest.raises(RuntimeError):
+        fetcher.execute(request)
+    assert cache.get(request_key(request)) is None
+    row = cache.ledger()[0]
+    assert (row["calls"], row["units_spent"], row["errors"]) == (1, 1, 1)
+
+
+def test_expired_responses_are_purged_periodically(cache):
+    cache.put("old", {"items": []}, ttl=-1)
+    assert cache.get("old") is None
+    fetcher = YouTubeFetcher(None, rate=1000, cache=cache, page_ttl=60, purge_every=2)
+    fetcher.execute(FakeRequest("youtube.videos.list", "https://h/v3/videos?id=1", {}))
+    assert cache._conn.execute("SELECT COUNT(*) FROM responses").fetchone()[0] == 2
+    fetcher.execute(FakeRequest("youtube.videos.list", "https://h/v3/videos?id=2", {}))
+    assert cache._conn.execute("SELECT COUNT(*) FROM responses").fetchone()[0] == 2
+    assert cache.purge_expired() == 0
+
+
+def test_comment_threads_stop_at_watermark_and_keep_video_order():
+    youtube = FakeYouTube({
+        "a": [[thread_page("a3", "2024-03-01T00:00:00Z"), thread_page("a2", "2024-02-01T00:00:00Z")],
+              [thread_page("a1", "2024-01-01T00:00:00Z")]],
+        "b": [[thread_page("b2", "2024-02-01T00:00:00Z")], [thread_page("b1", "2024-01-01T00:00:00Z")]],
+    })
+    fetcher = YouTubeFetcher(youtube, workers=2, rate=1000)
+    results = list(fetcher.iter_comment_threads(["a", "b"], since={"a": "2024-02-15T00:00:00Z"}))
+
+    assert [video_id for video_id, _ in results] == ["a", "b"]
+    assert [item["id"] for item in results[0][1]] == ["a3"]
+    assert [item["id"] for item in results[1][1]] == ["b2", "b1"]
+    # 워터마크 이전 댓글이 나온 첫 페이지에서 중단 ("a"는 첫 페이지만 요청)
+    assert len(youtube.requests) == 3
@@ -10,6 +10,7 @@ import "./App.css";
 
 function App() {
   const [hasData, setHasData] = useState(false);
+  const [resultFiles, setResultFiles] = useState(null);
   const [activeButton, setActiveButton] = useState(0);
 
   const wordCloudRef = useRef(null);
@@ -46,7 +47,12 @@ function App() {
 
   return (
     <div className="App">
-      <Header onSearchComplete={() => setHasData(true)} />
+      <Header
+        onSearchComplete={(files) => {
+          setResultFiles(files);
+          setHasData(true);
+        }}
+      />
       <SideMenu
         activeButton={activeButton}
         setActiveButton={setActiveButton}
@@ -60,18 +66,18 @@ function App() {
       ) : (
         <div className="grid-container">
           <div className="wordcloud-rank" ref={wordCloudRef}>
-            <WordCloudRank />
+            <WordCloudRank files={resultFiles} />
           </div>
           <div className="charts-container" ref={chartRef}>
             <div className="pie-chart">
-              <PieChart />
+              <PieChart files={resultFiles} />
             </div>
             <div className="line-graph">
-              <LineGraph />
+              <LineGraph files={resultFiles} />
             </div>
           </div>
           <div className="comments-section" ref={commentsRef}>
-            <Comments />
+            <Comments files={resultFiles} />
           </div>
         </div>
       )}
@@ -1,9 +1,12 @@
 import React, { useState, useEffect } from "react";
-import Papa from "papaparse"; // Papaparse 추가
+import { resultUrl } from "../utils/resultUrl";
 import "./Comments.css";
 
-const Comments = () => {
+const COMMENTS_PER_PAGE = 7;
+
+const Comments = ({ files }) => {
   const [comments, setComments] = useState([]);
+  const [totalComments, setTotalComments] = useState(0);
   const [currentPage, setCurrentPage] = useState(1);
   const [selectedSentiments, setSelectedSentiments] = useState({
     긍정: true,
@@ -11,54 +14,42 @@ const Comments = () => {
     부정: true,
   });
 
-  const commentsPerPage = 7;
+  useEffect(() => {
+    setCurrentPage(1);
+  }, [files, selectedSentiments]);
 
   useEffect(() => {
     const fetchData = async () => {
       try {
+        // 서버에서 필요한 페이지의 댓글만 불러옵니다
+        const sentiments = Object.keys(selectedSentiments)
+          .filter((sentiment) => selectedSentiments[sentiment])
+          .join(",");
+        const params = new URLSearchParams({
+          page: currentPage,
+          page_size: COMMENTS_PER_PAGE,
+          sentiments,
+        });
         const response = await fetch(
-          `${import.meta.env.BASE_URL}data/comments.csv`
+          `${resultUrl(files, "comments_page")}?${params}`
         );
-        const text = await response.text();
+        if (!response.ok) {
+          throw new Error("Failed to fetch comments");
+        }
 
-        // PapaParse를 사용해 CSV 파일 파싱
-        Papa.parse(text, {
-          header: true, // 첫 번째 행을 헤더로 처리
-          skipEmptyLines: true,
-          dynamicTyping: true, // 숫자 변환
-          complete: (result) => {
-            const parsedComments = result.data.map((row) => ({
-              date: row.date,
-              content: row.comment,
-              link: row.link,
-              sentiment:
-                row.Feelings === 0
-                  ? "긍정"
-                  : row.Feelings === 1
-                  ? "중립"
-                  : "부정",
-            }));
-            setComments(parsedComments);
-          },
-        });
+        const page = await response.json();
+        setComments(page.comments);
+        setTotalComments(page.total);
       } catch (error) {
-        console.error("Error loading CSV data:", error);
+        console.error("Error loading comments:", error);
       }
     };
 
     fetchData();
-  }, []);
+  }, [files, selectedSentiments, currentPage]);
 
-  const filteredComments = comments.filter(
-    (comment) => selectedSentiments[comment.sentiment]
-  );
-
-  const totalPages = Math.ceil(filteredComments.length / commentsPerPage);
-  const startIndex = (currentPage - 1) * commentsPerPage;
-  const displayedComments = filteredComments.slice(
-    startIndex,
-    startIndex + commentsPerPage
-  );
+  const totalPages = Math.ceil(totalComments / COMMENTS_PER_PAGE);
+  const displayedComments = comments;
 
   return (
     <div className="comments-container">
@@ -6,12 +6,62 @@ import YoutubeLogo from "./images/youtube.png";
 import FacebookLogo from "./images/facebook.png";
 import SearchIcon from "./images/search.png";
 
+// 작업 이벤트 스트림(SSE)을 구독하여 진행 상황을 전달하고 완료 시 작업 결과 반환
+const waitForJob = (jobId, onEvent) =>
+  new Promise((resolve, reject) => {
+    const source = new EventSource(`http://127.0.0.1:8000/jobs/${jobId}/events`);
+    const handle = (type) => (event) => onEvent(type, JSON.parse(event.data));
+
+    source.addEventListener("snapshot", (event) => {
+      const job = JSON.parse(event.data);
+      if (job.state === "succeeded") {
+        source.close();
+        resolve(job);
+      } else if (job.state === "failed") {
+        source.close();
+        reject(new Error(job.error));
+      }
+    });
+    source.addEventListener("stage", handle("stage"));
+    source.addEventListener("progress", handle("progress"));
+    source.addEventListener("partial", handle("partial"));
+    source.addEventListener("done", (event) => {
+      source.close();
+      resolve(JSON.parse(event.data));
+    });
+    source.addEventListener("failed", (event) => {
+      source.close();
+      reject(new Error(JSON.parse(event.data).error));
+    });
+    source.onerror = () => {
+      // 연결이 끊기면 브라우저가 자동 재연결하며, 닫힌 경우에만 실패 처리
+      if (source.readyState === EventSource.CLOSED) {
+        reject(new Error("Job event stream closed"));
+      }
+    };
+  });
+
+// 진행 상황 표시 문구
+const formatProgress = (counts, ratio) => {
+  const parts = [];
+  if (counts.analyzed_comments) {
+    parts.push(`분석 ${counts.analyzed_comments}개`);
+  } else if (counts.crawled_comments) {
+    parts.push(`수집 ${counts.crawled_comments}개`);
+  }
+  if (ratio) {
+    parts.push(`긍정 ${ratio.긍정}%`);
+  }
+  return parts.join(" · ");
+};
+
 const Header = ({ onSearchComplete }) => {
   const [startDate, setStartDate] = useState("");
   const [endDate, setEndDate] = useState("");
   const [keyword, setKeyword] = useState("");
   const [platform, setPlatform] = useState("");
   const [loading, setLoading] = useState(false);
+  const [progress, setProgress] = useState("");
 
   const handleSearch = async () => {
     if (!startDate || !endDate) {
@@ -49,8 +99,18 @@ const Header = ({ onSearchComplete }) => {
         throw new Error("Failed to fetch data from backend");
       }
 
-      const data = await response.json();
-      console.log("Response from Backend:", data);
+      const { job_id: jobId } = await response.json();
+      console.log("Job submitted:", jobId);
+
+      // 작업 완료까지 진행 상황(단계, 수집/분석 개수, 중간 감정 비율) 표시
+      let counts = {};
+      let ratio = null;
+      const job = await waitForJob(jobId, (type, data) => {
+        if (type === "progress") counts = data;
+        if (type === "partial") ratio = data.ratio;
+        setProgress(formatProgress(counts, ratio));
+      });
+      console.log("Job finished:", job);
 
       alert(
         `댓글 분석이 완료되었습니다.`
@@ -59,13 +119,14 @@ const Header = ({ onSearchComplete }) => {
       // onSearchComplete 콜백 호출
       if (onSearchComplete) {
         console.log("Executing onSearchComplete");
-        onSearchComplete(data.files); // 파일 정보를 전달
+        onSearchComplete(job.result); // 파일 정보를 전달
       }
     } catch (error) {
       console.error("Failed to fetch data:", error);
       alert("크롤링 요청 중 오류가 발생했습니다.");
     } finally {
       setLoading(false);
+      setProgress("");
       console.log("Header handleSearch ended");
     }
   };
@@ -184,7 +245,9 @@ const Header = ({ onSearchComplete }) => {
           />
           <button className="input-button" onClick={handleSearch}>
             {loading ? (
-              <p className="analyze-comment">분석 중...</p>
+              <p className="analyze-comment">
+                분석 중...{progress && ` (${progress})`}
+              </p>
             ) : (
               <img src={SearchIcon} alt="Search Icon" className="search-icon" />
             )}
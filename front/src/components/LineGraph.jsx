@@ -1,8 +1,9 @@
 import React, { useState, useEffect } from "react";
+import { resultUrl } from "../utils/resultUrl";
 import { ResponsiveLine } from "@nivo/line";
 import "./LineGraph.css";
 
-const LineGraph = () => {
+const LineGraph = ({ files }) => {
   const [data, setData] = useState([]);
   const [isLoading, setIsLoading] = useState(false);
 
@@ -11,38 +12,29 @@ const LineGraph = () => {
       try {
         setIsLoading(true);
 
-        // count.csv 파일을 public/data 디렉토리에서 불러옵니다.
-        const response = await fetch(
-          `${import.meta.env.BASE_URL}data/count.csv`
-        );
+        // 분석 시 미리 계산된 작업 요약(summary)을 불러옵니다
+        const response = await fetch(resultUrl(files, "summary"));
 
-        if (!response.ok) throw new Error("Failed to fetch count.csv");
+        if (!response.ok) throw new Error("Failed to fetch summary");
 
-        const text = await response.text();
-
-        // CSV 파일을 읽어서 파싱
-        const rows = text
-          .trim()
-          .split("\n")
-          .slice(1) // 헤더 제외
-          .map((row) => row.split(","));
+        const { counts } = await response.json();
 
         // 데이터를 Nivo Line 차트 형식으로 변환
         const formattedData = [
           {
             id: "긍정",
             color: "#316dec",
-            data: rows.map((r) => ({ x: r[0], y: parseInt(r[1], 10) || 0 })),
+            data: counts.map((r) => ({ x: r.period, y: r.긍정 })),
           },
           {
             id: "중립",
             color: "#0f9b0f",
-            data: rows.map((r) => ({ x: r[0], y: parseInt(r[2], 10) || 0 })),
+            data: counts.map((r) => ({ x: r.period, y: r.중립 })),
           },
           {
             id: "부정",
             color: "#e93434",
-            data: rows.map((r) => ({ x: r[0], y: parseInt(r[3], 10) || 0 })),
+            data: counts.map((r) => ({ x: r.period, y: r.부정 })),
           },
         ];
 
@@ -56,7 +48,7 @@ const LineGraph = () => {
     };
 
     fetchData(); // 컴포넌트 마운트 시 데이터 로드
-  }, []);
+  }, [files]);
 
   if (isLoading) {
     return <p>데이터를 불러오는 중입니다...</p>;
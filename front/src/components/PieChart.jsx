@@ -1,44 +1,41 @@
 import React, { useState, useEffect } from "react";
+import { resultUrl } from "../utils/resultUrl";
 import { ResponsivePie } from "@nivo/pie";
 import "./PieChart.css";
 
-const PieChart = () => {
+const PieChart = ({ files }) => {
   const [data, setData] = useState([]);
 
   useEffect(() => {
     const fetchData = async () => {
       try {
-        // ratio.csv 파일을 public/data 디렉토리에서 불러옵니다
-        const response = await fetch(
-          `${import.meta.env.BASE_URL}data/ratio.csv`
-        );
+        // 분석 시 미리 계산된 작업 요약(summary)을 불러옵니다
+        const response = await fetch(resultUrl(files, "summary"));
 
         if (!response.ok) {
-          throw new Error("Failed to fetch ratio.csv");
+          throw new Error("Failed to fetch summary");
         }
 
-        // CSV 파일 내용 파싱
-        const text = await response.text();
-        const rows = text.trim().split("\n").slice(1); // 첫 번째 행(헤더) 제외
+        const { ratio } = await response.json();
 
         // 비율 데이터를 파싱하여 Nivo Pie 형식에 맞게 변환
         const parsedData = [
           {
             id: "긍정",
             label: "긍정",
-            value: parseFloat(rows[0]) || 0, // 두 번째 행 (긍정 비율)
+            value: ratio.긍정 || 0,
             color: "#316dec",
           },
           {
             id: "중립",
             label: "중립",
-            value: parseFloat(rows[1]) || 0, // 세 번째 행 (중립 비율)
+            value: ratio.중립 || 0,
             color: "#0f9b0f",
           },
           {
             id: "부정",
             label: "부정",
-            value: parseFloat(rows[2]) || 0, // 네 번째 행 (부정 비율)
+            value: ratio.부정 || 0,
             color: "#e93434",
           },
         ];
@@ -46,13 +43,13 @@ const PieChart = () => {
         // 상태에 데이터 저장
         setData(parsedData);
       } catch (error) {
-        console.error("Error loading ratio.csv:", error);
+        console.error("Error loading ratio data:", error);
         setData([]); // 에러 시 빈 배열 설정
       }
     };
 
     fetchData(); // 컴포넌트 마운트 시 데이터 로드
-  }, []);
+  }, [files]);
 
   return (
     <div className="circlechart-container">
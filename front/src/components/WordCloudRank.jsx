@@ -1,79 +1,39 @@
 import React, { useState, useEffect } from "react";
+import { resultUrl } from "../utils/resultUrl";
 import WordCloud from "./WordCloud";
 import Rank from "./Rank";
 import "./WordCloudRank.css";
 
-const WordCloudRank = () => {
+const WordCloudRank = ({ files }) => {
   const [selectedSentiment, setSelectedSentiment] = useState("긍정");
-  const [wordCloudData, setWordCloudData] = useState("");
+  const [wordCloudData, setWordCloudData] = useState([]);
   const [keywords, setKeywords] = useState([]);
 
   useEffect(() => {
     const fetchData = async () => {
       try {
-        // comments.csv 파일을 public/data 디렉토리에서 불러옵니다
-        const response = await fetch(
-          `${import.meta.env.BASE_URL}data/comments.csv`
-        );
+        // 분석 시 미리 계산된 감정별 단어 빈도를 불러옵니다
+        const response = await fetch(resultUrl(files, "summary"));
 
         if (!response.ok) {
-          throw new Error("Failed to fetch comments.csv");
+          throw new Error("Failed to fetch summary");
         }
 
-        // CSV 데이터 읽기 및 파싱
-        const text = await response.text();
-        const rows = text
-          .trim()
-          .split("\n")
-          .slice(1) // 헤더 제외
-          .map((row) => row.split(","));
+        const { words } = await response.json();
+        const sentimentWords = words[selectedSentiment] || [];
+        setWordCloudData(sentimentWords);
 
-        // 감정별 댓글 분류
-        const positiveComments = [];
-        const neutralComments = [];
-        const negativeComments = [];
-
-        rows.forEach((row) => {
-          const content = row[1]?.replace(/"/g, "").trim(); // 댓글 내용
-          const sentiment = row[3]?.trim(); // 감정 값 (0, 1, 2)
-
-          if (sentiment === "0") positiveComments.push(content);
-          else if (sentiment === "1") neutralComments.push(content);
-          else if (sentiment === "2") negativeComments.push(content);
-        });
-
-        // 감정에 따라 텍스트 설정
-        const data = {
-          긍정: positiveComments.join(" "),
-          중립: neutralComments.join(" "),
-          부정: negativeComments.join(" "),
-        };
-
-        const sentimentText = data[selectedSentiment] || "";
-        setWordCloudData(sentimentText);
-
-        // 키워드와 빈도 계산
-        const wordCounts = sentimentText.split(/\s+/).reduce((acc, word) => {
-          acc[word] = (acc[word] || 0) + 1;
-          return acc;
-        }, {});
-
-        // 상위 5개 키워드 추출
-        const sortedKeywords = Object.entries(wordCounts)
-          .sort(([, a], [, b]) => b - a)
-          .slice(0, 5)
-          .map(([word, count]) => ({ word, count }));
-
-        setKeywords(sortedKeywords);
+        // 상위 5개 키워드 추출 (서버에서 빈도순으로 정렬됨)
+        setKeywords(sentimentWords.slice(0, 5));
       } catch (error) {
         console.error("Error loading WordCloud data:", error);
-        setWordCloudData("");
+        setWordCloudData([]);
         setKeywords([]);
       }
     };
 
     fetchData();
-  }, [selectedSentiment]);
+  }, [selectedSentiment, files]);
 
   return (
     <div className="wordcloud-rank-wrapper">
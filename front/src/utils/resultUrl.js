@@ -0,0 +1,4 @@
+const API_BASE_URL = "http://127.0.0.1:8000";
+
+// 작업 결과(job.result)에 담긴 경로를 API URL로 변환
+export const resultUrl = (files, name) => `${API_BASE_URL}${files[name]}`;